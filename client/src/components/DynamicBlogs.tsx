@@ -21,7 +21,7 @@ interface Blog {
   id: number;
   title: string;
   excerpt?: string;
-  content: string;
+  content?: string;
   cover_image?: string;
   date: string;
   reading_time?: number;
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useLocation } from 'wouter';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useTheme } from '@/components/ui/theme-provider';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
@@ -14,6 +14,10 @@ interface DashboardStats {
   blogs_count: number;
   certifications_count: number;
   contact_messages_count: number;
+  unread_messages_count: number;
+  visible_projects_count: number;
+  hidden_projects_count: number;
+  messages_per_day: { date: string; count: number }[];
   users_count: number;
 }
 
@@ -32,6 +36,12 @@ interface ContactMessage {
   subject: string;
   message: string;
   created_at: string;
+  is_read: boolean;
+}
+
+interface ContactMessagePage {
+  items: ContactMessage[];
+  next_cursor: string | null;
 }
 
 export default function AdminDashboard() {
@@ -93,17 +103,42 @@ export default function AdminDashboard() {
     enabled: !!currentUser,
   });
 
-  const { data: messages, isLoading: messagesLoading } = useQuery({
+  const {
+    data: messagePages,
+    isLoading: messagesLoading,
+    fetchNextPage: fetchMoreMessages,
+    hasNextPage: hasMoreMessages,
+    isFetchingNextPage: messagesFetchingMore,
+  } = useInfiniteQuery({
     queryKey: ['/api/contact/admin/messages'],
-    queryFn: async (): Promise<ContactMessage[]> => {
+    queryFn: async ({ pageParam }): Promise<ContactMessagePage> => {
       const token = localStorage.getItem('token');
-      const response = await fetch('/api/contact/admin/messages', {
+      const params = new URLSearchParams({ limit: '20' });
+      if (pageParam) params.set('cursor', pageParam);
+      const response = await fetch(`/api/contact/admin/messages?${params}`, {
         headers: { 'Authorization': `Bearer ${token}` },
       });
 
       if (!response.ok) throw new Error('Failed to fetch contact messages');
       return response.json();
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
+    enabled: !!currentUser,
+  });
+  const messages = messagePages?.pages.flatMap((page) => page.items);
+
+  const { data: unreadCount } = useQuery({
+    queryKey: ['/api/contact/admin/messages/unread-count'],
+    queryFn: async (): Promise<number> => {
+      const token = localStorage.getItem('token');
+      const response = await fetch('/api/contact/admin/messages/unread-count', {
+        headers: { 'Authorization': `Bearer ${token}` },
+      });
+
+      if (!response.ok) throw new Error('Failed to fetch unread count');
+      return (await response.json()).unread;
+    },
     enabled: !!currentUser,
   });
 
@@ -140,6 +175,7 @@ export default function AdminDashboard() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['/api/contact/admin/messages'] });
+      queryClient.invalidateQueries({ queryKey: ['/api/contact/admin/messages/unread-count'] });
       toast({
         title: 'Success',
         description: 'Message deleted successfully.',
@@ -235,7 +271,9 @@ export default function AdminDashboard() {
                     <div className="text-2xl font-bold text-blue-600">
                       {statsLoading ? '...' : stats?.projects_count || 0}
                     </div>
-                    <p className="text-xs text-muted-foreground mt-1">Active projects</p>
+                    <p className="text-xs text-muted-foreground mt-1">
+                      {statsLoading ? 'Active projects' : `${stats?.visible_projects_count || 0} visible, ${stats?.hidden_projects_count || 0} hidden`}
+                    </p>
                   </CardContent>
                 </Card>
 
@@ -280,7 +318,9 @@ export default function AdminDashboard() {
                     <div className="text-2xl font-bold text-orange-600">
                       {statsLoading ? '...' : stats?.contact_messages_count || 0}
                     </div>
-                    <p className="text-xs text-muted-foreground mt-1">Contact inquiries</p>
+                    <p className="text-xs text-muted-foreground mt-1">
+                      {statsLoading ? 'Contact inquiries' : `${stats?.unread_messages_count || 0} unread`}
+                    </p>
                   </CardContent>
                 </Card>
 
@@ -368,6 +408,17 @@ export default function AdminDashboard() {
                           </div>
                         </div>
                       ))}
+                      {hasMoreMessages && (
+                        <div className="flex justify-center">
+                          <Button
+                            variant="outline"
+                            onClick={() => fetchMoreMessages()}
+                            disabled={messagesFetchingMore}
+                          >
+                            {messagesFetchingMore ? 'Loading...' : 'Load more'}
+                          </Button>
+                        </div>
+                      )}
                     </div>
                   )}
                 </CardContent>
@@ -385,7 +436,7 @@ export default function AdminDashboard() {
                 <CardHeader className="bg-white dark:bg-gray-900 border-b border-gray-100 dark:border-gray-800 rounded-t">
                   <CardTitle className="flex items-center gap-2 text-gray-900 dark:text-gray-100">
                     <MessageSquare className="h-5 w-5 text-orange-500 dark:text-orange-300" />
-                    Messages ({messages?.length || 0})
+                    Messages ({unreadCount ?? 0} unread)
                   </CardTitle>
                   <CardDescription className="text-muted-foreground dark:text-gray-300">
                     Review and respond to contact inquiries
@@ -444,6 +495,17 @@ export default function AdminDashboard() {
                           </div>
                         </div>
                       ))}
+                      {hasMoreMessages && (
+                        <div className="flex justify-center">
+                          <Button
+                            variant="outline"
+                            onClick={() => fetchMoreMessages()}
+                            disabled={messagesFetchingMore}
+                          >
+                            {messagesFetchingMore ? 'Loading...' : 'Load more'}
+                          </Button>
+                        </div>
+                      )}
                     </div>
                   )}
                 </CardContent>
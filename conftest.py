@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Shared test setup: puts the server on sys.path and provides `make_app`, a
+factory for small Flask apps on an in-memory SQLite database
+"""
+import os
+import sys
+
+import pytest
+
+server_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'VisualPortfolioServer')
+sys.path.insert(0, server_dir)
+
+from flask import Flask
+
+from config import Config
+from models import db
+from utils.database import configure_database
+from utils.jwt_auth import create_jwt_token
+from utils.serialization import FastJSONProvider
+
+# Blueprints that declare full paths on their routes (see app.py).
+UNPREFIXED = {'technical_skills'}
+
+
+def build_app(*blueprints, create=True, **config):
+    """App with `blueprints` mounted where app.py mounts them (/api/<name>).
+
+    Uses Config with an in-memory SQLite database and the response cache
+    off; keyword arguments override config keys. Tables are created unless
+    `create` is False (e.g. for a database that is not reachable).
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', RESPONSE_CACHE_ENABLED=False)
+    app.config.update(config)
+    app.json = FastJSONProvider(app)
+    configure_database(app)
+    db.init_app(app)
+    for blueprint in blueprints:
+        app.register_blueprint(blueprint, url_prefix=None if blueprint.name in UNPREFIXED
+                               else f'/api/{blueprint.name}')
+    if create:
+        with app.app_context():
+            # The default bind only: a file database's read-only GET bind
+            # (see configure_database) is the same file, and db.metadatas
+            # keeps the bind keys of every app built before this one.
+            db.create_all(bind_key=None)
+    return app
+
+
+def admin_headers(app, user_id=1):
+    with app.app_context():
+        token = create_jwt_token(identity='admin', user_id=user_id, is_admin=True)
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def make_app():
+    """`build_app`; the database engines of every app it built are closed afterwards."""
+    apps = []
+
+    def factory(*blueprints, **config):
+        app = build_app(*blueprints, **config)
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
@@ -1,8 +1,6 @@
-from flask import Flask, send_from_directory, request
+from flask import Flask, request
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 import os
 from config import Config
 from routes.contact import contact_bp
@@ -15,27 +13,71 @@ from routes.auth import auth_bp
 from routes.admin import admin_bp
 from routes.experiences import experiences_bp
 from routes.technical_skills import technical_skills_bp
+from routes.portfolio import portfolio_bp
+from routes.search import search_bp
 import logging
 from flasgger import Swagger
 import webbrowser
 import threading
 import time
 
-# Initialize Flask app
-app = Flask(__name__, 
-            static_folder=os.path.abspath('../../dist/public'),
-            static_url_path='')
+# Initialize Flask app. Flask's built-in static route is disabled; the built
+# frontend is served from an in-memory index (see utils/static_files.py).
+app = Flask(__name__, static_folder=None)
+app.static_folder = os.path.abspath('../../dist/public')
 app.config.from_object(Config)
 
+# JSON responses go through orjson when installed (stdlib fallback), with
+# dates written as ISO 8601
+from utils.serialization import FastJSONProvider
+app.json = FastJSONProvider(app)
+
 # Setup CORS (restrict origins in production)
 CORS(app, resources={r"/api/*": {"origins": app.config["FRONTEND_ORIGIN"]}})
 
-# Setup SQLAlchemy
+# Setup SQLAlchemy (with the SQLite profile: pool sizing, read-only GET engine, PRAGMAs)
 from models import db
+from utils.database import configure_database, install_sqlite_pragmas
+configure_database(app)
 db.init_app(app)
+install_sqlite_pragmas(app, db)
+
+# Apply additive schema upgrades (new columns and indexes) to existing databases
+from utils.migrations import upgrade_schema
+from utils.search import ensure_search_index
+with app.app_context():
+    upgrade_schema()
+    ensure_search_index()
+
+# Setup public response cache (invalidated on every committed write)
+from utils.cache import response_cache
+response_cache.init_app(app)
+
+# Password hashing runs on a bounded process pool
+from utils.passwords import password_hasher
+password_hasher.init_app(app)
+
+# Contact submissions are queued and written in batches by a background thread
+from utils.contact_queue import contact_queue
+contact_queue.init_app(app)
 
-# Setup Rate Limiting (increased for development)
-#limiter = Limiter(get_remote_address, app=app, default_limits=["1000/minute"])
+# Bounded cache of verified JWT claims
+from utils.jwt_auth import token_cache
+token_cache.max_entries = app.config["JWT_CACHE_SIZE"]
+
+# Token-bucket rate limits on public write endpoints (policies in Config.RATE_LIMITS)
+from utils.rate_limit import limiter
+limiter.init_app(app)
+
+# Take the client address from X-Forwarded-For behind PROXY_FIX_X_FOR trusted proxies
+from werkzeug.middleware.proxy_fix import ProxyFix
+if app.config["PROXY_FIX_X_FOR"]:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
+# Compress JSON/HTML responses per Accept-Encoding (see the COMPRESSION_* settings)
+from utils.compression import CompressionMiddleware
+if app.config["COMPRESSION_ENABLED"]:
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, app.config)
 
 # Flasgger Swagger config
 swagger_config = {
@@ -85,10 +127,26 @@ app.register_blueprint(auth_bp, url_prefix="/api/auth")
 app.register_blueprint(admin_bp, url_prefix="/api/admin")
 app.register_blueprint(experiences_bp, url_prefix="/api/experiences")
 app.register_blueprint(technical_skills_bp)
+app.register_blueprint(portfolio_bp, url_prefix="/api/portfolio")
+app.register_blueprint(search_bp, url_prefix="/api/search")
 
 # Logging
 logging.basicConfig(level=logging.INFO)
 
+# Static frontend: indexed once at startup, index.html kept in memory
+from utils.static_files import StaticIndex, ShellCache
+static_index = StaticIndex(app.static_folder)
+static_index.build()
+shell_cache = ShellCache(os.path.join(app.static_folder, 'index.html'),
+                         ttl=app.config["INDEX_HTML_TTL"])
+
+def serve_shell():
+    """Serve the in-memory index.html used by every client-side route"""
+    try:
+        return shell_cache.response()
+    except FileNotFoundError:
+        return {"error": "Frontend not built. Run 'npm run build' first."}, 404
+
 @app.route("/api/health")
 def health():
     return {"status": "ok"}, 200
@@ -100,24 +158,21 @@ def health():
 @app.route("/admin/<path:admin_path>")
 def serve_spa_routes(admin_path=None):
     """Serve React app for client-side routing"""
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_shell()
 
 # Serve React frontend static files
 @app.route('/')
 def serve_frontend():
     """Serve the React frontend"""
-    try:
-        return send_from_directory(app.static_folder, 'index.html')
-    except FileNotFoundError:
-        return {"error": "Frontend not built. Run 'npm run build' first."}, 404
+    return serve_shell()
 
 @app.route('/assets/<path:filename>')
 def serve_assets(filename):
     """Serve static assets"""
-    try:
-        return send_from_directory(os.path.join(app.static_folder, 'assets'), filename)
-    except FileNotFoundError:
+    response = static_index.serve(f'assets/{filename}')
+    if response is None:
         return {"error": "Asset not found"}, 404
+    return response
 
 @app.route('/<path:path>')
 def serve_static_files(path):
@@ -128,13 +183,13 @@ def serve_static_files(path):
     
     # Check if it's a static file (has extension)
     if '.' in path:
-        try:
-            return send_from_directory(app.static_folder, path)
-        except FileNotFoundError:
+        response = static_index.serve(path)
+        if response is None:
             return {"error": "File not found"}, 404
+        return response
     else:
         # For client-side routing (other SPA routes), return index.html
-        return send_from_directory(app.static_folder, 'index.html')
+        return serve_shell()
 
 @app.errorhandler(404)
 def handle_404(e):
@@ -144,7 +199,7 @@ def handle_404(e):
     if requested_path.startswith('/api/') or '.' in requested_path.split('/')[-1]:
         return {"error": "Not found"}, 404
     # Otherwise, serve the React app
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_shell()
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=False)
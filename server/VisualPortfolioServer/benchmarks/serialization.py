@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ORM instances + `to_dict` + Flask's stdlib `jsonify` vs column
+projections + the fast JSON provider, on the project and blog list views.
+
+Both apps serve the same SQLite file with the response cache disabled, so
+every request runs the query and serializes the result.
+
+    python benchmarks/serialization.py [--rows 500] [--requests 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from config import Config
+from models import db, Author, Blog, Project, Tag
+from routes.blogs import blogs_bp
+from routes.projects import projects_bp
+from utils import serialization
+from utils.serialization import FastJSONProvider
+
+PATHS = {'projects': '/api/projects/', 'blogs': '/api/blogs/'}
+
+
+def legacy_projects():
+    projects = Project.query.filter_by(is_visible=True).order_by(Project.order.asc()).all()
+    return jsonify([p.to_dict() for p in projects]), 200
+
+
+def summary_dict(blog):
+    """What the blog list served per post before it selected columns directly."""
+    return {
+        'id': blog.id,
+        'title': blog.title,
+        'excerpt': blog.excerpt,
+        'cover_image': blog.cover_image,
+        'date': blog.date.isoformat() if blog.date else None,
+        'reading_time': blog.reading_time,
+        'featured': blog.featured,
+        'author': blog.author.to_dict() if blog.author else None,
+        'tags': [tag.to_dict() for tag in blog.tags]
+    }
+
+
+def legacy_blogs():
+    blogs = (Blog.query.filter_by(is_visible=True)
+             .options(load_only(Blog.title, Blog.excerpt, Blog.cover_image, Blog.date,
+                                Blog.reading_time, Blog.featured, Blog.author_id),
+                      joinedload(Blog.author), selectinload(Blog.tags))
+             .order_by(Blog.date.desc().nulls_last(), Blog.id.desc()))
+    return jsonify([summary_dict(b) for b in blogs]), 200
+
+
+def make_app(path, fast):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}', RESPONSE_CACHE_ENABLED=False)
+    db.init_app(app)
+    if fast:
+        app.json = FastJSONProvider(app)
+        app.register_blueprint(projects_bp, url_prefix='/api/projects')
+        app.register_blueprint(blogs_bp, url_prefix='/api/blogs')
+    else:
+        app.add_url_rule(PATHS['projects'], 'projects', legacy_projects)
+        app.add_url_rule(PATHS['blogs'], 'blogs', legacy_blogs)
+    return app
+
+
+def seed(app, rows):
+    with app.app_context():
+        db.create_all()
+        tags = [Tag(name=f'tag-{i}') for i in range(20)]
+        authors = [Author(name=f'author-{i}', email=f'a{i}@example.com') for i in range(5)]
+        db.session.add_all(Project(
+            title=f'project {i}', description='text ' * 60, tech=['python', 'flask', 'react'],
+            links=[{'name': 'GitHub', 'url': f'https://github.com/x/{i}'}],
+            gallery=[f'/img/{i}-{j}.png' for j in range(3)], categories=['web'],
+            start_date=date(2020, 1, 1) + timedelta(days=i), end_date=date(2024, 1, 1),
+            order=i) for i in range(rows))
+        db.session.add_all(Blog(
+            title=f'post {i}', content='body ' * 300, excerpt='excerpt ' * 10,
+            date=datetime(2024, 1, 1) + timedelta(hours=i), reading_time=5,
+            author=authors[i % 5], tags=tags[i % 17:i % 17 + 3]) for i in range(rows))
+        db.session.commit()
+
+
+def measure(app, path, requests):
+    client = app.test_client()
+    client.get(path)  # warm up
+    times = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path)
+        times.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return statistics.median(times) * 1000, len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    encoder = 'orjson' if serialization.orjson is not None else 'stdlib json'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        legacy, fast = make_app(path, fast=False), make_app(path, fast=True)
+        seed(legacy, args.rows)
+        print(f"{args.rows} rows per list, median of {args.requests} requests, fast encoder: {encoder}")
+        print(f"{'endpoint':<12}{'to_dict ms':>12}{'fast ms':>12}{'speedup':>10}{'bytes':>10}")
+        for name, path in PATHS.items():
+            before, size = measure(legacy, path, args.requests)
+            after, _ = measure(fast, path, args.requests)
+            print(f"{name:<12}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x{size:>10}")
+        for app in (legacy, fast):
+            with app.app_context():
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
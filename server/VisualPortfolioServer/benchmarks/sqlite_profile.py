@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SQLAlchemy's default SQLite setup vs the tuned SQLite profile.
+
+Reader threads hammer the public list endpoints (response cache disabled,
+so every request hits the database) while writer threads commit contact
+messages one at a time, the way a burst of form submissions would.
+
+    python benchmarks/sqlite_profile.py [--seconds 10] [--readers 8] [--writers 2]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from config import Config
+from models import db, Blog, ContactMessage, Project, Tag
+from routes.blogs import blogs_bp
+from routes.projects import projects_bp
+from utils.database import configure_database, install_sqlite_pragmas
+
+READ_PATHS = ['/api/projects/', '/api/blogs/?limit=20']
+
+
+def make_app(path, tuned):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}',
+        RESPONSE_CACHE_ENABLED=False,
+    )
+    if tuned:
+        configure_database(app)
+    db.init_app(app)
+    if tuned:
+        install_sqlite_pragmas(app, db)
+    app.register_blueprint(projects_bp, url_prefix='/api/projects')
+    app.register_blueprint(blogs_bp, url_prefix='/api/blogs')
+    return app
+
+
+def seed(app, rows):
+    with app.app_context():
+        db.create_all()
+        tags = [Tag(name=f'tag-{i}') for i in range(10)]
+        db.session.add_all(Project(title=f'project {i}', description='text ' * 40,
+                                   tech=['python', 'flask'], order=i) for i in range(rows))
+        db.session.add_all(Blog(title=f'post {i}', content='body ' * 200, excerpt='excerpt',
+                                date=datetime(2024, 1, 1), tags=tags[i % 7:i % 7 + 3])
+                           for i in range(rows))
+        db.session.commit()
+
+
+def run(app, seconds, readers, writers):
+    stop = time.monotonic() + seconds
+    latencies, errors, writes = [], [], [0]
+    lock = threading.Lock()
+
+    def reader():
+        client = app.test_client()
+        local, i = [], 0
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            response = client.get(READ_PATHS[i % len(READ_PATHS)])
+            local.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                with lock:
+                    errors.append(response.status_code)
+            i += 1
+        with lock:
+            latencies.extend(local)
+
+    def writer():
+        with app.app_context():
+            while time.monotonic() < stop:
+                try:
+                    db.session.add(ContactMessage(name='bench', email='bench@example.com',
+                                                  subject='hello', message='benchmark message'))
+                    db.session.commit()
+                    with lock:
+                        writes[0] += 1
+                except Exception as e:
+                    db.session.rollback()
+                    with lock:
+                        errors.append(type(e).__name__)
+
+    threads = ([threading.Thread(target=reader) for _ in range(readers)]
+               + [threading.Thread(target=writer) for _ in range(writers)])
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return {
+        'reads/s': len(latencies) / seconds,
+        'p50 ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95 ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+        'max ms': latencies[-1] * 1000 if latencies else 0,
+        'writes/s': writes[0] / seconds,
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--rows', type=int, default=200)
+    args = parser.parse_args()
+
+    results = {}
+    for name, tuned in (('default', False), ('tuned', True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = make_app(os.path.join(tmp, 'bench.db'), tuned)
+            seed(app, args.rows)
+            results[name] = run(app, args.seconds, args.readers, args.writers)
+            with app.app_context():
+                for engine in db.engines.values():
+                    engine.dispose()
+
+    columns = list(results['default'])
+    print(f"{'profile':<10}" + ''.join(f'{c:>12}' for c in columns))
+    for name, row in results.items():
+        print(f'{name:<10}' + ''.join(f'{row[c]:>12.1f}' for c in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,21 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key")
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///portfolio.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 10))  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))  # seconds; PostgreSQL only
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"  # PostgreSQL only
+    # Executions of a statement on one connection before psycopg 3 prepares it server-side.
+    DB_PREPARE_THRESHOLD = int(os.environ.get("DB_PREPARE_THRESHOLD", 5))
+    # SQLite profile, applied to every connection of a file-backed database.
+    SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000))  # milliseconds
+    SQLITE_CACHE_SIZE = int(os.environ.get("SQLITE_CACHE_SIZE", -65536))  # negative = KiB, i.e. 64 MiB
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 268435456))  # bytes
+    # Serve GET requests from a separate query-only connection pool.
+    SQLITE_READONLY_GETS = os.environ.get("SQLITE_READONLY_GETS", "true").lower() == "true"
     FRONTEND_ORIGIN = os.environ.get("FRONTEND_ORIGIN", "http://localhost:5000")
     RESUME_PATH = os.environ.get("RESUME_PATH", "../../assets/Aman Resume.pdf")
     ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "changeme")  # Legacy, not used with JWT
@@ -11,3 +26,54 @@ class Config:
     ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
     ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "root")
     JWT_EXP_MINUTES = int(os.environ.get("JWT_EXP_MINUTES", 60))
+    RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 512))
+    # Where table versions live: "memory" (per process) or "sqlite:///path/to/cache.db"
+    # so every worker sees every write; defaults to the rate limiter's store.
+    RESPONSE_CACHE_STORAGE = os.environ.get("RESPONSE_CACHE_STORAGE",
+                                            os.environ.get("RATE_LIMIT_STORAGE", "memory"))
+    INDEX_HTML_TTL = float(os.environ.get("INDEX_HTML_TTL", 5))  # seconds between index.html mtime checks
+    JWT_CACHE_SIZE = int(os.environ.get("JWT_CACHE_SIZE", 1024))
+    # Werkzeug hash method, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000".
+    # Stored hashes made with other parameters are upgraded on the next login.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 8))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+    CONTACT_QUEUE_MAX_SIZE = int(os.environ.get("CONTACT_QUEUE_MAX_SIZE", 1000))
+    CONTACT_QUEUE_BATCH_SIZE = int(os.environ.get("CONTACT_QUEUE_BATCH_SIZE", 100))
+    CONTACT_QUEUE_FLUSH_INTERVAL = float(os.environ.get("CONTACT_QUEUE_FLUSH_INTERVAL", 0.2))  # seconds
+    # Reverse proxies in front of the app that append to X-Forwarded-For. Rate
+    # limits key on the client address, so behind a proxy set this to the number
+    # of proxy hops (usually 1); leave 0 when clients connect directly, since
+    # the header could then be forged.
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    # "memory" (per process) or "sqlite:///path/to/ratelimit.db" (shared by all workers).
+    RATE_LIMIT_STORAGE = os.environ.get("RATE_LIMIT_STORAGE", "memory")
+    # Token buckets: "N/period" allows bursts of N, refilled evenly over the period.
+    RATE_LIMITS = {
+        "contact": os.environ.get("RATE_LIMIT_CONTACT", "5/minute"),
+        "login": os.environ.get("RATE_LIMIT_LOGIN", "10/minute"),
+        # Failed logins per client address and account.
+        "login_failures": os.environ.get("RATE_LIMIT_LOGIN_FAILURES", "20/hour"),
+        "register": os.environ.get("RATE_LIMIT_REGISTER", "5/hour"),
+        "token": os.environ.get("RATE_LIMIT_TOKEN", "10/minute"),
+        "token_failures": os.environ.get("RATE_LIMIT_TOKEN_FAILURES", "20/hour"),
+    }
+    COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+    # Preference order; encodings whose library is not installed are skipped.
+    COMPRESSION_ENCODINGS = os.environ.get("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",")
+    COMPRESSION_LEVELS = {
+        "br": int(os.environ.get("COMPRESSION_BR_LEVEL", 4)),  # 0-11
+        "zstd": int(os.environ.get("COMPRESSION_ZSTD_LEVEL", 3)),  # 1-22
+        "gzip": int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6)),  # 1-9
+    }
+    COMPRESSION_MIMETYPES = os.environ.get(
+        "COMPRESSION_MIMETYPES",
+        "application/json,application/x-ndjson,text/html,text/css,text/plain,"
+        "text/javascript,application/javascript,image/svg+xml").split(",")
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))  # bytes
+    # Bodies above this size (or of unknown length) are compressed while streaming.
+    COMPRESSION_STREAM_MIN_SIZE = int(os.environ.get("COMPRESSION_STREAM_MIN_SIZE", 262144))  # bytes
+    COMPRESSION_CACHE_ENTRIES = int(os.environ.get("COMPRESSION_CACHE_ENTRIES", 256))
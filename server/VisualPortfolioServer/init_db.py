@@ -1,4 +1,10 @@
+import os
+
+# Hash inline: the worker pool only protects request threads, and a script has none
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
 from app import app
+from utils.search import ensure_search_index
 from models import db, User, Project, Blog, About, Certification, Tag, Author, Experience, TechnicalSkill
 from datetime import datetime, date
 
@@ -241,6 +247,8 @@ def init_db():
         
         # Commit all changes
         db.session.commit()
+        # drop_all() leaves the search index alone; re-index the new content
+        ensure_search_index()
         print("Database initialized successfully with sample data!")
         print("Default admin user created:")
         print("  Username: admin")
@@ -1,11 +1,38 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import exists, func, select, type_coerce
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.passwords import password_hasher
+from utils.database import RoutingSession
+from utils.serialization import Projection, parse_fields
 import os
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# JSON on every backend, stored as JSONB on PostgreSQL so list columns can be
+# GIN-indexed and filtered with containment (@>).
+IndexableJSON = db.JSON().with_variant(JSONB(), 'postgresql')
+
+
+def gin_index(name, column, path_ops=True):
+    """PostgreSQL-only GIN index on a JSONB column (skipped on other backends)."""
+    ops = {column.key: 'jsonb_path_ops'} if path_ops else {}
+    return db.Index(name, column, postgresql_using='gin',
+                    postgresql_ops=ops).ddl_if(dialect='postgresql')
+
+
+def json_list_contains(column, value):
+    """Rows whose IndexableJSON list `column` contains `value`.
+
+    On PostgreSQL this is JSONB containment (tech @> '["Flask"]'), answered
+    by the column's GIN index; elsewhere it scans the array with json_each.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # Coerce so the JSONB comparator (not the generic JSON one) builds @>.
+        return type_coerce(column, JSONB).contains([value])
+    element = func.json_each(column).table_valued('value')
+    return exists(select(1).select_from(element).where(element.c.value == value))
 
 # --- Users ---
 class User(db.Model):
@@ -19,10 +46,13 @@ class User(db.Model):
     last_login = db.Column(db.DateTime, nullable=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
@@ -34,6 +64,8 @@ class User(db.Model):
             'last_login': self.last_login.isoformat() if self.last_login else None
         }
 
+user_fields = Projection(User, ('id', 'username', 'email', 'is_admin', 'created_at', 'last_login'))
+
 class ContactMessage(db.Model):
     __tablename__ = 'contact_messages'
     id = db.Column(db.Integer, primary_key=True)
@@ -44,6 +76,7 @@ class ContactMessage(db.Model):
     phone = db.Column(db.String(50), nullable=True)
     preferred_contact_method = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_read = db.Column(db.Boolean, default=False, server_default=db.false(), nullable=False)
 
     def to_dict(self):
         return {
@@ -54,16 +87,26 @@ class ContactMessage(db.Model):
             'message': self.message,
             'phone': self.phone,
             'preferred_contact_method': self.preferred_contact_method,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'is_read': self.is_read
         }
 
+# Inbox pages (newest first, optionally by read state) and the unread count
+# are answered from these indexes without scanning the table.
+db.Index('ix_contact_messages_created', ContactMessage.created_at.desc(), ContactMessage.id.desc())
+db.Index('ix_contact_messages_read_created', ContactMessage.is_read,
+         ContactMessage.created_at.desc(), ContactMessage.id.desc())
+contact_message_fields = Projection(ContactMessage, (
+    'id', 'name', 'email', 'subject', 'message', 'phone', 'preferred_contact_method',
+    'created_at', 'is_read'))
+
 # --- Projects ---
 class Project(db.Model):
     __tablename__ = 'projects'
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    tech = db.Column(db.JSON, nullable=True)  # list of techs
+    tech = db.Column(IndexableJSON, nullable=True)  # list of techs
     links = db.Column(db.JSON, nullable=True)  # list of {name, url}
     image = db.Column(db.String(300), nullable=True)
     gallery = db.Column(db.JSON, nullable=True)  # list of image/video URLs
@@ -72,7 +115,7 @@ class Project(db.Model):
     end_date = db.Column(db.Date, nullable=True)
     role = db.Column(db.String(100), nullable=True)
     team_size = db.Column(db.Integer, nullable=True)
-    categories = db.Column(db.JSON, nullable=True)  # list of strings
+    categories = db.Column(IndexableJSON, nullable=True)  # list of strings
     is_visible = db.Column(db.Boolean, default=True)
     order = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -97,6 +140,18 @@ class Project(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+db.Index('ix_projects_visible_order', Project.is_visible, Project.order)
+# Which projects are public: shared by the project list, the portfolio
+# summary and the facet index so they agree on rows with NULL is_visible.
+project_is_public = Project.is_visible.is_(True)
+# Same keys as Project.to_dict, for list views that select the columns directly.
+project_fields = Projection(Project, (
+    'id', 'title', 'description', 'tech', 'links', 'image', 'gallery', 'project_type',
+    'start_date', 'end_date', 'role', 'team_size', 'categories', 'is_visible', 'order',
+    'created_at'))
+gin_index('ix_projects_tech', Project.tech)
+gin_index('ix_projects_categories', Project.categories)
+
 # --- Blogs ---
 blog_tags = db.Table('blog_tags',
     db.Column('blog_id', db.Integer, db.ForeignKey('blogs.id'), primary_key=True),
@@ -137,9 +192,13 @@ class Blog(db.Model):
     date = db.Column(db.DateTime, default=datetime.utcnow)
     reading_time = db.Column(db.Integer, nullable=True)
     featured = db.Column(db.Boolean, default=False)
+    is_visible = db.Column(db.Boolean, default=True, server_default=db.true(), nullable=False)
     author_id = db.Column(db.Integer, db.ForeignKey('authors.id'), nullable=True)
-    author = db.relationship('Author', backref=db.backref('blogs', lazy=True))
-    tags = db.relationship('Tag', secondary=blog_tags, lazy='subquery',
+    # Authors are joined into the blog query and tags are fetched with one
+    # IN query per result set, so serializing N blogs costs a fixed number
+    # of queries instead of one author lookup per row.
+    author = db.relationship('Author', lazy='joined', backref=db.backref('blogs', lazy=True))
+    tags = db.relationship('Tag', secondary=blog_tags, lazy='selectin',
         backref=db.backref('blogs', lazy=True))
 
     def to_dict(self):
@@ -152,11 +211,72 @@ class Blog(db.Model):
             'date': self.date.isoformat() if self.date else None,
             'reading_time': self.reading_time,
             'featured': self.featured,
+            'is_visible': self.is_visible,
             'author_id': self.author_id,
             'author': self.author.to_dict() if self.author else None,
             'tags': [tag.to_dict() for tag in self.tags]
         }
 
+db.Index('ix_blogs_visible_date', Blog.is_visible, Blog.date.desc(), Blog.id.desc())
+db.Index('ix_blogs_date', Blog.date.desc(), Blog.id.desc())
+
+# Column keys of Blog.to_dict, and of the list view (no `content`);
+# `blog_dicts` adds the BLOG_RELATED keys.
+blog_fields = Projection(Blog, (
+    'id', 'title', 'excerpt', 'content', 'cover_image', 'date', 'reading_time', 'featured',
+    'is_visible', 'author_id'))
+blog_summary_fields = Projection(Blog, (
+    'id', 'title', 'excerpt', 'cover_image', 'date', 'reading_time', 'featured'))
+BLOG_RELATED = ('author', 'tags')
+_blog_author_columns = (Author.id.label('author__id'), Author.name.label('author__name'),
+                        Author.email.label('author__email'))
+
+
+def blog_fieldset(projection, value, also=()):
+    """(projection, related keys) for a blog view's `?fields=` value.
+
+    The blog id is always selected, since tags are matched by it. Raises
+    ValueError for unknown field names.
+    """
+    keys = parse_fields(value, projection.keys + BLOG_RELATED)
+    if keys is None:
+        return projection, BLOG_RELATED
+    return (projection.only([k for k in keys if k not in BLOG_RELATED], ('id',) + tuple(also)),
+            tuple(k for k in BLOG_RELATED if k in keys))
+
+
+def blog_query(projection, related=BLOG_RELATED):
+    """Query for `blog_dicts`: the projection plus the (outer-joined) author."""
+    if 'author' not in related:
+        return db.session.query(*projection.columns)
+    return (db.session.query(*projection.columns, *_blog_author_columns)
+            .outerjoin(Author, Author.id == Blog.author_id))
+
+
+def blog_dicts(projection, rows, related=BLOG_RELATED):
+    """Blog dicts from rows selected with `blog_query(projection, related)`.
+
+    Tags for the whole list are read with one more query, so the cost does
+    not grow with the number of posts.
+    """
+    rows = list(rows)
+    items = projection.rows(rows)
+    if 'author' in related:
+        for item, row in zip(items, rows):
+            item['author'] = ({'id': row.author__id, 'name': row.author__name,
+                               'email': row.author__email} if row.author__id is not None else None)
+    if 'tags' in related:
+        tags = {row.id: [] for row in rows}
+        if tags:
+            for blog_id, tag_id, name in db.session.execute(
+                    db.select(blog_tags.c.blog_id, Tag.id, Tag.name)
+                    .join(Tag, Tag.id == blog_tags.c.tag_id)
+                    .where(blog_tags.c.blog_id.in_(tags))):
+                tags[blog_id].append({'id': tag_id, 'name': name})
+        for item, row in zip(items, rows):
+            item['tags'] = tags[row.id]
+    return items
+
 # --- Certifications ---
 class Certification(db.Model):
     __tablename__ = 'certifications'
@@ -167,7 +287,7 @@ class Certification(db.Model):
     credential_url = db.Column(db.String(300), nullable=True)
     image = db.Column(db.String(300), nullable=True)
     description = db.Column(db.Text, nullable=True)
-    skills = db.Column(db.JSON, nullable=True)  # list of strings
+    skills = db.Column(IndexableJSON, nullable=True)  # list of strings
     certificate_id = db.Column(db.String(100), nullable=True)
     expiration_date = db.Column(db.Date, nullable=True)
 
@@ -185,6 +305,11 @@ class Certification(db.Model):
             'expiration_date': self.expiration_date.isoformat() if self.expiration_date else None
         }
 
+gin_index('ix_certifications_skills', Certification.skills)
+certification_fields = Projection(Certification, (
+    'id', 'name', 'issuer', 'date', 'credential_url', 'image', 'description', 'skills',
+    'certificate_id', 'expiration_date'))
+
 # --- About ---
 class About(db.Model):
     __tablename__ = 'about'
@@ -199,7 +324,7 @@ class About(db.Model):
     phone = db.Column(db.String(50), nullable=True)
     birthday = db.Column(db.Date, nullable=True)
     resume_url = db.Column(db.String(300), nullable=True)
-    social_links = db.Column(db.JSON, nullable=True)
+    social_links = db.Column(IndexableJSON, nullable=True)
 
     def to_dict(self):
         return {
@@ -217,12 +342,19 @@ class About(db.Model):
             'social_links': self.social_links
         }
 
+# social_links is an object keyed by network, so keep the default operator
+# class, which also supports key-existence (?) lookups.
+gin_index('ix_about_social_links', About.social_links, path_ops=False)
+about_fields = Projection(About, (
+    'id', 'name', 'headline', 'bio', 'photo', 'cover_image', 'location', 'email', 'phone',
+    'birthday', 'resume_url', 'social_links'))
+
 # --- Technical Skills ---
 class TechnicalSkill(db.Model):
     __tablename__ = 'technical_skills'
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
-    skills = db.Column(db.JSON, nullable=True)  # list of skill strings
+    skills = db.Column(IndexableJSON, nullable=True)  # list of skill strings
     color = db.Column(db.String(100), nullable=True)  # gradient color
     icon = db.Column(db.String(50), nullable=True)  # icon name
     order = db.Column(db.Integer, default=0)
@@ -240,7 +372,22 @@ class TechnicalSkill(db.Model):
             'is_visible': self.is_visible
         }
 
+db.Index('ix_technical_skills_visible_order', TechnicalSkill.is_visible, TechnicalSkill.order)
+gin_index('ix_technical_skills_skills', TechnicalSkill.skills)
+technical_skill_fields = Projection(TechnicalSkill, (
+    'id', 'title', 'skills', 'color', 'icon', 'order', 'is_visible'))
+
 # --- Experience ---
+def experience_period(experience):
+    """'MM/YYYY - MM/YYYY' (or '- Present') for an experience or experience row."""
+    start = experience.start_date.strftime('%m/%Y') if experience.start_date else ''
+    if experience.is_current:
+        end = 'Present'
+    else:
+        end = experience.end_date.strftime('%m/%Y') if experience.end_date else ''
+    return f"{start} - {end}"
+
+
 class Experience(db.Model):
     __tablename__ = 'experiences'
     id = db.Column(db.Integer, primary_key=True)
@@ -253,7 +400,7 @@ class Experience(db.Model):
     duration = db.Column(db.String(100), nullable=True)
     responsibilities = db.Column(db.JSON, nullable=True)  # list of strings
     achievements = db.Column(db.JSON, nullable=True)  # list of strings
-    technologies = db.Column(db.JSON, nullable=True)  # list of strings
+    technologies = db.Column(IndexableJSON, nullable=True)  # list of strings
     color = db.Column(db.String(100), nullable=True)  # gradient color
     order = db.Column(db.Integer, default=0)
     is_visible = db.Column(db.Boolean, default=True)
@@ -268,7 +415,7 @@ class Experience(db.Model):
             'start_date': self.start_date.isoformat() if self.start_date else None,
             'end_date': self.end_date.isoformat() if self.end_date else None,
             'is_current': self.is_current,
-            'period': f"{self.start_date.strftime('%m/%Y') if self.start_date else ''} - {'Present' if self.is_current else self.end_date.strftime('%m/%Y') if self.end_date else ''}",
+            'period': experience_period(self),
             'duration': self.duration,
             'responsibilities': self.responsibilities,
             'achievements': self.achievements,
@@ -277,3 +424,11 @@ class Experience(db.Model):
             'order': self.order,
             'is_visible': self.is_visible
         }
+
+db.Index('ix_experiences_visible_order_start', Experience.is_visible,
+         Experience.order.desc(), Experience.start_date.desc())
+gin_index('ix_experiences_technologies', Experience.technologies)
+experience_fields = Projection(Experience, (
+    'id', 'title', 'company', 'location', 'start_date', 'end_date', 'is_current', 'period',
+    'duration', 'responsibilities', 'achievements', 'technologies', 'color', 'order',
+    'is_visible'), computed={'period': (experience_period, ('start_date', 'end_date', 'is_current'))})
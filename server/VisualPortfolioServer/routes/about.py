@@ -1,14 +1,16 @@
 from flask import Blueprint, request, jsonify
-from models import About, db
+from models import About, about_fields, db
 
 
 from utils.security import sanitize_input
 from utils.jwt_auth import jwt_required, admin_required
+from utils.cache import cached_response
 
 about_bp = Blueprint('about', __name__)
 
 
 @about_bp.route('/', methods=['GET'])
+@cached_response('about')
 def get_about():
     """Get about information
     ---
@@ -16,17 +18,29 @@ def get_about():
       - About
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: About info
+      400:
+        description: Invalid fields
       404:
         description: Not found
     """
     try:
-        about = About.query.first()
+        fields = about_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    try:
+        about = About.query.options(fields.load_only()).first()
         if not about:
             return jsonify({"error": "About info not found"}), 404
-        return jsonify(about.to_dict()), 200
+        return jsonify(fields(about)), 200
     except Exception as e:
         return jsonify({"errors": str(e)}), 400
 
@@ -1,13 +1,30 @@
-from flask import Blueprint, request, jsonify
-from models import User, Blog, Certification, About, ContactMessage, Project, db
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import func, select
+from models import User, Blog, Certification, About, ContactMessage, Project, db, user_fields
 from utils.jwt_auth import admin_required
+from utils.cache import cached_response
+from utils.backup import export_lines, import_lines
 from schemas import CertificationSchema, AboutSchema
 from marshmallow import ValidationError
 
 admin_bp = Blueprint('admin', __name__)
 
+# Dashboard stats are cached until one of their tables changes, and for at
+# most this long so the per-day window keeps moving on quiet days.
+DASHBOARD_CACHE_SECONDS = 60
+MESSAGES_PER_DAY_WINDOW = 30
+
+
+def count(model, *criteria):
+    """COUNT(*) of `model` rows as a scalar subquery."""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
 @admin_bp.route('/dashboard', methods=['GET'])
 @admin_required
+@cached_response('projects', 'blogs', 'certifications', 'contact_messages', 'users',
+                 max_age=DASHBOARD_CACHE_SECONDS)
 def admin_dashboard():
     """Get admin dashboard stats
     ---
@@ -17,17 +34,37 @@ def admin_dashboard():
       - Bearer: []
     responses:
       200:
-        description: Dashboard statistics
+        description: Dashboard statistics, including unread messages, messages per day over the last 30 days and visible/hidden project counts
       403:
         description: Admin access required
     """
-    stats = {
-        'projects_count': Project.query.count(),
-        'blogs_count': db.session.query(db.func.count(Blog.id)).scalar(),
-        'certifications_count': Certification.query.count(),
-        'contact_messages_count': ContactMessage.query.count(),
-        'users_count': User.query.count()
-    }
+    # Every count is a scalar subquery of a single SELECT: one round trip.
+    counts = db.session.execute(select(
+        count(Project).label('projects_count'),
+        count(Project, Project.is_visible.is_(True)).label('visible_projects_count'),
+        count(Blog).label('blogs_count'),
+        count(Certification).label('certifications_count'),
+        count(ContactMessage).label('contact_messages_count'),
+        count(ContactMessage, ContactMessage.is_read.is_(False)).label('unread_messages_count'),
+        count(User).label('users_count'),
+    )).mappings().one()
+    stats = dict(counts)
+    stats['hidden_projects_count'] = stats['projects_count'] - stats['visible_projects_count']
+
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=MESSAGES_PER_DAY_WINDOW - 1)
+    day = func.date(ContactMessage.created_at)
+    rows = db.session.execute(
+        select(day, func.count())
+        .where(ContactMessage.created_at >= datetime.combine(first_day, datetime.min.time()))
+        .group_by(day)
+    ).all()
+    # SQLite returns DATE() as text, PostgreSQL as a date; key both by ISO string.
+    per_day = {str(d): n for d, n in rows}
+    stats['messages_per_day'] = [
+        {'date': d.isoformat(), 'count': per_day.get(d.isoformat(), 0)}
+        for d in (first_day + timedelta(days=i) for i in range(MESSAGES_PER_DAY_WINDOW))
+    ]
     return jsonify(stats), 200
 
 
@@ -40,14 +77,26 @@ def admin_get_users():
       - Admin
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: List of all users
+      400:
+        description: Invalid fields
       403:
         description: Admin access required
     """
-    users = User.query.order_by(User.created_at.desc()).all()
-    return jsonify([u.to_dict() for u in users]), 200
+    try:
+        fields = user_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    rows = db.session.execute(db.select(*fields.columns).order_by(User.created_at.desc()))
+    return jsonify(fields.rows(rows)), 200
 
 @admin_bp.route('/users/<int:user_id>/toggle-admin', methods=['PUT'])
 @admin_required
@@ -78,4 +127,63 @@ def admin_toggle_user_admin(user_id):
         db.session.commit()
         return jsonify({'message': f'User admin status updated', 'user': user.to_dict()}), 200
     except Exception as e:
-        return jsonify({'error': 'Failed to update user admin status'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Failed to update user admin status'}), 500
+
+
+@admin_bp.route('/export', methods=['GET'])
+@admin_required
+def admin_export():
+    """Download every table as NDJSON, for backups
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    produces:
+      - application/x-ndjson
+    responses:
+      200:
+        description: >
+          Streamed NDJSON. The first line describes the export, then one
+          {"table", "row"} line per row (users without password hashes), then
+          an end line with the row count of every table
+      403:
+        description: Admin access required
+    """
+    filename = f"portfolio-export-{datetime.utcnow():%Y%m%d-%H%M%S}.ndjson"
+    return Response(stream_with_context(export_lines()), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"',
+                             'Cache-Control': 'no-store'})
+
+
+@admin_bp.route('/import', methods=['POST'])
+@admin_required
+def admin_import():
+    """Restore an export produced by GET /api/admin/export
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    consumes:
+      - application/x-ndjson
+    parameters:
+      - in: body
+        name: body
+        required: true
+        description: The NDJSON export, sent as the raw request body
+        schema:
+          type: string
+    responses:
+      200:
+        description: >
+          Every exported table was replaced by the file's rows (users are merged;
+          new ones cannot log in until a password is set). Returns rows imported
+          per table and the number of users skipped because they already exist
+      400:
+        description: Nothing imported; the file is malformed, truncated or violates a constraint
+      403:
+        description: Admin access required
+    """
+    body, status = import_lines(request.stream)
+    return jsonify(body), status
@@ -4,10 +4,21 @@ from models import User, db
 from datetime import datetime
 from schemas import UserRegistrationSchema, UserLoginSchema
 from marshmallow import ValidationError
+from utils.passwords import HashingBusy
+from utils.rate_limit import limiter
 
 auth_bp = Blueprint('auth', __name__)
 
+
+def server_busy():
+    """Back-pressure response when the password hashing pool is saturated"""
+    response = jsonify({'error': 'Server busy, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 @auth_bp.route('/token', methods=['POST'])
+@limiter.limit('token', failures=('ip_username',), failure_policy='token_failures')
 def get_token():
     """Get JWT token for admin (requires HTTP Basic Auth)
     ---
@@ -27,6 +38,8 @@ def get_token():
                   type: string
       401:
         description: Invalid credentials
+      429:
+        description: Too many attempts, retry after the Retry-After delay
     """
     from flask import request
     import base64
@@ -41,6 +54,7 @@ def get_token():
     return jsonify({'error': 'Invalid credentials'}), 401
 
 @auth_bp.route('/register', methods=['POST'])
+@limiter.limit('register')
 def register():
     """User registration
     ---
@@ -71,6 +85,10 @@ def register():
         description: User registered successfully
       400:
         description: Validation error or user already exists
+      429:
+        description: Too many attempts, retry after the Retry-After delay
+      503:
+        description: Too many concurrent password operations, retry later
     """
     try:
         schema = UserRegistrationSchema()
@@ -99,10 +117,13 @@ def register():
         
     except ValidationError as e:
         return jsonify({'error': 'Validation error', 'details': e.messages}), 400
+    except HashingBusy:
+        return server_busy()
     except Exception as e:
         return jsonify({'error': 'Registration failed'}), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@limiter.limit('login', failures=('ip_username',), failure_policy='login_failures')
 def login():
     """User login
     ---
@@ -129,6 +150,10 @@ def login():
         description: Login successful
       401:
         description: Invalid credentials
+      429:
+        description: Too many attempts, retry after the Retry-After delay
+      503:
+        description: Too many concurrent password operations, retry later
     """
     try:
         schema = UserLoginSchema()
@@ -141,6 +166,9 @@ def login():
         ).first()
         
         if user and user.check_password(data['password']):
+            # Transparently upgrade hashes made with older parameters
+            if user.password_needs_rehash():
+                user.set_password(data['password'])
             # Update last login
             user.last_login = datetime.utcnow()
             db.session.commit()
@@ -156,6 +184,8 @@ def login():
         
     except ValidationError as e:
         return jsonify({'error': 'Validation error', 'details': e.messages}), 400
+    except HashingBusy:
+        return server_busy()
     except Exception as e:
         return jsonify({'error': 'Login failed'}), 500
 
@@ -1,28 +1,178 @@
+from datetime import datetime
+
 from flask import Blueprint, request, jsonify
-from models import Blog, db
+from sqlalchemy.exc import IntegrityError
+from models import (Author, Blog, Tag, db, blog_dicts, blog_fields, blog_fieldset, blog_query,
+                    blog_summary_fields)
 
 
 from utils.security import sanitize_input
 from utils.jwt_auth import jwt_required, admin_required
+from utils.cache import NameCache, cached_response
+from utils.pagination import paginate, parse_page_size
+from utils.bulk import apply_bulk
+from schemas import BlogSchema
 
 blogs_bp = Blueprint('blogs', __name__)
+# Bulk operations set columns only; tags are managed through POST/PUT.
+blog_bulk_schema = BlogSchema(exclude=('tag_ids',))
+
+tag_ids = NameCache(Tag)
+author_ids = NameCache(Author)
+
+
+def _as_id(value):
+    try:
+        return int(value) if value not in (None, '', False) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _insert_missing_tags(names):
+    """Insert tags by name, ignoring names another writer inserted first."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for name in names:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(Tag(name=name))
+            except IntegrityError:
+                pass
+        return
+    db.session.execute(insert(Tag).values([{'name': name} for name in sorted(names)])
+                       .on_conflict_do_nothing(index_elements=['name']))
+
+
+def resolve_tags(items):
+    """Tag objects for a list of {id, name} objects or plain names.
+
+    Unknown ids fall back to the name, and names that do not exist yet are
+    created. With every name in the hot cache this is one primary-key IN
+    query; otherwise one IN query by name, plus one multi-row upsert and a
+    re-select for new names, whatever the number of tags.
+    """
+    wanted = []
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict):
+            wanted.append((_as_id(item.get('id')), item.get('name') or None))
+        elif item:
+            wanted.append((None, str(item)))
+    names = {name for _, name in wanted if name}
+
+    cached = tag_ids.get_many(names)
+    lookup_ids = {tag_id for tag_id, _ in wanted if tag_id} | set(cached.values())
+    by_id = {t.id: t for t in Tag.query.filter(Tag.id.in_(lookup_ids))} if lookup_ids else {}
+    by_name = {t.name: t for t in by_id.values()}
+
+    missing = {name for tag_id, name in wanted
+               if name and tag_id not in by_id and name not in by_name}
+    if missing:
+        generation = tag_ids.generation
+        found = Tag.query.filter(Tag.name.in_(missing)).all()
+        tag_ids.update({t.name: t.id for t in found}, generation)
+        by_name.update((t.name, t) for t in found)
+        new_names = missing - set(by_name)
+        if new_names:
+            _insert_missing_tags(new_names)
+            by_name.update((t.name, t) for t in Tag.query.filter(Tag.name.in_(new_names)))
+
+    tags, seen = [], set()
+    for tag_id, name in wanted:
+        tag = by_id.get(tag_id) or by_name.get(name)
+        if tag is not None and tag.id not in seen:
+            seen.add(tag.id)
+            tags.append(tag)
+    return tags
+
+
+def resolve_author(value):
+    """Author for an {id, name} object or a plain name, created if missing."""
+    if isinstance(value, dict):
+        author_id, name = _as_id(value.get('id')), value.get('name')
+    else:
+        author_id, name = None, value
+    author = db.session.get(Author, author_id) if author_id else None
+    if author is None and name:
+        cached_id = author_ids.get_many([name]).get(name)
+        if cached_id:
+            author = db.session.get(Author, cached_id)
+            if author is not None and author.name != name:
+                author = None
+        if author is None:
+            generation = author_ids.generation
+            author = Author.query.filter_by(name=name).first()
+            if author is not None:
+                author_ids.update({name: author.id}, generation)
+            else:
+                author = Author(name=name)
+                db.session.add(author)
+    return author
 
 
 @blogs_bp.route('/', methods=['GET'])
+@cached_response('blogs', 'tags', 'authors')
 def get_blogs():
-    """List all visible blogs
+    """List blog summaries (without full content), newest first
     ---
     tags:
       - Blogs
+    parameters:
+      - in: query
+        name: limit
+        required: false
+        schema:
+          type: integer
+        description: Page size (max 100). When given, the response is a page object with `items` and `next_cursor`.
+      - in: query
+        name: cursor
+        required: false
+        schema:
+          type: string
+        description: Opaque cursor returned as `next_cursor` by the previous page
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
-        description: List of visible blogs
+        description: List of blog summaries, or a page of them when `limit` is given
+      400:
+        description: Invalid limit, cursor or fields
     """
-    blogs = Blog.query.filter_by(is_visible=True).order_by(Blog.date.desc()).all()
-    return jsonify([b.to_dict() for b in blogs]), 200
+    try:
+        # The cursor is built from the date and id of the last row.
+        fields, related = blog_fieldset(blog_summary_fields, request.args.get('fields'),
+                                        also=('date',))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    query = (blog_query(fields, related)
+             .filter(Blog.is_visible.is_(True))
+             .order_by(Blog.date.desc().nulls_last(), Blog.id.desc()))
+
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        return jsonify(blog_dicts(fields, query, related)), 200
+
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+    except ValueError:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    try:
+        rows, next_cursor = paginate(query, Blog.date, Blog.id, limit, request.args.get('cursor'))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid cursor"}), 400
+    return jsonify({
+        'items': blog_dicts(fields, rows, related),
+        'next_cursor': next_cursor
+    }), 200
 
 @blogs_bp.route('/admin', methods=['GET'])
 @admin_required
+@cached_response('blogs', 'tags', 'authors')
 def get_all_blogs():
     """List all blogs (including hidden ones) - Admin only
     ---
@@ -30,16 +180,29 @@ def get_all_blogs():
       - Blogs
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: List of all blogs
+      400:
+        description: Invalid fields
       403:
         description: Admin access required
     """
-    blogs = Blog.query.order_by(Blog.date.desc()).all()
-    return jsonify([b.to_dict() for b in blogs]), 200
+    try:
+        fields, related = blog_fieldset(blog_fields, request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    query = blog_query(fields, related).order_by(Blog.date.desc())
+    return jsonify(blog_dicts(fields, query, related)), 200
 
 @blogs_bp.route('/<int:blog_id>', methods=['GET'])
+@cached_response('blogs', 'tags', 'authors')
 def get_blog(blog_id):
     """Get a single blog post by ID
     ---
@@ -51,16 +214,27 @@ def get_blog(blog_id):
         required: true
         schema:
           type: integer
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: Blog post details
+      400:
+        description: Invalid fields
       404:
         description: Blog not found
     """
-    blog = Blog.query.get(blog_id)
-    if not blog:
+    try:
+        fields, related = blog_fieldset(blog_fields, request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    row = blog_query(fields, related).filter(Blog.id == blog_id, Blog.is_visible.is_(True)).first()
+    if row is None:
         return jsonify({"error": "Blog not found"}), 404
-    return jsonify(blog.to_dict()), 200
+    return jsonify(blog_dicts(fields, [row], related)[0]), 200
 
 @blogs_bp.route('/', methods=['POST'])
 @admin_required
@@ -106,6 +280,9 @@ def create_blog():
             featured:
               type: boolean
               description: Featured blog flag
+            is_visible:
+              type: boolean
+              description: Visibility flag
             tags:
               type: array
               items:
@@ -139,7 +316,6 @@ def create_blog():
         excerpt = sanitize_input(data.get('excerpt', ''))
         content = sanitize_input(data.get('content', ''))
         cover_image = sanitize_input(data.get('cover_image', ''))
-        from datetime import datetime
         date_str = data.get('date')
         date = None
         if date_str:
@@ -149,51 +325,20 @@ def create_blog():
                 date = None
         reading_time = data.get('reading_time')
         featured = bool(data.get('featured', False))
-        # Tags: expects a list of objects (with at least name or id)
-        tags = []
-        tag_objs = data.get('tags', [])
-        if isinstance(tag_objs, list):
-            from models import Tag, db
-            for tag_obj in tag_objs:
-                if isinstance(tag_obj, dict):
-                    tag_id = tag_obj.get('id')
-                    tag_name = tag_obj.get('name')
-                else:
-                    tag_id = None
-                    tag_name = str(tag_obj)
-                tag = None
-                if tag_id:
-                    tag = Tag.query.get(tag_id)
-                if not tag and tag_name:
-                    tag = Tag.query.filter_by(name=tag_name).first()
-                if not tag and tag_name:
-                    tag = Tag(name=tag_name)
-                    db.session.add(tag)
-                if tag:
-                    tags.append(tag)
-        # Author: expects an object (with at least id or name)
-        author = None
-        author_obj = data.get('author')
-        if isinstance(author_obj, dict):
-            author_id = author_obj.get('id')
-            author_name = author_obj.get('name')
-            from models import Author, db
-            if author_id:
-                author = Author.query.get(author_id)
-            if not author and author_name:
-                author = Author.query.filter_by(name=author_name).first()
-            if not author and author_name:
-                author = Author(name=author_name)
-                db.session.add(author)
+        # Tags: a list of objects (with at least name or id) or plain names
+        tags = resolve_tags(data.get('tags', []))
+        # Author: an object (with at least id or name)
+        author = resolve_author(data.get('author')) if isinstance(data.get('author'), dict) else None
 
         blog = Blog(
             title=title,
-            excerpt=sanitize_input(data.get('excerpt', '')),
+            excerpt=excerpt,
             content=content,
-            cover_image=sanitize_input(data.get('cover_image', '')),
+            cover_image=cover_image,
             date=date,
-            reading_time=data.get('reading_time'),
-            featured=bool(data.get('featured', False)),
+            reading_time=reading_time,
+            featured=featured,
+            is_visible=bool(data.get('is_visible', True)),
             author=author,
             tags=tags
         )
@@ -249,12 +394,11 @@ def update_blog(blog_id):
       404:
         description: Blog not found
     """
-    blog = Blog.query.get(blog_id)
+    blog = db.session.get(Blog, blog_id)
     if not blog:
         return jsonify({"error": "Blog not found"}), 404
     try:
         data = request.json
-        from datetime import datetime
         for field in ['title', 'excerpt', 'content', 'cover_image']:
             if field in data:
                 setattr(blog, field, sanitize_input(data[field]))
@@ -262,6 +406,8 @@ def update_blog(blog_id):
             blog.reading_time = data['reading_time']
         if 'featured' in data:
             blog.featured = bool(data['featured'])
+        if 'is_visible' in data:
+            blog.is_visible = bool(data['is_visible'])
         # Handle date
         if 'date' in data:
             date_str = data['date']
@@ -271,25 +417,10 @@ def update_blog(blog_id):
                 pass
         # Handle tags
         if 'tags' in data:
-            tag_names = list(set(data['tags'])) if isinstance(data['tags'], list) else []
-            tags = []
-            from models import Tag, db
-            for tag_name in tag_names:
-                tag = Tag.query.filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name)
-                    db.session.add(tag)
-                tags.append(tag)
-            blog.tags = tags
+            blog.tags = resolve_tags(data['tags'])
         # Handle author
         if 'author' in data:
-            author_name = data['author']
-            from models import Author, db
-            author = Author.query.filter_by(name=author_name).first()
-            if not author:
-                author = Author(name=author_name)
-                db.session.add(author)
-            blog.author = author
+            blog.author = resolve_author(data['author'])
         db.session.commit()
         return jsonify(blog.to_dict()), 200
     except Exception as err:
@@ -319,9 +450,49 @@ def delete_blog(blog_id):
       404:
         description: Blog not found
     """
-    blog = Blog.query.get(blog_id)
+    blog = db.session.get(Blog, blog_id)
     if not blog:
         return jsonify({"error": "Blog not found"}), 404
     db.session.delete(blog)
     db.session.commit()
     return '', 204
+
+@blogs_bp.route('/bulk', methods=['POST'])
+@admin_required
+def bulk_blogs():
+    """Apply a batch of blog creates, updates and deletes in one transaction
+    ---
+    tags:
+      - Blogs
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            required:
+              - op
+            properties:
+              op:
+                type: string
+                enum: [create, update, delete]
+              id:
+                type: integer
+                description: Target ID (update and delete)
+              data:
+                type: object
+                description: Column fields to set (create and update); tags are not supported here
+    responses:
+      200:
+        description: All operations applied; `results` lists the affected IDs in request order
+      400:
+        description: Nothing applied; `details` lists the failing operations by index
+      403:
+        description: Admin access required
+    """
+    body, status = apply_bulk(Blog, request.get_json(silent=True), blog_bulk_schema, sanitize=True)
+    return jsonify(body), status
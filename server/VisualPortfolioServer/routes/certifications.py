@@ -1,14 +1,19 @@
 from flask import Blueprint, request, jsonify
 
-from models import Certification, db
+from models import Certification, certification_fields, db
 
 from utils.security import sanitize_input
 from utils.jwt_auth import jwt_required, admin_required
+from utils.cache import cached_response
+from utils.bulk import apply_bulk
+from schemas import CertificationSchema
 
 certifications_bp = Blueprint('certifications', __name__)
+certification_schema = CertificationSchema()
 
 
 @certifications_bp.route('/', methods=['GET'])
+@cached_response('certifications')
 def get_certifications():
     """List all certifications
     ---
@@ -16,12 +21,24 @@ def get_certifications():
       - Certifications
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: List of certifications
+      400:
+        description: Invalid fields
     """
-    certifications = Certification.query.all()
-    return jsonify([c.to_dict() for c in certifications]), 200
+    try:
+        fields = certification_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    rows = db.session.execute(db.select(*fields.columns))
+    return jsonify(fields.rows(rows)), 200
 
 @certifications_bp.route('/', methods=['POST'])
 @admin_required
@@ -230,3 +247,44 @@ def delete_certification(cert_id):
     db.session.delete(cert)
     db.session.commit()
     return '', 204
+
+@certifications_bp.route('/bulk', methods=['POST'])
+@admin_required
+def bulk_certifications():
+    """Apply a batch of certification creates, updates and deletes in one transaction
+    ---
+    tags:
+      - Certifications
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            required:
+              - op
+            properties:
+              op:
+                type: string
+                enum: [create, update, delete]
+              id:
+                type: integer
+                description: Target ID (update and delete)
+              data:
+                type: object
+                description: Fields to set (create and update)
+    responses:
+      200:
+        description: All operations applied; `results` lists the affected IDs in request order
+      400:
+        description: Nothing applied; `details` lists the failing operations by index
+      403:
+        description: Admin access required
+    """
+    body, status = apply_bulk(Certification, request.get_json(silent=True), certification_schema,
+                              sanitize=True)
+    return jsonify(body), status
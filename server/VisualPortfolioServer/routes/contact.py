@@ -1,17 +1,115 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
-from models import ContactMessage, db
+from marshmallow import ValidationError, EXCLUDE
+from sqlalchemy import func
+from models import ContactMessage, contact_message_fields, db
+from schemas import ContactMessageSchema
 from utils.security import sanitize_input
 from utils.jwt_auth import admin_required
-from flask_limiter.util import get_remote_address
-from flask_limiter import Limiter
+from utils.contact_queue import contact_queue
+from utils.pagination import paginate, parse_page_size
+from utils.rate_limit import limiter
 import logging
 
 contact_bp = Blueprint('contact', __name__)
+contact_message_schema = ContactMessageSchema()
+
+def parse_bool(value):
+    if value.lower() in ('true', '1', 'yes'):
+        return True
+    if value.lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError(f"Invalid boolean: {value}")
+
 
 @contact_bp.route('/admin/messages', methods=['GET'])
 @admin_required
 def get_contact_messages():
-    """Get all contact messages (Admin only)
+    """List contact messages, newest first, one page at a time (Admin only)
+    ---
+    tags:
+      - Contact
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: limit
+        required: false
+        schema:
+          type: integer
+        description: Page size (default 20, max 100)
+      - in: query
+        name: cursor
+        required: false
+        schema:
+          type: string
+        description: Opaque cursor returned as `next_cursor` by the previous page
+      - in: query
+        name: is_read
+        required: false
+        schema:
+          type: boolean
+        description: Only read (true) or unread (false) messages
+      - in: query
+        name: since
+        required: false
+        schema:
+          type: string
+          format: date-time
+        description: Only messages received at or after this ISO date/time
+      - in: query
+        name: until
+        required: false
+        schema:
+          type: string
+          format: date-time
+        description: Only messages received before this ISO date/time
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
+    responses:
+      200:
+        description: Page of contact messages with `items` and `next_cursor`
+      400:
+        description: Invalid filter, limit, cursor or fields
+      403:
+        description: Admin access required
+    """
+    try:
+        # The cursor is built from the created_at and id of the last row.
+        fields = contact_message_fields.requested(request.args.get('fields'),
+                                                  also=('created_at', 'id'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    query = db.session.query(*fields.columns)
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+        if 'is_read' in request.args:
+            query = query.filter(ContactMessage.is_read == parse_bool(request.args['is_read']))
+        if 'since' in request.args:
+            query = query.filter(ContactMessage.created_at >= datetime.fromisoformat(request.args['since']))
+        if 'until' in request.args:
+            query = query.filter(ContactMessage.created_at < datetime.fromisoformat(request.args['until']))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid query parameter', 'details': str(e)}), 400
+
+    query = query.order_by(ContactMessage.created_at.desc().nulls_last(), ContactMessage.id.desc())
+    try:
+        messages, next_cursor = paginate(query, ContactMessage.created_at, ContactMessage.id,
+                                         limit, request.args.get('cursor'))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return jsonify({
+        'items': fields.rows(messages),
+        'next_cursor': next_cursor
+    }), 200
+
+@contact_bp.route('/admin/messages/unread-count', methods=['GET'])
+@admin_required
+def get_unread_count():
+    """Count unread contact messages (Admin only)
     ---
     tags:
       - Contact
@@ -19,12 +117,19 @@ def get_contact_messages():
       - Bearer: []
     responses:
       200:
-        description: List of contact messages
+        description: Number of unread messages
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                unread:
+                  type: integer
       403:
         description: Admin access required
     """
-    messages = ContactMessage.query.order_by(ContactMessage.created_at.desc()).all()
-    return jsonify([m.to_dict() for m in messages]), 200
+    unread = ContactMessage.query.filter_by(is_read=False).with_entities(func.count()).scalar()
+    return jsonify({'unread': unread}), 200
 
 @contact_bp.route('/admin/messages/<int:message_id>/mark-read', methods=['PUT'])
 @admin_required
@@ -49,8 +154,8 @@ def mark_contact_message_read(message_id):
       403:
         description: Admin access required
     """
+    message = ContactMessage.query.get_or_404(message_id)
     try:
-        message = ContactMessage.query.get_or_404(message_id)
         message.is_read = True
         db.session.commit()
         return jsonify({'message': 'Contact message marked as read successfully'}), 200
@@ -102,8 +207,8 @@ def delete_contact_message(message_id):
       403:
         description: Admin access required
     """
+    message = ContactMessage.query.get_or_404(message_id)
     try:
-        message = ContactMessage.query.get_or_404(message_id)
         db.session.delete(message)
         db.session.commit()
         return jsonify({'message': 'Contact message deleted successfully'}), 200
@@ -112,6 +217,7 @@ def delete_contact_message(message_id):
 
 
 @contact_bp.route('/', methods=['POST'])
+@limiter.limit('contact')
 def submit_contact():
     """Send a contact message
     ---
@@ -148,28 +254,30 @@ def submit_contact():
               description: Preferred contact method (email/phone/other)
     security: []  # Explicitly mark this endpoint as public in Swagger
     responses:
-      201:
-        description: Message sent
+      202:
+        description: Message accepted and queued for storage
       400:
         description: Validation error
+      429:
+        description: Too many submissions, retry after the Retry-After delay
+      503:
+        description: Too many pending messages, retry later
     """
-    data = request.json
-    # Sanitize input to prevent XSS
-    name = sanitize_input(data.get('name', ''))
-    email = sanitize_input(data.get('email', ''))
-    subject = sanitize_input(data.get('subject', ''))
-    message = sanitize_input(data.get('message', ''))
-    phone = sanitize_input(data.get('phone', ''))
-    preferred_contact_method = sanitize_input(data.get('preferred_contact_method', ''))
+    try:
+        data = contact_message_schema.load(request.get_json(silent=True) or {}, unknown=EXCLUDE)
+    except ValidationError as e:
+        return jsonify({'error': 'Validation error', 'details': e.messages}), 400
+
+    # Sanitize input to prevent XSS; optional fields left out stay NULL
+    row = {field: sanitize_input(data.get(field, '')) for field in
+           ('name', 'email', 'subject', 'message')}
+    for field in ('phone', 'preferred_contact_method'):
+        row[field] = sanitize_input(data[field]) if data.get(field) is not None else None
+    row['created_at'] = datetime.utcnow()
 
-    contact = ContactMessage(
-        name=name,
-        email=email,
-        subject=subject,
-        message=message,
-        phone=phone,
-        preferred_contact_method=preferred_contact_method
-    )
-    db.session.add(contact)
-    db.session.commit()
-    return jsonify(contact.to_dict()), 201
+    if not contact_queue.submit(row):
+        response = jsonify({'error': 'Too many pending messages, please retry shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    return jsonify({'message': 'Message received'}), 202
@@ -3,9 +3,11 @@ from sqlalchemy.exc import IntegrityError
 from marshmallow import ValidationError
 from flasgger import swag_from
 
-from models import db, Experience
+from models import db, Experience, experience_fields
 from schemas import ExperienceSchema
 from utils.jwt_auth import admin_required, get_current_user_admin_status
+from utils.cache import cached_response
+from utils.bulk import apply_bulk
 
 experiences_bp = Blueprint('experiences', __name__)
 experience_schema = ExperienceSchema()
@@ -16,6 +18,13 @@ experiences_schema = ExperienceSchema(many=True)
     'tags': ['Experiences'],
     'summary': 'Get all visible experiences',
     'description': 'Retrieve all visible work experiences ordered by date',
+    'parameters': [{
+        'in': 'query',
+        'name': 'fields',
+        'type': 'string',
+        'required': False,
+        'description': 'Comma-separated keys to return (default all); other columns are not read'
+    }],
     'responses': {
         200: {
             'description': 'List of experiences',
@@ -40,8 +49,13 @@ experiences_schema = ExperienceSchema(many=True)
         }
     }
 })
+@cached_response('experiences')
 def get_experiences():
     """Get all visible work experiences"""
+    try:
+        fields = experience_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
     try:
         # VISIBILITY TOGGLE FIX: Check admin parameter explicitly
         is_admin_request = request.args.get('admin', '').lower() == 'true'
@@ -49,12 +63,13 @@ def get_experiences():
         # Query based on admin status
         if is_admin_request:
             # Admin management view: show ALL experiences including hidden
-            experiences = Experience.query.order_by(Experience.order.desc(), Experience.start_date.desc()).all()
+            query = db.select(*fields.columns)
         else:
             # Public portfolio view: show only visible experiences
-            experiences = Experience.query.filter_by(is_visible=True).order_by(Experience.order.desc(), Experience.start_date.desc()).all()
-        
-        return jsonify([exp.to_dict() for exp in experiences]), 200
+            query = db.select(*fields.columns).where(Experience.is_visible.is_(True))
+        rows = db.session.execute(query.order_by(Experience.order.desc(), Experience.start_date.desc()))
+
+        return jsonify(fields.rows(rows)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -125,16 +140,29 @@ def create_experience():
         'name': 'experience_id',
         'type': 'integer',
         'required': True
+    }, {
+        'in': 'query',
+        'name': 'fields',
+        'type': 'string',
+        'required': False,
+        'description': 'Comma-separated keys to return (default all); other columns are not read'
     }],
     'responses': {
         200: {'description': 'Experience details'},
+        400: {'description': 'Invalid fields'},
         404: {'description': 'Experience not found'}
     }
 })
+@cached_response('experiences')
 def get_experience(experience_id):
     """Get specific experience by ID"""
-    experience = Experience.query.get_or_404(experience_id)
-    return jsonify(experience.to_dict()), 200
+    try:
+        fields = experience_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    experience = (Experience.query.options(fields.load_only())
+                  .filter_by(id=experience_id).first_or_404())
+    return jsonify(fields(experience)), 200
 
 @experiences_bp.route('/<int:experience_id>', methods=['PUT'])
 @admin_required
@@ -227,4 +255,37 @@ def delete_experience(experience_id):
         return jsonify({'message': 'Experience deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@experiences_bp.route('/bulk', methods=['POST'])
+@admin_required
+@swag_from({
+    'tags': ['Experiences'],
+    'summary': 'Bulk create, update and delete experiences',
+    'description': 'Apply an array of operations ({"op": "create"|"update"|"delete", "id", "data"}) in a single transaction (Admin only). A reorder is a list of updates to `order`.',
+    'parameters': [{
+        'in': 'body',
+        'name': 'operations',
+        'required': True,
+        'schema': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'op': {'type': 'string', 'enum': ['create', 'update', 'delete']},
+                    'id': {'type': 'integer'},
+                    'data': {'type': 'object'}
+                }
+            }
+        }
+    }],
+    'responses': {
+        200: {'description': 'All operations applied'},
+        400: {'description': 'Nothing applied; per-operation errors by index'},
+        401: {'description': 'Unauthorized'}
+    }
+})
+def bulk_experiences():
+    """Apply a batch of experience operations in one transaction"""
+    body, status = apply_bulk(Experience, request.get_json(silent=True), experience_schema)
+    return jsonify(body), status
@@ -0,0 +1,90 @@
+from flask import Blueprint, request, jsonify
+
+from models import (About, Project, Blog, Experience, TechnicalSkill, Certification, db,
+                    project_fields, project_is_public, blog_query, blog_dicts,
+                    blog_summary_fields)
+from utils.cache import cached_response
+
+portfolio_bp = Blueprint('portfolio', __name__)
+
+
+def _about():
+    about = About.query.first()
+    return about.to_dict() if about else None
+
+
+def _projects():
+    rows = db.session.execute(db.select(*project_fields.columns)
+                              .where(project_is_public).order_by(Project.order.asc()))
+    return project_fields.rows(rows)
+
+
+def _blogs():
+    # Summaries only, as in the blog list; bodies load from GET /api/blogs/<id>.
+    query = (blog_query(blog_summary_fields)
+             .filter(Blog.is_visible.is_(True))
+             .order_by(Blog.date.desc().nulls_last(), Blog.id.desc()))
+    return blog_dicts(blog_summary_fields, query)
+
+
+def _experiences():
+    experiences = (Experience.query.filter_by(is_visible=True)
+                   .order_by(Experience.order.desc(), Experience.start_date.desc())
+                   .all())
+    return [e.to_dict() for e in experiences]
+
+
+def _technical_skills():
+    skills = TechnicalSkill.query.filter_by(is_visible=True).order_by(TechnicalSkill.order).all()
+    return [s.to_dict() for s in skills]
+
+
+def _certifications():
+    return [c.to_dict() for c in Certification.query.all()]
+
+
+# Section name -> loader. Order is the order sections appear in the document.
+SECTIONS = {
+    'about': _about,
+    'projects': _projects,
+    'blogs': _blogs,
+    'experiences': _experiences,
+    'technical_skills': _technical_skills,
+    'certifications': _certifications,
+}
+
+
+@portfolio_bp.route('/', methods=['GET'])
+@cached_response('about', 'projects', 'blogs', 'tags', 'authors',
+                 'experiences', 'technical_skills', 'certifications')
+def get_portfolio():
+    """Get the whole public portfolio in a single document
+    ---
+    tags:
+      - Portfolio
+    parameters:
+      - in: query
+        name: include
+        required: false
+        schema:
+          type: string
+        description: Comma-separated sections to return (about, projects, blogs, experiences, technical_skills, certifications). Defaults to all.
+    responses:
+      200:
+        description: Portfolio document keyed by section
+      400:
+        description: Unknown section requested
+    """
+    include = request.args.get('include')
+    if include:
+        requested = [s.strip().replace('-', '_') for s in include.split(',') if s.strip()]
+        unknown = [s for s in requested if s not in SECTIONS]
+        if unknown:
+            return jsonify({"error": f"Unknown sections: {', '.join(unknown)}"}), 400
+    else:
+        requested = list(SECTIONS)
+
+    # Sections share the request's session, so every query runs on one
+    # connection inside one read transaction.
+    document = {name: loader() for name, loader in SECTIONS.items() if name in requested}
+    return jsonify(document), 200
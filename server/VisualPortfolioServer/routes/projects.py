@@ -1,28 +1,128 @@
 from flask import Blueprint, request, jsonify
-from models import Project, db
+from sqlalchemy import or_
+from models import Project, db, json_list_contains, project_fields, project_is_public
 
 
 from utils.security import sanitize_input
 from utils.jwt_auth import jwt_required, admin_required
+from utils.cache import cached_response
+from utils.bulk import apply_bulk
+from utils.facets import parse_filters, project_facets
+from schemas import ProjectSchema
 
 projects_bp = Blueprint('projects', __name__)
+project_schema = ProjectSchema()
 
 
 @projects_bp.route('/', methods=['GET'])
+@cached_response('projects')
 def get_projects():
-    """List all visible projects
+    """List all visible projects, optionally filtered by facet
     ---
     tags:
       - Projects
+    parameters:
+      - in: query
+        name: tech
+        type: string
+        required: false
+        description: Technology (repeat for any of several)
+      - in: query
+        name: category
+        type: string
+        required: false
+        description: Category (repeat for any of several)
+      - in: query
+        name: type
+        type: string
+        required: false
+        description: Project type (repeat for any of several)
+      - in: query
+        name: from
+        type: integer
+        required: false
+        description: Earliest start year
+      - in: query
+        name: to
+        type: integer
+        required: false
+        description: Latest start year
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: List of visible projects
+      400:
+        description: Invalid year or fields
     """
-    projects = Project.query.filter_by(is_visible=True).order_by(Project.order.asc()).all()
-    return jsonify([p.to_dict() for p in projects]), 200
+    try:
+        filters = parse_filters(request.args)
+    except ValueError:
+        return jsonify({'error': 'from and to must be years'}), 400
+    try:
+        fields = project_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    query = db.select(*fields.columns).where(project_is_public)
+    if any(filters.values()):
+        ids = project_facets.search(filters)
+        if not ids:
+            return jsonify([]), 200
+        query = query.where(Project.id.in_(ids))
+    rows = db.session.execute(query.order_by(Project.order.asc()))
+    return jsonify(fields.rows(rows)), 200
+
+
+@projects_bp.route('/facets', methods=['GET'])
+@cached_response('projects')
+def get_project_facets():
+    """Facet counts for the visible projects
+    ---
+    tags:
+      - Projects
+    description: >
+      Accepts the same filters as the project list. `total` is the number of
+      matching projects; each facet's counts apply the other facets' filters
+      only, so they show what selecting another value would return.
+    parameters:
+      - in: query
+        name: tech
+        type: string
+        required: false
+      - in: query
+        name: category
+        type: string
+        required: false
+      - in: query
+        name: type
+        type: string
+        required: false
+      - in: query
+        name: from
+        type: integer
+        required: false
+      - in: query
+        name: to
+        type: integer
+        required: false
+    responses:
+      200:
+        description: "{total, facets: {tech, category, type, year: {value: count}}}"
+      400:
+        description: Invalid year
+    """
+    try:
+        filters = parse_filters(request.args)
+    except ValueError:
+        return jsonify({'error': 'from and to must be years'}), 400
+    return jsonify(project_facets.counts(filters)), 200
 
 @projects_bp.route('/admin', methods=['GET'])
 @admin_required
+@cached_response('projects')
 def get_all_projects():
     """List all projects (including hidden ones) - Admin only
     ---
@@ -30,14 +130,37 @@ def get_all_projects():
       - Projects
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: tech
+        type: string
+        required: false
+        description: Technology (repeat for any of several); a GIN index lookup on PostgreSQL
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated keys to return (default all); other columns are not read
     responses:
       200:
         description: List of all projects
+      400:
+        description: Invalid fields
       403:
         description: Admin access required
     """
-    projects = Project.query.order_by(Project.order.asc()).all()
-    return jsonify([p.to_dict() for p in projects]), 200
+    try:
+        fields = project_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
+    # Hidden projects are not in the facet index, so the admin list filters
+    # in the database.
+    query = db.select(*fields.columns).order_by(Project.order.asc())
+    techs = [t for t in request.args.getlist('tech') if t]
+    if techs:
+        query = query.where(or_(*(json_list_contains(Project.tech, t) for t in techs)))
+    rows = db.session.execute(query)
+    return jsonify(fields.rows(rows)), 200
 
 @projects_bp.route('/', methods=['POST'])
 @admin_required
@@ -315,3 +438,43 @@ def delete_project(project_id):
     db.session.delete(project)
     db.session.commit()
     return '', 204
+
+@projects_bp.route('/bulk', methods=['POST'])
+@admin_required
+def bulk_projects():
+    """Apply a batch of project creates, updates and deletes in one transaction
+    ---
+    tags:
+      - Projects
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            required:
+              - op
+            properties:
+              op:
+                type: string
+                enum: [create, update, delete]
+              id:
+                type: integer
+                description: Target ID (update and delete)
+              data:
+                type: object
+                description: Fields to set (create and update)
+    responses:
+      200:
+        description: All operations applied; `results` lists the affected IDs in request order
+      400:
+        description: Nothing applied; `details` lists the failing operations by index
+      403:
+        description: Admin access required
+    """
+    body, status = apply_bulk(Project, request.get_json(silent=True), project_schema, sanitize=True)
+    return jsonify(body), status
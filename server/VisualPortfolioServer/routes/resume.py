@@ -1,16 +1,93 @@
-from flask import Blueprint, send_file, current_app, abort
+from flask import Blueprint, Response, current_app, abort, request
+from datetime import datetime, timezone
+import mmap
 import os
+import threading
 from utils.jwt_auth import jwt_required
 
 resume_bp = Blueprint('resume', __name__)
 
+DOWNLOAD_NAME = "Aman_Kayare_Resume.pdf"
+# Bytes copied out of the memory map per chunk of the response body.
+CHUNK_SIZE = 256 * 1024
+
+
+class MappedFile:
+    """A read-only memory map of a file, reused until the file changes.
+
+    A replaced map is not closed explicitly: responses still streaming from
+    it keep it alive and it is released once they finish.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._state = None
+
+    def get(self, path):
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key != self._key:
+            with self._lock:
+                if key != self._key:
+                    self._state = self._load(path, st)
+                    self._key = key
+        return self._state
+
+    @staticmethod
+    def _load(path, st):
+        if st.st_size:
+            with open(path, 'rb') as f:
+                buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(b'')
+        return {
+            'buffer': buffer,
+            'size': len(buffer),
+            'etag': f'{st.st_mtime_ns:x}-{st.st_size:x}',
+            'last_modified': datetime.fromtimestamp(int(st.st_mtime), timezone.utc),
+        }
+
+
+resume_file = MappedFile()
+
+
+def _satisfiable_range(size, etag, last_modified):
+    """Return (start, stop) for a single-range request, None for a full
+    response, or False when the range cannot be satisfied."""
+    # Other units are ignored (RFC 9110 14.2), several ranges get the whole file.
+    if request.range is None or request.range.units != 'bytes' or len(request.range.ranges) != 1:
+        return None
+    if_range = request.if_range
+    if if_range.etag is not None and if_range.etag != etag:
+        return None
+    # If-Range dates must match exactly (RFC 9110 13.1.5); anything else
+    # gets the full representation.
+    if if_range.date is not None and if_range.date != last_modified:
+        return None
+    byte_range = request.range.range_for_length(size)
+    return byte_range if byte_range is not None else False
+
+
+def _chunks(buffer, start, stop):
+    """Yield buffer[start:stop] as bytes objects, as WSGI requires."""
+    for offset in range(start, stop, CHUNK_SIZE):
+        yield bytes(buffer[offset:min(offset + CHUNK_SIZE, stop)])
+
+
 @resume_bp.route('/', methods=['GET'])
 def get_resume():
     """Download resume PDF
     ---
     tags:
       - Resume
-
+    parameters:
+      - in: query
+        name: inline
+        required: false
+        schema:
+          type: integer
+        description: Set to 1 to display the PDF in the browser instead of downloading it
     responses:
       200:
         description: Resume PDF file
@@ -19,10 +96,49 @@ def get_resume():
             schema:
               type: string
               format: binary
+      206:
+        description: Requested byte range of the resume PDF
+      304:
+        description: Resume not modified
       404:
         description: Resume not found
+      416:
+        description: Requested range not satisfiable
     """
     resume_path = current_app.config.get("RESUME_PATH", "./resume.pdf")
-    if not os.path.exists(resume_path):
+    try:
+        state = resume_file.get(resume_path)
+    except FileNotFoundError:
         abort(404, description="Resume not found")
-    return send_file(resume_path, as_attachment=True, download_name="Aman_Kayare_Resume.pdf")
+    size, etag, last_modified = state['size'], state['etag'], state['last_modified']
+
+    disposition = 'inline' if request.args.get('inline') == '1' else 'attachment'
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'Content-Disposition': f'{disposition}; filename="{DOWNLOAD_NAME}"',
+        'Cache-Control': 'public, no-cache',
+    }
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = (request.if_modified_since is not None
+                        and last_modified <= request.if_modified_since)
+    if not_modified:
+        response = Response(status=304, headers=headers)
+    else:
+        byte_range = _satisfiable_range(size, etag, last_modified)
+        if byte_range is False:
+            headers['Content-Range'] = f'bytes */{size}'
+            response = Response(status=416, headers=headers)
+        else:
+            start, stop = byte_range or (0, size)
+            response = Response(_chunks(state['buffer'], start, stop), mimetype='application/pdf',
+                                headers=headers, direct_passthrough=True)
+            response.content_length = stop - start
+            if byte_range:
+                response.status_code = 206
+                response.headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
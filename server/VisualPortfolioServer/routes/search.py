@@ -0,0 +1,60 @@
+from flask import Blueprint, request, jsonify
+
+from utils.cache import cached_response
+from utils.search import KINDS, is_search_ready, search
+
+search_bp = Blueprint('search', __name__)
+
+MAX_RESULTS = 50
+
+
+@search_bp.route('/', methods=['GET'])
+@cached_response('blogs', 'tags', 'projects', 'certifications')
+def search_content():
+    """Full-text search over blogs, projects and certifications
+    ---
+    tags:
+      - Search
+    parameters:
+      - in: query
+        name: q
+        required: true
+        schema:
+          type: string
+        description: Search text
+      - in: query
+        name: type
+        required: false
+        schema:
+          type: string
+        description: Comma-separated result types to include (blog, project, certification)
+      - in: query
+        name: limit
+        required: false
+        schema:
+          type: integer
+        description: Maximum number of results (default 20, max 50)
+    responses:
+      200:
+        description: Ranked results; title and snippet are escaped HTML with matches in <mark>
+      400:
+        description: Missing query or invalid parameters
+      503:
+        description: Search index unavailable
+    """
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    kinds = [k.strip() for k in request.args.get('type', '').split(',') if k.strip()]
+    unknown = [k for k in kinds if k not in KINDS]
+    if unknown:
+        return jsonify({"error": f"Unknown types: {', '.join(unknown)}"}), 400
+    try:
+        limit = min(int(request.args.get('limit', 20)), MAX_RESULTS)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not is_search_ready():
+        return jsonify({"error": "Search is not available"}), 503
+
+    results = search(q, kinds=kinds, limit=max(limit, 1))
+    return jsonify({'query': q, 'results': results}), 200
@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify, current_app
 from flasgger import swag_from
-from models import db, TechnicalSkill
+from models import db, TechnicalSkill, technical_skill_fields
 from schemas import TechnicalSkillSchema
-from utils.jwt_auth import jwt_required, get_current_user_admin_status
+from utils.jwt_auth import jwt_required, admin_required, get_current_user_admin_status
+from utils.cache import cached_response
+from utils.bulk import apply_bulk
 from marshmallow import ValidationError
 
 technical_skills_bp = Blueprint('technical_skills', __name__)
@@ -14,6 +16,13 @@ technical_skills_schema = TechnicalSkillSchema(many=True)
     'tags': ['Technical Skills'],
     'summary': 'Get all technical skills',
     'description': 'Retrieve all technical skill categories with their skills arrays',
+    'parameters': [{
+        'in': 'query',
+        'name': 'fields',
+        'type': 'string',
+        'required': False,
+        'description': 'Comma-separated keys to return (default all); other columns are not read'
+    }],
     'responses': {
         200: {
             'description': 'List of technical skills retrieved successfully',
@@ -38,8 +47,13 @@ technical_skills_schema = TechnicalSkillSchema(many=True)
         }
     }
 })
+@cached_response('technical_skills')
 def get_technical_skills():
     """Get all technical skills ordered by order field"""
+    try:
+        fields = technical_skill_fields.requested(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'details': str(e)}), 400
     try:
         # VISIBILITY TOGGLE FIX: Check admin parameter explicitly
         is_admin_request = request.args.get('admin', '').lower() == 'true'
@@ -47,12 +61,13 @@ def get_technical_skills():
         # Query based on admin status
         if is_admin_request:
             # Admin management view: show ALL skills including hidden
-            skills = TechnicalSkill.query.order_by(TechnicalSkill.order).all()
+            query = db.select(*fields.columns)
         else:
             # Public portfolio view: show only visible skills
-            skills = TechnicalSkill.query.filter_by(is_visible=True).order_by(TechnicalSkill.order).all()
-        
-        return jsonify([skill.to_dict() for skill in skills]), 200
+            query = db.select(*fields.columns).where(TechnicalSkill.is_visible.is_(True))
+        rows = db.session.execute(query.order_by(TechnicalSkill.order))
+
+        return jsonify(fields.rows(rows)), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching technical skills: {str(e)}")
         return jsonify({'error': 'Failed to fetch technical skills'}), 500
@@ -229,4 +244,35 @@ def delete_technical_skill(skill_id):
         return jsonify({'error': 'Failed to delete technical skill'}), 500
 
 
-
+@technical_skills_bp.route('/api/technical-skills/bulk', methods=['POST'])
+@admin_required
+@swag_from({
+    'tags': ['Technical Skills'],
+    'summary': 'Bulk create, update and delete technical skill categories',
+    'description': 'Apply an array of operations ({"op": "create"|"update"|"delete", "id", "data"}) in a single transaction (Admin only). A reorder is a list of updates to `order`.',
+    'parameters': [{
+        'in': 'body',
+        'name': 'operations',
+        'required': True,
+        'schema': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'op': {'type': 'string', 'enum': ['create', 'update', 'delete']},
+                    'id': {'type': 'integer'},
+                    'data': {'type': 'object'}
+                }
+            }
+        }
+    }],
+    'responses': {
+        200: {'description': 'All operations applied'},
+        400: {'description': 'Nothing applied; per-operation errors by index'},
+        401: {'description': 'Unauthorized'}
+    }
+})
+def bulk_technical_skills():
+    """Apply a batch of technical skill operations in one transaction"""
+    body, status = apply_bulk(TechnicalSkill, request.get_json(silent=True), technical_skill_schema)
+    return jsonify(body), status
@@ -42,8 +42,10 @@ class BlogSchema(Schema):
     excerpt = fields.Str(validate=validate.Length(max=500))
     content = fields.Str(required=True)
     cover_image = fields.Str(validate=validate.Length(max=300))
+    date = fields.DateTime()
     reading_time = fields.Int()
     featured = fields.Bool()
+    is_visible = fields.Bool()
     author_id = fields.Int()
     tag_ids = fields.List(fields.Int())
 
@@ -0,0 +1,233 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import delete, insert, or_, select, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from models import db
+from utils.search import is_search_ready, rebuild_search_index
+from utils.serialization import dumps, loads
+
+FORMAT = 'visual-portfolio'
+VERSION = 1
+
+# Exported tables in dependency order: a table only references tables
+# listed before it, so an import can insert them in file order.
+TABLES = ('users', 'authors', 'tags', 'about', 'projects', 'blogs', 'blog_tags',
+          'certifications', 'experiences', 'technical_skills', 'contact_messages')
+
+# Password hashes never leave the server. Imported users that do not exist
+# yet get this value, which matches no password, until one is set.
+EXCLUDED_COLUMNS = {'users': ('password_hash',)}
+UNUSABLE_PASSWORD = '!'
+
+# Rows fetched per server-side cursor batch on export, and rows per
+# executemany INSERT on import.
+BATCH_SIZE = 1000
+
+
+def _table(name):
+    return db.metadata.tables[name]
+
+
+def _target(name):
+    """The mapped class for `name` (so ORM statement hooks see the write), else the table."""
+    for mapper in db.Model.registry.mappers:
+        if mapper.local_table.name == name:
+            return mapper.class_
+    return _table(name)
+
+
+def _columns(name):
+    excluded = EXCLUDED_COLUMNS.get(name, ())
+    return [c for c in _table(name).columns if c.name not in excluded]
+
+
+# --- Export ---
+
+def export_lines():
+    """Yield the whole database as NDJSON, one chunk of lines per batch.
+
+    The first line describes the export, each following line is
+    {"table": ..., "row": {...}}, and the last one carries the row count
+    of every table, so a truncated file is recognised on import. Rows are
+    read through server-side cursors (`yield_per`) and encoded batch by
+    batch, so memory use does not grow with the size of the tables.
+    """
+    yield dumps({'format': FORMAT, 'version': VERSION, 'tables': list(TABLES),
+                 'exported_at': datetime.now(timezone.utc).isoformat()}) + b'\n'
+    counts = {}
+    for name in TABLES:
+        columns = _columns(name)
+        keys = [c.name for c in columns]
+        prefix = b'{"table":' + dumps(name) + b',"row":'
+        result = db.session.execute(select(*columns).order_by(*_table(name).primary_key.columns)
+                                    .execution_options(yield_per=BATCH_SIZE))
+        count = 0
+        for rows in result.partitions():
+            count += len(rows)
+            yield b''.join(prefix + dumps(dict(zip(keys, row))) + b'}\n' for row in rows)
+        counts[name] = count
+    yield dumps({'end': True, 'counts': counts}) + b'\n'
+
+
+# --- Import ---
+
+class InvalidImport(Exception):
+    """The import stream is malformed; nothing from it is committed."""
+
+
+def _converters(name):
+    """Per-column functions turning exported JSON values back into Python values."""
+    converters = {}
+    for column in _columns(name):
+        if isinstance(column.type, db.DateTime):
+            converters[column.name] = datetime.fromisoformat
+        elif isinstance(column.type, db.Date):
+            converters[column.name] = date.fromisoformat
+    return converters
+
+
+def _parse_row(name, row, converters, allowed):
+    if not isinstance(row, dict):
+        raise ValueError('row must be an object')
+    unknown = [k for k in row if k not in allowed]
+    if unknown:
+        raise ValueError(f"unknown columns for {name}: {', '.join(unknown)}")
+    for key, convert in converters.items():
+        value = row.get(key)
+        if isinstance(value, str):
+            row[key] = convert(value)
+    return row
+
+
+def _insert_users(rows):
+    """Insert the users that do not exist yet; returns how many were skipped."""
+    User = _target('users')
+    ids = [r['id'] for r in rows if r.get('id') is not None]
+    usernames = [r['username'] for r in rows if r.get('username')]
+    emails = [r['email'] for r in rows if r.get('email')]
+    existing = db.session.execute(select(User.id, User.username, User.email).where(
+        or_(User.id.in_(ids), User.username.in_(usernames), User.email.in_(emails)))).all()
+    taken = {('id', u.id) for u in existing} | {('username', u.username) for u in existing} \
+        | {('email', u.email) for u in existing}
+    new = [dict(r, password_hash=UNUSABLE_PASSWORD) for r in rows
+           if not {('id', r.get('id')), ('username', r.get('username')), ('email', r.get('email'))} & taken]
+    if new:
+        db.session.execute(insert(User), new)
+    return len(rows) - len(new)
+
+
+def _reset_sequences(names):
+    """Move PostgreSQL id sequences past the imported ids."""
+    conn = db.session.connection()
+    if conn.dialect.name != 'postgresql':
+        return
+    for name in names:
+        if 'id' in _table(name).columns:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+                f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {name}"))
+
+
+def _read_import(lines):
+    """Replace the exported tables with the rows from `lines`; see import_lines."""
+    stats = {'imported': {}, 'skipped_users': 0}
+    header, end, tables = None, None, ()
+    batch, current, converters, allowed = [], None, {}, set()
+
+    def flush():
+        if not batch:
+            return
+        if current == 'users':
+            stats['skipped_users'] += _insert_users(batch)
+        else:
+            db.session.execute(insert(_target(current)), batch)
+        stats['imported'][current] = stats['imported'].get(current, 0) + len(batch)
+        batch.clear()
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            if end is not None:
+                raise ValueError('content after the end line')
+            try:
+                record = loads(line)
+            except ValueError:
+                raise ValueError('not valid JSON')
+            if not isinstance(record, dict):
+                raise ValueError('expected an object')
+            if header is None:
+                if record.get('format') != FORMAT or record.get('version') != VERSION:
+                    raise ValueError(f'not a {FORMAT} export (version {VERSION})')
+                tables = record.get('tables')
+                if not isinstance(tables, list) or not all(n in TABLES for n in tables):
+                    raise ValueError(f"tables must be a list drawn from {', '.join(TABLES)}")
+                header = record
+                # Content tables are replaced, children before parents;
+                # users are merged since their password hashes are not exported.
+                for name in reversed(TABLES):
+                    if name in tables and name != 'users':
+                        db.session.execute(delete(_target(name)))
+                continue
+            if record.get('end'):
+                flush()
+                end = record
+                continue
+            name = record.get('table')
+            if name not in tables:
+                raise ValueError(f'table {name!r} is not listed in the header')
+            if name != current:
+                flush()
+                if name in stats['imported']:
+                    raise ValueError(f'rows of {name} must be contiguous')
+                current, converters = name, _converters(name)
+                allowed = {c.name for c in _columns(name)}
+                stats['imported'][name] = 0
+            batch.append(_parse_row(name, record.get('row'), converters, allowed))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        except ValueError as e:
+            raise InvalidImport(f'line {number}: {e}') from None
+
+    if header is None:
+        raise InvalidImport('empty import')
+    if end is None:
+        raise InvalidImport('the export is truncated (no end line)')
+    expected = end.get('counts') or {}
+    mismatched = [n for n in tables if expected.get(n, 0) != stats['imported'].get(n, 0)]
+    if mismatched:
+        raise InvalidImport(f"row counts do not match the end line for: {', '.join(mismatched)}")
+    _reset_sequences(tables)
+    return stats
+
+
+def import_lines(lines):
+    """Restore an `export_lines` stream in one transaction.
+
+    `lines` is any iterable of NDJSON lines, e.g. the request body stream,
+    and is consumed as it is read: rows are inserted in executemany batches
+    of BATCH_SIZE, with their original ids. Every table named in the
+    header is emptied first and refilled from the file; users are merged
+    instead, adding only those whose id, username and email are all free.
+    Nothing is committed unless the whole file, including its end line
+    and row counts, checks out.
+
+    Returns a (body, status) pair for jsonify.
+    """
+    try:
+        stats = _read_import(lines)
+        db.session.commit()
+    except InvalidImport as e:
+        db.session.rollback()
+        return {'error': 'Invalid import', 'details': str(e)}, 400
+    except IntegrityError:
+        db.session.rollback()
+        return {'error': 'Database constraint violation'}, 400
+    except SQLAlchemyError:
+        db.session.rollback()
+        return {'error': 'Import failed'}, 500
+    # The bulk statements bypass the per-row search hooks.
+    if is_search_ready():
+        rebuild_search_index()
+    return stats, 200
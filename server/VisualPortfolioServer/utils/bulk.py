@@ -0,0 +1,110 @@
+from marshmallow import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from models import db
+from utils.security import sanitize_input
+from utils.search import refresh_documents
+
+MAX_OPERATIONS = 500
+OPERATIONS = ('create', 'update', 'delete')
+
+
+def _validate(item, schema, sanitize):
+    """Return (op, id, values) for one operation or raise ValueError/ValidationError."""
+    if not isinstance(item, dict):
+        raise ValueError('Operation must be an object')
+    op = item.get('op')
+    if op not in OPERATIONS:
+        raise ValueError(f"op must be one of {', '.join(OPERATIONS)}")
+    item_id = item.get('id')
+    if op == 'create':
+        item_id = None
+    elif not isinstance(item_id, int) or isinstance(item_id, bool):
+        raise ValueError('id must be an integer')
+    if op == 'delete':
+        return op, item_id, None
+    data = item.get('data')
+    if not isinstance(data, dict):
+        raise ValueError('data must be an object')
+    values = schema.load(data, partial=(op == 'update'))
+    if sanitize:
+        values = {k: sanitize_input(v) if isinstance(v, str) else v for k, v in values.items()}
+    return op, item_id, values
+
+
+def apply_bulk(model, operations, schema, sanitize=False):
+    """Apply a batch of create/update/delete operations in one transaction.
+
+    Operations look like {"op": "create", "data": {...}},
+    {"op": "update", "id": 3, "data": {...}} or {"op": "delete", "id": 3};
+    a drag-and-drop reorder is simply a list of updates to `order`. Every
+    item is validated with `schema` (partially for updates) and checked for
+    existence first; if any item fails, nothing is written and the errors
+    are reported by index. Otherwise creates run as one multi-row INSERT,
+    updates as one executemany UPDATE by primary key, deletes go through the
+    ORM so relationship cascades apply, and the whole batch commits once.
+
+    Returns a (body, status) pair for jsonify.
+    """
+    if not isinstance(operations, list) or not operations:
+        return {'error': 'Expected a non-empty array of operations'}, 400
+    if len(operations) > MAX_OPERATIONS:
+        return {'error': f'At most {MAX_OPERATIONS} operations per request'}, 400
+
+    parsed, errors, seen_ids = [], [], set()
+    for index, item in enumerate(operations):
+        try:
+            op, item_id, values = _validate(item, schema, sanitize)
+        except ValidationError as e:
+            errors.append({'index': index, 'errors': e.messages})
+            continue
+        except ValueError as e:
+            errors.append({'index': index, 'errors': str(e)})
+            continue
+        if item_id is not None:
+            if item_id in seen_ids:
+                errors.append({'index': index, 'errors': f'id {item_id} appears in more than one operation'})
+                continue
+            seen_ids.add(item_id)
+        parsed.append((index, op, item_id, values))
+
+    if seen_ids:
+        existing = set(db.session.scalars(select(model.id).where(model.id.in_(seen_ids))))
+        errors.extend({'index': index, 'errors': f'{model.__name__} {item_id} not found'}
+                      for index, op, item_id, _ in parsed
+                      if item_id is not None and item_id not in existing)
+    if errors:
+        return {'error': 'Validation error', 'details': sorted(errors, key=lambda e: e['index'])}, 400
+
+    creates = [p for p in parsed if p[1] == 'create']
+    updates = [p for p in parsed if p[1] == 'update' and p[3]]
+    delete_ids = [p[2] for p in parsed if p[1] == 'delete']
+    try:
+        created_ids = []
+        if creates:
+            created_ids = db.session.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [values for _, _, _, values in creates]).all()
+        if updates:
+            db.session.execute(update(model), [{'id': item_id, **values}
+                                               for _, _, item_id, values in updates])
+        if delete_ids:
+            for obj in db.session.scalars(select(model).where(model.id.in_(delete_ids))):
+                db.session.delete(obj)
+            db.session.flush()
+        # Bulk INSERT/UPDATE statements bypass the flush hooks that keep
+        # the search index in sync, so refresh those rows explicitly.
+        refresh_documents(model, list(created_ids) + [item_id for _, _, item_id, _ in updates])
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return {'error': 'Database constraint violation'}, 400
+    except SQLAlchemyError:
+        db.session.rollback()
+        return {'error': 'Bulk operation failed'}, 500
+
+    new_ids = iter(created_ids)
+    results = [{'index': index, 'op': op, 'id': next(new_ids) if op == 'create' else item_id}
+               for index, op, item_id, _ in parsed]
+    return {'results': results}, 200
@@ -0,0 +1,365 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request, current_app, Response
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = 'cache_pending_tables'
+_PENDING_NAMES_KEY = 'cache_pending_name_models'
+
+
+def _next_modified(previous, now):
+    """Last-Modified (whole seconds) for a write at `now`.
+
+    HTTP dates have one-second resolution, so a write in the same second as
+    the previous one moves the value a second past it; otherwise a client
+    holding the first value would get a 304 for the second write.
+    """
+    now = int(now)
+    return now if previous is None or now > previous else previous + 1
+
+
+class MemoryVersions:
+    """Per-table version counters in a dict; invalidation reaches this process only."""
+
+    def __init__(self):
+        self._versions = {}
+        self._modified = {}
+        self._lock = threading.Lock()
+        self.started_at = int(time.time())
+
+    def get(self, tables):
+        """Return (version tuple, last write time in epoch seconds) for `tables`."""
+        with self._lock:
+            versions = tuple(self._versions.get(t, 0) for t in tables)
+            modified = max((self._modified.get(t, self.started_at) for t in tables),
+                           default=self.started_at)
+        return versions, modified
+
+    def bump(self, tables, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                self._modified[table] = _next_modified(self._modified.get(table), now)
+
+
+class SQLiteVersions:
+    """Per-table version counters in a SQLite file shared by every worker process.
+
+    A commit in one worker invalidates the cached responses of all of them:
+    each cached request reads the counters of its tables (one indexed
+    SELECT) before it looks at its local cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_versions ('
+                     'name TEXT PRIMARY KEY, version INTEGER NOT NULL, modified INTEGER NOT NULL)')
+        # The empty name holds the store's creation time, the Last-Modified
+        # of tables not written since, so every worker reports the same one.
+        conn.execute("INSERT OR IGNORE INTO cache_versions VALUES ('', 0, ?)", (int(time.time()),))
+        self.started_at = conn.execute(
+            "SELECT modified FROM cache_versions WHERE name = ''").fetchone()[0]
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, tables):
+        """Return (version tuple, last write time in epoch seconds) for `tables`."""
+        if not tables:
+            return (), self.started_at
+        rows = dict((name, (version, modified)) for name, version, modified in self._connect().execute(
+            f"SELECT name, version, modified FROM cache_versions WHERE name IN ({','.join('?' * len(tables))})",
+            tables))
+        versions = tuple(rows[t][0] if t in rows else 0 for t in tables)
+        modified = max(rows[t][1] if t in rows else self.started_at for t in tables)
+        return versions, modified
+
+    def bump(self, tables, now=None):
+        now = int(time.time() if now is None else now)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO cache_versions (name, version, modified) VALUES (?, 1, ?) '
+                'ON CONFLICT(name) DO UPDATE SET version = version + 1, '
+                'modified = MAX(excluded.modified, modified + 1)',
+                [(table, now) for table in tables])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def get_versions(*tables):
+    """Return (version tuple, Last-Modified datetime) for the given tables."""
+    versions, modified = response_cache.versions.get(tables)
+    return versions, datetime.fromtimestamp(modified, timezone.utc)
+
+
+def get_version(table):
+    """Return the current version counter for a table."""
+    return get_versions(table)[0][0]
+
+
+def get_last_modified(*tables):
+    """Return the most recent write time across the given tables."""
+    return get_versions(*tables)[1]
+
+
+def bump_version(*tables):
+    """Invalidate cached responses built from the given tables."""
+    response_cache.versions.bump(tables)
+
+
+class ResponseCache:
+    """Bounded LRU of serialized response bodies keyed by endpoint and args.
+
+    Entries are validated against per-table version counters, bumped by
+    every committed write. The counters live in the store chosen by
+    RESPONSE_CACHE_STORAGE: 'memory' for a single process, or
+    'sqlite:///path/to/file.db' so that a write in one worker process
+    invalidates the entries of all of them.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.versions = MemoryVersions()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config['RESPONSE_CACHE_MAX_ENTRIES']
+        storage = app.config['RESPONSE_CACHE_STORAGE']
+        if storage.startswith('sqlite:///'):
+            self.versions = SQLiteVersions(os.path.abspath(storage[len('sqlite:///'):]))
+        elif storage == 'memory':
+            self.versions = MemoryVersions()
+        else:
+            raise ValueError(f"Unsupported RESPONSE_CACHE_STORAGE: {storage}")
+        self.clear()
+
+    def get(self, key, versions, max_age=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['versions'] != versions or (
+                    max_age is not None and time.monotonic() - entry['stored_at'] > max_age):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, versions, body, status, mimetype):
+        entry = {
+            'versions': versions,
+            'body': body,
+            'status': status,
+            'mimetype': mimetype,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'stored_at': time.monotonic(),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+class NameCache:
+    """Hot name -> id map for a lookup model (tags, authors).
+
+    Adding rows never invalidates a mapping, so the map is only dropped when
+    a row of `model` is deleted or renamed (tracked by the session hooks
+    below and applied on commit). Lookups that raced with such a commit are
+    discarded by comparing generations, so only committed ids are cached.
+    """
+
+    def __init__(self, model, max_entries=4096):
+        self.model = model
+        self.max_entries = max_entries
+        self.generation = 0
+        self._ids = {}
+        self._lock = threading.Lock()
+        _name_caches.append(self)
+
+    def get_many(self, names):
+        """Return {name: id} for the requested names that are cached."""
+        with self._lock:
+            return {name: self._ids[name] for name in names if name in self._ids}
+
+    def update(self, mapping, generation):
+        """Store ids looked up while the cache was at `generation`."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            if len(self._ids) + len(mapping) > self.max_entries:
+                self._ids = {}
+            self._ids.update(mapping)
+
+    def invalidate(self):
+        with self._lock:
+            self._ids = {}
+            self.generation += 1
+
+
+_name_caches = []
+
+
+def _cache_key():
+    args = tuple(sorted(request.args.items(multi=True)))
+    view_args = tuple(sorted((request.view_args or {}).items()))
+    return (request.endpoint, view_args, args)
+
+
+def _add_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    if request.headers.get('Authorization'):
+        response.headers['Cache-Control'] = 'private, no-cache'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _not_modified(etag, last_modified):
+    return _add_validators(Response(status=304), etag, last_modified)
+
+
+def _is_fresh(etag, last_modified):
+    """Evaluate If-None-Match / If-Modified-Since against the validators."""
+    if request.if_none_match:
+        return etag is not None and request.if_none_match.contains(etag)
+    since = request.if_modified_since
+    return since is not None and last_modified <= since
+
+
+def _build_response(entry, last_modified):
+    response = Response(entry['body'], status=entry['status'], mimetype=entry['mimetype'])
+    return _add_validators(response, entry['etag'], last_modified)
+
+
+def cached_response(*tables, max_age=None):
+    """Cache a GET view's serialized body until one of `tables` changes.
+
+    Responses carry a content-hash ETag and a Last-Modified taken from the
+    tables' last write. Conditional requests are answered with 304 from the
+    cached entry (or the table timestamps) before the view runs any query.
+    Only 200 responses are stored; anything else passes through untouched.
+    With `max_age` (seconds) entries also expire after that long, for views
+    whose output depends on the clock as well as on the tables.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = _cache_key()
+            versions, last_modified = get_versions(*tables)
+            use_cache = current_app.config.get('RESPONSE_CACHE_ENABLED', True)
+
+            entry = response_cache.get(key, versions, max_age) if use_cache else None
+            if entry is not None:
+                if _is_fresh(entry['etag'], last_modified):
+                    return _not_modified(entry['etag'], last_modified)
+                return _build_response(entry, last_modified)
+            if max_age is None and not request.if_none_match and _is_fresh(None, last_modified):
+                return _not_modified(None, last_modified)
+
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            body = response.get_data()
+            if use_cache:
+                entry = response_cache.set(key, versions, body,
+                                           response.status_code, response.mimetype)
+            else:
+                entry = {'body': body, 'status': response.status_code,
+                         'mimetype': response.mimetype,
+                         'etag': hashlib.sha1(body).hexdigest()}
+            if _is_fresh(entry['etag'], last_modified):
+                return _not_modified(entry['etag'], last_modified)
+            return _build_response(entry, last_modified)
+        return decorated_function
+    return decorator
+
+
+# --- Invalidation hooks ---
+# Writes are tracked on the session as they are flushed (ORM units of work)
+# or executed (bulk UPDATE/DELETE statements), and the versions are only
+# bumped once the transaction actually commits.
+
+def _pending(session):
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _pending_names(session):
+    return session.info.setdefault(_PENDING_NAMES_KEY, set())
+
+
+def _name_cache_for(model):
+    return next((c for c in _name_caches if c.model is model), None)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_tables(session, flush_context):
+    pending = _pending(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table:
+            pending.add(table)
+    for obj in list(session.dirty) + list(session.deleted):
+        cache = _name_cache_for(type(obj))
+        if cache is not None and (obj in session.deleted
+                                  or inspect(obj).attrs.name.history.has_changes()):
+            _pending_names(session).add(cache)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_statements(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _pending(orm_execute_state.session).add(mapper.local_table.name)
+            cache = _name_cache_for(mapper.class_)
+            if cache is not None and not orm_execute_state.is_insert:
+                _pending_names(orm_execute_state.session).add(cache)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_tables(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        bump_version(*pending)
+    for cache in session.info.pop(_PENDING_NAMES_KEY, ()):
+        cache.invalidate()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_tables(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_PENDING_NAMES_KEY, None)
@@ -0,0 +1,245 @@
+import threading
+import zlib
+from collections import OrderedDict
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # optional: br is simply not offered without it
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is simply not offered without it
+    zstandard = None
+
+# Slice size for feeding large bodies to a streaming compressor.
+CHUNK_SIZE = 64 * 1024
+
+
+def _gzip(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def _brotli(level):
+    compressor = brotli.Compressor(quality=level)
+    return compressor.process, compressor.finish
+
+
+def _zstd(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return compressor.compress, compressor.flush
+
+
+# Content-Encoding -> factory(level) returning (compress(chunk), finish()).
+ENCODERS = {'gzip': _gzip}
+if brotli is not None:
+    ENCODERS['br'] = _brotli
+if zstandard is not None:
+    ENCODERS['zstd'] = _zstd
+
+# A compressed variant's ETag is the original one with ";<encoding>" added
+# inside the quotes, so it never matches the identity response's ETag.
+# Incoming If-None-Match values carrying the suffix of the encoding chosen
+# for this request are mapped back before the app sees them; suffixes of
+# other encodings are left alone, so they match nothing.
+def _add_etag_suffix(etag, encoding):
+    return f'{etag[:-1]};{encoding}"' if etag.endswith('"') else etag
+
+
+def _strip_etag_suffix(if_none_match, encoding):
+    return if_none_match.replace(f';{encoding}"', '"')
+
+
+def _request_target(environ):
+    path = environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', '')
+    query = environ.get('QUERY_STRING')
+    return f'{path}?{query}' if query else path
+
+
+class VariantCache:
+    """Bounded LRU of compressed bodies keyed by (request target, ETag, encoding)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """WSGI middleware compressing responses per the client's Accept-Encoding.
+
+    Only 2xx responses (not 204/206) whose Content-Type is in
+    COMPRESSION_MIMETYPES, that are not already encoded and do not say
+    `Cache-Control: no-transform`, are touched, and only from
+    COMPRESSION_MIN_SIZE bytes up. The encoding is the first of
+    COMPRESSION_ENCODINGS that the client accepts and that is installed,
+    at the level given in COMPRESSION_LEVELS.
+
+    Responses with a known length up to COMPRESSION_STREAM_MIN_SIZE are
+    compressed whole; if they carry a strong ETag the compressed body is
+    cached under it and the request target (ETags only identify versions of
+    one resource; different files can share an mtime-size ETag), so repeat
+    requests for an unchanged resource skip the compressor. Larger responses, and streamed ones without a
+    Content-Length, are compressed chunk by chunk as the app yields them
+    and never held in memory as a whole.
+    """
+
+    def __init__(self, app, config):
+        self.app = app
+        self.min_size = config['COMPRESSION_MIN_SIZE']
+        self.stream_min_size = config['COMPRESSION_STREAM_MIN_SIZE']
+        self.mimetypes = frozenset(config['COMPRESSION_MIMETYPES'])
+        self.levels = config['COMPRESSION_LEVELS']
+        self.encodings = [e for e in config['COMPRESSION_ENCODINGS'] if e in ENCODERS]
+        self.cache = VariantCache(config['COMPRESSION_CACHE_ENTRIES'])
+
+    def _negotiate(self, environ):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        accept = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING'))
+        for encoding in self.encodings:
+            if accept.quality(encoding) > 0:
+                return encoding
+        return None
+
+    def _compressible_type(self, headers):
+        mimetype = headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        return mimetype in self.mimetypes
+
+    def __call__(self, environ, start_response):
+        encoding = self._negotiate(environ)
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and encoding:
+            environ['HTTP_IF_NONE_MATCH'] = _strip_etag_suffix(if_none_match, encoding)
+
+        state = {}
+        written = []
+
+        def capture(status, headers, exc_info=None):
+            state['status'], state['headers'], state['exc_info'] = status, headers, exc_info
+            return written.append
+
+        app_iter = self.app(environ, capture)
+        iterator, pending = iter(app_iter), []
+        try:
+            while 'status' not in state:
+                pending.append(next(iterator))
+        except StopIteration:
+            pass
+        except BaseException:
+            _close(app_iter)
+            raise
+
+        status, exc_info = state['status'], state['exc_info']
+        headers = Headers(state['headers'])
+        code = int(status.split(' ', 1)[0])
+        compressible = (200 <= code < 300 and code not in (204, 206)
+                        and self._compressible_type(headers)
+                        and 'Content-Encoding' not in headers
+                        and 'no-transform' not in headers.get('Cache-Control', ''))
+        if compressible or (code == 304 and encoding):
+            _add_vary(headers)
+        if code == 304 and encoding and if_none_match and f';{encoding}"' in if_none_match \
+                and 'ETag' in headers:
+            headers['ETag'] = _add_etag_suffix(headers['ETag'], encoding)
+
+        length = headers.get('Content-Length', type=int)
+        if not compressible or encoding is None or (length is not None and length < self.min_size):
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            if not written and not pending:
+                return app_iter
+            return _chain(app_iter, written + pending, iterator)
+
+        if length is not None and length <= self.stream_min_size:
+            try:
+                body = b''.join(written + pending) + b''.join(iterator)
+            finally:
+                _close(app_iter)
+            compressed = self._compress_whole(body, encoding, headers.get('ETag'),
+                                              _request_target(environ))
+            if len(compressed) >= len(body):
+                start_response(status, headers.to_wsgi_list(), exc_info)
+                return [body]
+            self._set_encoded_headers(headers, encoding)
+            headers['Content-Length'] = str(len(compressed))
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return [compressed]
+
+        self._set_encoded_headers(headers, encoding)
+        headers.remove('Content-Length')
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return self._stream(app_iter, written + pending, iterator, encoding)
+
+    def _set_encoded_headers(self, headers, encoding):
+        headers['Content-Encoding'] = encoding
+        headers.remove('Accept-Ranges')
+        if 'ETag' in headers:
+            headers['ETag'] = _add_etag_suffix(headers['ETag'], encoding)
+
+    def _compress_whole(self, body, encoding, etag, target):
+        key = (target, etag, encoding) if etag and not etag.startswith('W/') else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        compress, finish = ENCODERS[encoding](self.levels[encoding])
+        compressed = compress(body) + finish()
+        if key is not None:
+            self.cache.set(key, compressed)
+        return compressed
+
+    def _stream(self, app_iter, first_chunks, iterator, encoding):
+        compress, finish = ENCODERS[encoding](self.levels[encoding])
+        try:
+            for chunk in _iter_chain(first_chunks, iterator):
+                for start in range(0, len(chunk), CHUNK_SIZE):
+                    out = compress(chunk[start:start + CHUNK_SIZE])
+                    if out:
+                        yield out
+            out = finish()
+            if out:
+                yield out
+        finally:
+            _close(app_iter)
+
+
+def _add_vary(headers):
+    vary = headers.get('Vary', '')
+    if 'accept-encoding' not in vary.lower():
+        headers['Vary'] = f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'
+
+
+def _iter_chain(first_chunks, iterator):
+    yield from first_chunks
+    yield from iterator
+
+
+def _chain(app_iter, first_chunks, iterator):
+    try:
+        yield from _iter_chain(first_chunks, iterator)
+    finally:
+        _close(app_iter)
+
+
+def _close(app_iter):
+    close = getattr(app_iter, 'close', None)
+    if close is not None:
+        close()
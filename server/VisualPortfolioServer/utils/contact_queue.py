@@ -0,0 +1,127 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+from models import ContactMessage, db
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ContactQueue:
+    """Bounded in-process queue of contact messages, written in batches.
+
+    Submissions are validated by the request handler and put on the queue;
+    a single background writer drains it, committing up to `batch_size`
+    rows per transaction or whatever arrived within `flush_interval`
+    seconds, so a burst costs one commit per batch instead of one per
+    message. Before init_app() starts the writer, submit() writes inline.
+    """
+
+    def __init__(self, max_size=1000, batch_size=100, flush_interval=0.2):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread = None
+        self._app = None
+
+    def init_app(self, app):
+        self._app = app
+        self.batch_size = app.config['CONTACT_QUEUE_BATCH_SIZE']
+        self.flush_interval = app.config['CONTACT_QUEUE_FLUSH_INTERVAL']
+        self.max_size = app.config['CONTACT_QUEUE_MAX_SIZE']
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._thread = threading.Thread(target=self._run, name='contact-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, row):
+        """Queue one message (a dict of ContactMessage columns).
+
+        Returns False when the queue is full so the caller can shed load.
+        """
+        if self._thread is None:
+            self._write([row])
+            return True
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            return False
+        return True
+
+    def shutdown(self, timeout=5):
+        """Stop the writer after flushing everything already queued."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            with self._app.app_context():
+                self._write(batch)
+        # Drain whatever is left after the stop marker.
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            with self._app.app_context():
+                self._write(leftover)
+
+    def _write(self, rows):
+        try:
+            db.session.execute(insert(ContactMessage), rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Batch insert of %d contact messages failed (%s); retrying one by one",
+                         len(rows), _describe(e))
+            for position, row in enumerate(rows, 1):
+                try:
+                    db.session.execute(insert(ContactMessage), [row])
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error("Dropped contact message %d of %d in the batch (%s)",
+                                 position, len(rows), _describe(e))
+
+
+def _describe(error):
+    """The error without the statement parameters SQLAlchemy appends, which
+    hold the sender's personal data; for PostgreSQL that also drops the
+    DETAIL line, which can quote column values."""
+    error = getattr(error, 'orig', None) or error
+    lines = str(error).splitlines()
+    return f"{type(error).__name__}: {lines[0]}" if lines else type(error).__name__
+
+
+contact_queue = ContactQueue()
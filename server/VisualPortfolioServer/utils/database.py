@@ -0,0 +1,137 @@
+import logging
+
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+try:
+    import psycopg
+except ImportError:  # optional: psycopg2 works too, without prepared statements
+    psycopg = None
+
+logger = logging.getLogger(__name__)
+
+# Bind key of the query-only engine that serves GET requests (SQLite profile).
+READONLY_BIND = 'readonly'
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+def is_sqlite_file(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+class RoutingSession(Session):
+    """Session that sends reads made while serving GET requests to the
+    read-only engine, when one is configured.
+
+    Flushes always use the primary engine, so a GET handler that did write
+    would still reach the writable pool; none of them do.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and READONLY_BIND in self._db.engines
+                and has_request_context() and request.method in READ_METHODS):
+            return self._db.engines[READONLY_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _sqlite_pragmas(config, readonly=False):
+    pragmas = [
+        f"busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"synchronous = {config['SQLITE_SYNCHRONOUS']}",
+        f"cache_size = {int(config['SQLITE_CACHE_SIZE'])}",
+        f"mmap_size = {int(config['SQLITE_MMAP_SIZE'])}",
+    ]
+    if readonly:
+        pragmas.append("query_only = ON")
+    else:
+        # The journal mode is stored in the database file, so only the
+        # writable engine needs to set it.
+        pragmas.insert(0, f"journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+    return pragmas
+
+
+def _install_pragmas(engine, pragmas):
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
+
+def _set_engine_defaults(app, options):
+    engine_options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for key, value in options.items():
+        engine_options.setdefault(key, value)
+
+
+def _configure_sqlite(app, uri):
+    _set_engine_defaults(app, {
+        'pool_size': app.config['DB_POOL_SIZE'],
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+        # Connections are handed between request threads by the pool.
+        'connect_args': {'check_same_thread': False},
+    })
+    if app.config['SQLITE_READONLY_GETS']:
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(READONLY_BIND, {'url': uri, **app.config['SQLALCHEMY_ENGINE_OPTIONS']})
+
+
+def _configure_postgres(app, url):
+    connect_args = {}
+    if url.drivername == 'postgresql' and psycopg is not None:
+        # Prefer psycopg 3 when installed: psycopg2 cannot use server-side
+        # prepared statements.
+        url = url.set(drivername='postgresql+psycopg')
+        app.config['SQLALCHEMY_DATABASE_URI'] = url.render_as_string(hide_password=False)
+    if url.drivername == 'postgresql+psycopg':
+        # Statements executed this many times on a connection are prepared
+        # on the server and afterwards run without re-planning.
+        connect_args['prepare_threshold'] = app.config['DB_PREPARE_THRESHOLD']
+    else:
+        logger.info("Server-side prepared statements need the psycopg (3) driver; using %s",
+                    url.drivername)
+    _set_engine_defaults(app, {
+        'pool_size': app.config['DB_POOL_SIZE'],
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+        'pool_recycle': app.config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': app.config['DB_POOL_PRE_PING'],
+        'connect_args': connect_args,
+    })
+
+
+def configure_database(app):
+    """Apply the database profile to the app config before `db.init_app`.
+
+    SQLite (file-backed): sizes the connection pool for the threaded server
+    and, with SQLITE_READONLY_GETS, declares a second query-only engine on
+    the same file for GET requests. With WAL those readers never wait for
+    the writer.
+
+    PostgreSQL: pool size, overflow, timeout, recycle and pre-ping come from
+    the DB_POOL_* settings, and psycopg 3 connections prepare frequently
+    executed statements on the server (DB_PREPARE_THRESHOLD).
+
+    In-memory SQLite and other databases are left untouched.
+    """
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    url = make_url(uri)
+    if url.get_backend_name() == 'postgresql':
+        _configure_postgres(app, url)
+    elif is_sqlite_file(uri):
+        _configure_sqlite(app, uri)
+
+
+def install_sqlite_pragmas(app, db):
+    """Set the configured PRAGMAs on every new SQLite connection (call after `db.init_app`)."""
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            if engine.dialect.name == 'sqlite':
+                _install_pragmas(engine, _sqlite_pragmas(app.config, readonly=bind_key == READONLY_BIND))
@@ -0,0 +1,273 @@
+import threading
+import weakref
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from models import db, Project, project_is_public
+from utils.cache import get_version
+
+# Facets a project list can be filtered and counted by. `year` is the year
+# of the project's start date and is filtered as a range (from/to).
+FACETS = ('tech', 'category', 'type', 'year')
+
+_PENDING_KEY = 'facet_pending_projects'
+
+
+def _document(project):
+    """Facet values of one project (or project row), or None if it is not publicly listed."""
+    if project.is_visible is not True:  # as project_is_public
+        return None
+    return {
+        'tech': tuple(v for v in (project.tech or []) if isinstance(v, str) and v),
+        'category': tuple(v for v in (project.categories or []) if isinstance(v, str) and v),
+        'type': (project.project_type,) if project.project_type else (),
+        'year': (project.start_date.year,) if project.start_date else (),
+    }
+
+
+def _set_bits(bits):
+    """Positions of the set bits of `bits`, lowest first."""
+    positions = []
+    while bits:
+        low = bits & -bits
+        positions.append(low.bit_length() - 1)
+        bits ^= low
+    return positions
+
+
+def parse_filters(args):
+    """Facet filters from the query string: ?tech=React&category=ML&type=Client&from=2022.
+
+    Repeating a parameter matches any of its values; different parameters
+    must all match. Raises ValueError for a non-numeric year.
+    """
+    filters = {
+        'tech': args.getlist('tech'),
+        'category': args.getlist('category'),
+        'type': args.getlist('type'),
+    }
+    filters = {name: [v for v in values if v] for name, values in filters.items()}
+    years = {}
+    for bound in ('from', 'to'):
+        value = args.get(bound)
+        if value:
+            years[bound] = int(value)
+    if years:
+        filters['year'] = (years.get('from'), years.get('to'))
+    return filters
+
+
+class FacetIndex:
+    """In-memory inverted index over the visible projects.
+
+    Every facet value maps to the set of projects that have it, held as an
+    int bitset. Each indexed project owns one bit position (a dense ordinal,
+    reused after the project leaves the index), so bitsets grow with the
+    number of indexed projects rather than with the highest id. Intersections
+    and unions are then single big-int operations and a facet count is a
+    popcount, so filtering and counting stay well under a millisecond for
+    thousands of projects.
+
+    The index is built from the database on first use and then kept in
+    step with committed ORM writes to projects (see the session hooks
+    below): created, updated and deleted projects are re-indexed one by one.
+    Bulk INSERT/UPDATE statements cannot be tracked per row, so they mark
+    the index for a full rebuild instead.
+
+    Other worker processes write too. Every commit touching projects bumps
+    the shared `projects` table version (see RESPONSE_CACHE_STORAGE), so the
+    index records the version it was built at plus the commits it applied
+    itself, and is rebuilt when the current version differs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self._ready = False
+        self._version = None
+        self.generation = 0
+        self._reset()
+
+    def _reset(self):
+        self._postings = {facet: {} for facet in FACETS}
+        self._documents = {}
+        self._ordinals = {}  # project id -> bit position
+        self._ids = []  # bit position -> project id, None when free
+        self._free = []  # released bit positions, reused first
+        self._all = 0
+
+    # --- Maintenance ---
+
+    def _add(self, project_id, document):
+        ordinal = self._free.pop() if self._free else len(self._ids)
+        if ordinal == len(self._ids):
+            self._ids.append(project_id)
+        else:
+            self._ids[ordinal] = project_id
+        self._ordinals[project_id] = ordinal
+        bit = 1 << ordinal
+        self._documents[project_id] = document
+        self._all |= bit
+        for facet, values in document.items():
+            postings = self._postings[facet]
+            for value in values:
+                postings[value] = postings.get(value, 0) | bit
+
+    def _remove(self, project_id):
+        document = self._documents.pop(project_id, None)
+        if document is None:
+            return
+        ordinal = self._ordinals.pop(project_id)
+        self._ids[ordinal] = None
+        self._free.append(ordinal)
+        mask = ~(1 << ordinal)
+        self._all &= mask
+        for facet, values in document.items():
+            postings = self._postings[facet]
+            for value in values:
+                remaining = postings[value] & mask
+                if remaining:
+                    postings[value] = remaining
+                else:
+                    del postings[value]
+
+    def apply(self, engine, changes):
+        """Re-index committed projects; `changes` maps id -> document or None."""
+        with self._lock:
+            self.generation += 1
+            if not self._ready or self._engine is None or self._engine() is not engine:
+                return
+            for project_id, document in changes.items():
+                self._remove(project_id)
+                if document is not None:
+                    self._add(project_id, document)
+            # This commit's own bump of the projects version.
+            self._version += 1
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._ready = False
+
+    def _ensure_ready(self):
+        engine = db.engine
+        # Read before the rows, so a write racing the build triggers another one.
+        version = get_version('projects')
+        with self._lock:
+            if self._ready and self._engine is not None and self._engine() is engine \
+                    and version == self._version:
+                return
+            generation = self.generation
+        rows = db.session.execute(select(
+            Project.id, Project.is_visible, Project.tech, Project.categories,
+            Project.project_type, Project.start_date).where(project_is_public))
+        documents = {row.id: _document(row) for row in rows}
+        with self._lock:
+            self._reset()
+            for project_id, document in documents.items():
+                self._add(project_id, document)
+            self._engine = weakref.ref(engine)
+            self._version = version
+            # A commit that landed while the rows were read may be missing
+            # from them; serve this build but rebuild on the next call.
+            self._ready = generation == self.generation
+
+    # --- Queries ---
+
+    def _matching(self, facet, wanted):
+        postings = self._postings[facet]
+        if facet == 'year':
+            low, high = wanted
+            return self._union(bits for year, bits in postings.items()
+                               if (low is None or year >= low) and (high is None or year <= high))
+        return self._union(postings.get(value, 0) for value in wanted)
+
+    @staticmethod
+    def _union(masks):
+        bits = 0
+        for mask in masks:
+            bits |= mask
+        return bits
+
+    def _filter_bits(self, filters, skip=None):
+        bits = self._all
+        for facet, wanted in filters.items():
+            if facet != skip and wanted:
+                bits &= self._matching(facet, wanted)
+        return bits
+
+    def search(self, filters):
+        """Ascending ids of the visible projects matching `filters`."""
+        self._ensure_ready()
+        with self._lock:
+            ids = [self._ids[ordinal] for ordinal in _set_bits(self._filter_bits(filters))]
+        return sorted(ids)
+
+    def counts(self, filters):
+        """Total matches and per-value counts for every facet.
+
+        Each facet is counted against the other facets' filters only, so a
+        client can show how many projects each alternative value would give.
+        """
+        self._ensure_ready()
+        with self._lock:
+            total = self._filter_bits(filters).bit_count()
+            facets = {}
+            for facet in FACETS:
+                base = self._filter_bits(filters, skip=facet)
+                counts = {}
+                for value, bits in self._postings[facet].items():
+                    count = (bits & base).bit_count()
+                    if count:
+                        counts[value] = count
+                facets[facet] = counts
+        return {'total': total, 'facets': facets}
+
+
+project_facets = FacetIndex()
+
+
+# --- Sync hooks ---
+# Facet values are captured as projects are flushed (the instances are
+# expired by the time the commit finishes) and applied once it commits.
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_projects(session, flush_context):
+    changes = {}
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Project) and obj not in session.deleted:
+            changes[obj.id] = _document(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            changes[obj.id] = None
+    if changes:
+        pending = session.info.setdefault(_PENDING_KEY, {'engine': db.engine, 'changes': {}})
+        pending['changes'].update(changes)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_project_statements(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert) \
+            and orm_execute_state.bind_mapper is not None \
+            and orm_execute_state.bind_mapper.class_ is Project:
+        pending = orm_execute_state.session.info.setdefault(
+            _PENDING_KEY, {'engine': db.engine, 'changes': {}})
+        pending['rebuild'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_committed_projects(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    if pending.get('rebuild'):
+        project_facets.invalidate()
+    else:
+        project_facets.apply(pending['engine'], pending['changes'])
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_projects(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,19 @@
+"""Functions run in the password hashing worker processes.
+
+Workers import this module by name to unpickle their jobs, so it must stay
+free of side effects: no app, database or other project imports.
+"""
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+def hash_password(password, method):
+    return generate_password_hash(password, method)
+
+
+def verify_password(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+def hash_prefix(method):
+    """The `method` part Werkzeug writes for `method`, with its default parameters filled in."""
+    return generate_password_hash('', method).split('$', 1)[0]
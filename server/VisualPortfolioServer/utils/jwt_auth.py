@@ -1,6 +1,10 @@
 import jwt
 import datetime
-from flask import request, jsonify, current_app
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import request, jsonify, current_app, g
 from functools import wraps
 
 JWT_SECRET = None
@@ -20,57 +24,92 @@ def create_jwt_token(identity: str, user_id=None, is_admin=False):
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGO)
 
 
+class TokenCache:
+    """Size-bounded LRU of verified token claims, keyed by token digest.
+
+    Entries are dropped once the token's `exp` has passed, so a cached token
+    never outlives the expiry jwt.decode would have enforced.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at is not None and time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload):
+        with self._lock:
+            self._entries[key] = (payload, payload.get('exp'))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+token_cache = TokenCache()
+
+
 def decode_jwt_token(token: str):
     global JWT_SECRET
     if not JWT_SECRET:
         JWT_SECRET = current_app.config.get('JWT_SECRET', 'changeme')
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    token_cache.set(key, payload)
+    return payload
+
+
+def get_token_payload():
+    """Verified claims of the request's token, decoded at most once per request"""
+    if '_jwt_payload' not in g:
+        auth_header = request.headers.get('Authorization', None)
+        payload = None
+        if auth_header:
+            # Accept both 'Bearer <token>' and raw '<token>'
+            if auth_header.startswith('Bearer '):
+                token = auth_header.split(' ', 1)[1]
+            else:
+                token = auth_header
+            payload = decode_jwt_token(token)
+        g._jwt_payload = payload
+    return g._jwt_payload
 
 
 def get_current_user_id():
     """Get current user ID from JWT token"""
-    auth_header = request.headers.get('Authorization', None)
-    if not auth_header:
-        return None
-    if auth_header.startswith('Bearer '):
-        token = auth_header.split(' ', 1)[1]
-    else:
-        token = auth_header
-    payload = decode_jwt_token(token)
+    payload = get_token_payload()
     if payload:
         return payload.get('user_id')
     return None
 
 def get_current_user_admin_status():
     """Check if current user is admin from JWT token"""
-    auth_header = request.headers.get('Authorization', None)
-    if not auth_header:
-        return False
-    if auth_header.startswith('Bearer '):
-        token = auth_header.split(' ', 1)[1]
-    else:
-        token = auth_header
-    payload = decode_jwt_token(token)
+    payload = get_token_payload()
     if payload:
         return payload.get('is_admin', False)
     return False
 
 def get_current_user():
     """Get current user data from JWT token"""
-    auth_header = request.headers.get('Authorization', None)
-    if not auth_header:
-        return None
-    if auth_header.startswith('Bearer '):
-        token = auth_header.split(' ', 1)[1]
-    else:
-        token = auth_header
-    payload = decode_jwt_token(token)
+    payload = get_token_payload()
     if payload:
         # Return a simple object with user data
         class User:
@@ -84,15 +123,7 @@ def get_current_user():
 def jwt_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get('Authorization', None)
-        if not auth_header:
-            return jsonify({'error': 'Unauthorized'}), 401
-        # Accept both 'Bearer <token>' and raw '<token>'
-        if auth_header.startswith('Bearer '):
-            token = auth_header.split(' ', 1)[1]
-        else:
-            token = auth_header
-        payload = decode_jwt_token(token)
+        payload = get_token_payload()
         if not payload:
             return jsonify({'error': 'Unauthorized'}), 401
         return f(*args, **kwargs)
@@ -101,15 +132,7 @@ def jwt_required(f):
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get('Authorization', None)
-        if not auth_header:
-            return jsonify({'error': 'Unauthorized'}), 401
-        # Accept both 'Bearer <token>' and raw '<token>'
-        if auth_header.startswith('Bearer '):
-            token = auth_header.split(' ', 1)[1]
-        else:
-            token = auth_header
-        payload = decode_jwt_token(token)
+        payload = get_token_payload()
         if not payload:
             return jsonify({'error': 'Unauthorized'}), 401
         if not payload.get('is_admin', False):
@@ -0,0 +1,76 @@
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.schema import CreateColumn
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+# Columns added to existing tables after their initial release, in the order
+# they were introduced. `db.create_all()` never alters existing tables, so
+# these are applied with ALTER TABLE on databases created before them.
+ADDED_COLUMNS = [
+    ('blogs', 'is_visible'),
+    ('contact_messages', 'is_read'),
+]
+
+# JSON columns stored as JSONB on PostgreSQL (see models.IndexableJSON).
+# Tables created while they were plain JSON are converted in place, which
+# the GIN indexes on them require.
+JSONB_COLUMNS = [
+    ('projects', 'tech'),
+    ('projects', 'categories'),
+    ('certifications', 'skills'),
+    ('about', 'social_links'),
+    ('technical_skills', 'skills'),
+    ('experiences', 'technologies'),
+]
+
+
+def upgrade_schema():
+    """Bring an existing database up to date with the models.
+
+    Adds missing columns listed in ADDED_COLUMNS, converts JSONB_COLUMNS
+    from JSON on PostgreSQL, and creates any declared index that does not
+    exist yet. Tables that do not exist at all are left for
+    `db.create_all()` / init_db.py. Safe to run on every startup.
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table_name, column_name in ADDED_COLUMNS:
+            if table_name not in existing_tables:
+                continue
+            columns = {c['name'] for c in inspector.get_columns(table_name)}
+            if column_name in columns:
+                continue
+            column = db.metadata.tables[table_name].c[column_name]
+            ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            table_sql = engine.dialect.identifier_preparer.format_table(column.table)
+            conn.exec_driver_sql(f'ALTER TABLE {table_sql} ADD COLUMN {ddl}')
+            logger.info("Added column %s.%s", table_name, column_name)
+
+        if engine.dialect.name == 'postgresql':
+            preparer = engine.dialect.identifier_preparer
+            for table_name, column_name in JSONB_COLUMNS:
+                if table_name not in existing_tables:
+                    continue
+                column_type = next(c['type'] for c in inspector.get_columns(table_name)
+                                   if c['name'] == column_name)
+                if isinstance(column_type, JSONB):
+                    continue
+                column_sql = preparer.quote(column_name)
+                conn.exec_driver_sql(
+                    f'ALTER TABLE {preparer.quote(table_name)} ALTER COLUMN {column_sql} '
+                    f'TYPE JSONB USING {column_sql}::jsonb')
+                logger.info("Converted %s.%s to JSONB", table_name, column_name)
+
+        for table_name, table in db.metadata.tables.items():
+            if table_name not in existing_tables:
+                continue
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(sort_value, row_id):
+    """Opaque keyset cursor pointing just past the row (sort_value, row_id)."""
+    raw = json.dumps([sort_value.isoformat() if sort_value else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on a malformed or altered cursor."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except RecursionError:  # deeply nested JSON
+        raise ValueError('Invalid cursor') from None
+    if not (isinstance(raw, list) and len(raw) == 2
+            and (raw[0] is None or isinstance(raw[0], str))
+            and isinstance(raw[1], int) and not isinstance(raw[1], bool)):
+        raise ValueError('Invalid cursor')
+    date_str, row_id = raw
+    return (datetime.fromisoformat(date_str) if date_str is not None else None), row_id
+
+
+def after_cursor(sort_column, id_column, sort_value, row_id):
+    """Rows that sort after (sort_value, row_id) in
+    `sort_column DESC NULLS LAST, id_column DESC` order."""
+    if sort_value is None:
+        return and_(sort_column.is_(None), id_column < row_id)
+    return or_(
+        sort_column < sort_value,
+        and_(sort_column == sort_value, id_column < row_id),
+        sort_column.is_(None),
+    )
+
+
+def parse_page_size(value, default=20):
+    """Page size from a query-string value, capped at MAX_PAGE_SIZE."""
+    limit = min(int(value if value is not None else default), MAX_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return limit
+
+
+def paginate(query, sort_column, id_column, limit, cursor=None):
+    """Return (rows, next_cursor) for one keyset page of `query`.
+
+    `query` must already be ordered by `sort_column DESC NULLS LAST,
+    id_column DESC`. Raises ValueError for an invalid cursor.
+    """
+    if cursor:
+        query = query.filter(after_cursor(sort_column, id_column, *decode_cursor(cursor)))
+    # Fetch one extra row to learn whether another page exists.
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
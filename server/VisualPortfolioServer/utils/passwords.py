@@ -0,0 +1,135 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.hash_worker import hash_password, hash_prefix, verify_password
+
+
+def _pool_context():
+    """Start method for the worker processes.
+
+    Forked workers begin as a copy of this process and only ever run the
+    job functions. Spawned or forkserver workers would first re-run the
+    __main__ script, which for `python app.py` is the whole app setup. Where
+    fork is not available (Windows) the entry script must be safe to import.
+    """
+    return multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods()
+                                       else 'spawn')
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated; map to 503 Service Unavailable."""
+
+
+class PasswordHasher:
+    """Runs password hashing and verification off the request threads.
+
+    Work is sent to a small process pool so a burst of logins or
+    registrations cannot occupy every server thread with PBKDF2/scrypt.
+    At most `max_pending` jobs may be queued or running; beyond that callers
+    get HashingBusy immediately instead of waiting.
+
+    With `workers=0` hashing runs inline: the default until init_app()
+    applies PASSWORD_HASH_WORKERS, and what scripts such as init_db.py
+    configure, since they have no request threads to protect.
+
+    init_app() starts the workers while the app is set up, before the
+    server runs any threads. If a worker dies the pool is replaced, and the
+    calls it failed get HashingBusy.
+    """
+
+    def __init__(self, method='scrypt', workers=0, max_pending=8, timeout=10):
+        self._lock = threading.Lock()
+        self._executor = None
+        self.configure(method, workers, max_pending, timeout)
+
+    def configure(self, method, workers, max_pending, timeout):
+        self.method = method
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._prefix = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def init_app(self, app):
+        self.configure(
+            method=app.config['PASSWORD_HASH_METHOD'],
+            workers=app.config['PASSWORD_HASH_WORKERS'],
+            max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+            timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+        )
+        self.start()
+
+    def start(self):
+        """Start the worker processes and derive the hash prefix on them."""
+        if self.workers:
+            with self._lock:
+                self._get_executor()
+        self._prefix = self._run(hash_prefix, self.method)
+
+    @property
+    def prefix(self):
+        # Werkzeug fills in default parameters (e.g. 'scrypt' becomes
+        # 'scrypt:32768:8:1'), so the canonical prefix comes from a real
+        # hash; start() computes it, else the first use does, in the pool.
+        if self._prefix is None:
+            self._prefix = self._run(hash_prefix, self.method)
+        return self._prefix
+
+    def _get_executor(self):
+        # Called with self._lock held.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
+        return self._executor
+
+    def _discard(self, executor):
+        """Drop a broken pool; the next job starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        atexit.unregister(executor.shutdown)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        # configure() may swap in a new semaphore; release the one acquired.
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        executor = None
+        try:
+            with self._lock:
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._discard(executor)
+            raise HashingBusy()
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusy()
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise HashingBusy()
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(verify_password, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was made with different parameters than configured."""
+        return password_hash.split('$', 1)[0] != self.prefix
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import request, jsonify, make_response
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(limit):
+    """Parse '10/minute' into (capacity, refill rate in tokens per second)."""
+    count, _, period = limit.partition('/')
+    count = int(count)
+    return count, count / PERIODS[period.strip().rstrip('s')]
+
+
+class MemoryBackend:
+    """Token buckets in a dict; limits hold within a single process."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, cost=1, now=None):
+        """Take `cost` tokens if at least one is left; cost=0 only checks."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed and cost:
+                tokens -= cost
+                self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+                if len(self._buckets) > self.max_keys:
+                    self._prune(now)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def _prune(self, now):
+        # Buckets that have refilled are equivalent to absent ones.
+        full = [k for k, (_, _, full_at) in self._buckets.items() if full_at <= now]
+        for k in full:
+            del self._buckets[k]
+
+
+class SQLiteBackend:
+    """Token buckets in a SQLite file shared by every worker process.
+
+    Each check is a short BEGIN IMMEDIATE transaction, so concurrent
+    processes serialize on the bucket row and the limit holds globally.
+    Rows record when their bucket is full again and are deleted once it is,
+    at most every `prune_interval` seconds per process.
+    """
+
+    def __init__(self, path, prune_interval=60):
+        self.path = path
+        self.prune_interval = prune_interval
+        self._pruned = 0
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+                         'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, '
+                         'full_at REAL NOT NULL DEFAULT 0)')
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(rate_limit_buckets)')]
+            if 'full_at' not in columns:
+                # Files from before pruning; their rows are dropped at the first prune.
+                conn.execute('ALTER TABLE rate_limit_buckets ADD COLUMN full_at REAL NOT NULL DEFAULT 0')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_full_at '
+                         'ON rate_limit_buckets (full_at)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def consume(self, key, capacity, rate, cost=1, now=None):
+        """Take `cost` tokens if at least one is left; cost=0 only checks."""
+        now = time.time() if now is None else now
+        conn = self._connect()
+        if not cost:
+            row = conn.execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?',
+                               (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            return tokens >= 1, 0 if tokens >= 1 else (1 - tokens) / rate
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?',
+                               (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= cost
+            conn.execute('INSERT INTO rate_limit_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) '
+                         'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, '
+                         'updated = excluded.updated, full_at = excluded.full_at',
+                         (key, tokens, now, now + (capacity - tokens) / rate))
+            if now - self._pruned >= self.prune_interval:
+                conn.execute('DELETE FROM rate_limit_buckets WHERE full_at <= ?', (now,))
+                self._pruned = now
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+
+def _ip_key():
+    # The real client address behind a proxy only once ProxyFix is enabled
+    # with PROXY_FIX_X_FOR; otherwise every proxied client shares one key.
+    return request.remote_addr or 'unknown'
+
+
+def _username_key():
+    if request.authorization and request.authorization.username:
+        return request.authorization.username.lower()
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and isinstance(data.get('username'), str):
+        return data['username'].strip().lower()
+    return None
+
+
+def _ip_username_key():
+    # Per client *and* account: a bucket per account alone would let anyone
+    # who knows a username lock its owner out from every address.
+    username = _username_key()
+    return None if username is None else f'{_ip_key()}/{username}'
+
+
+KEY_FUNCS = {'ip': _ip_key, 'username': _username_key, 'ip_username': _ip_username_key}
+
+
+class RateLimiter:
+    """Per-route token-bucket limits keyed by client IP and/or username.
+
+    Policies come from the RATE_LIMITS config ({policy: '10/minute'}) and
+    buckets live in the backend chosen by RATE_LIMIT_STORAGE: 'memory' for a
+    single process, or 'sqlite:///path/to/file.db' to share limits across
+    worker processes. Until init_app() runs, every request is allowed.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.policies = {}
+
+    def init_app(self, app):
+        if not app.config['RATE_LIMIT_ENABLED']:
+            return
+        storage = app.config['RATE_LIMIT_STORAGE']
+        if storage.startswith('sqlite:///'):
+            self.backend = SQLiteBackend(os.path.abspath(storage[len('sqlite:///'):]))
+        elif storage == 'memory':
+            self.backend = MemoryBackend()
+        else:
+            raise ValueError(f"Unsupported RATE_LIMIT_STORAGE: {storage}")
+        self.policies = {name: parse_limit(limit) for name, limit in app.config['RATE_LIMITS'].items()}
+
+    def _buckets(self, policy, key_names):
+        if policy not in self.policies:
+            return []
+        keys = ((key_name, KEY_FUNCS[key_name]()) for key_name in key_names)
+        return [(f'{policy}:{key_name}:{key}', self.policies[policy])
+                for key_name, key in keys if key is not None]
+
+    def limit(self, policy, by=('ip',), failures=(), failure_policy=None):
+        """Reject requests over `policy` for any of the `by` keys with 429.
+
+        Buckets for the `failures` keys follow `failure_policy` (default
+        `policy`); they are checked on every request but only charged when
+        the view answers 401, i.e. for failed authentication.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if self.backend is None or policy not in self.policies:
+                    return f(*args, **kwargs)
+                buckets = self._buckets(policy, by)
+                failed_buckets = self._buckets(failure_policy or policy, failures)
+                for key, (capacity, rate) in buckets:
+                    allowed, retry_after = self.backend.consume(key, capacity, rate)
+                    if not allowed:
+                        return too_many_requests(retry_after)
+                for key, (capacity, rate) in failed_buckets:
+                    allowed, retry_after = self.backend.consume(key, capacity, rate, cost=0)
+                    if not allowed:
+                        return too_many_requests(retry_after)
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 401:
+                    for key, (capacity, rate) in failed_buckets:
+                        self.backend.consume(key, capacity, rate)
+                return response
+            return decorated_function
+        return decorator
+
+
+def too_many_requests(retry_after):
+    response = jsonify({'error': 'Too many requests, please slow down'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+limiter = RateLimiter()
@@ -0,0 +1,300 @@
+import html
+import logging
+import re
+import weakref
+
+from sqlalchemy import event, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from models import db, Blog, Project, Certification
+
+logger = logging.getLogger(__name__)
+
+# Kind name -> (model, numeric code). The code is folded into the FTS rowid
+# (ref_id * 4 + code) so a document can be replaced or removed by rowid.
+KINDS = {
+    'project': (Project, 1),
+    'blog': (Blog, 2),
+    'certification': (Certification, 3),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _) in KINDS.items()}
+
+# Engines on which the search index is known to exist.
+_ready_engines = weakref.WeakSet()
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Highlight delimiters passed to the database. Results are HTML-escaped
+# first and only then are these turned into <mark> elements, so indexed
+# text can never inject markup. Indexed text is stripped of them.
+_MARK_START, _MARK_END = '\ue000', '\ue001'
+_MARKS_RE = re.compile(f'[{_MARK_START}{_MARK_END}]')
+
+
+def _plain(value, markup=False):
+    """Stored (HTML-escaped) text as plain text for indexing.
+
+    With `markup`, complete tags (content written as HTML) are dropped too.
+    """
+    if not value:
+        return ''
+    value = _MARKS_RE.sub(' ', html.unescape(str(value)))
+    if markup:
+        value = _TAG_RE.sub(' ', value)
+    return ' '.join(value.split())
+
+
+def _highlighted(value):
+    """Escaped HTML for text returned by the index, with matches in <mark>."""
+    if not value:
+        return ''
+    return html.escape(value).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def _join(values):
+    return ' '.join(str(v) for v in (values or []) if v)
+
+
+def build_document(obj):
+    """Return (kind, ref_id, visible, title, body, tags) for an indexed object."""
+    if isinstance(obj, Blog):
+        return ('blog', obj.id, obj.is_visible is not False, _plain(obj.title),
+                _plain(f"{obj.excerpt or ''} {obj.content or ''}", markup=True),
+                _join(tag.name for tag in obj.tags))
+    if isinstance(obj, Project):
+        return ('project', obj.id, obj.is_visible is not False, _plain(obj.title),
+                _plain(obj.description, markup=True),
+                _join(list(obj.tech or []) + list(obj.categories or [])))
+    if isinstance(obj, Certification):
+        return ('certification', obj.id, True, _plain(obj.name),
+                _plain(f"{obj.issuer or ''} {obj.description or ''}", markup=True),
+                _join(obj.skills))
+    raise TypeError(f"{type(obj).__name__} is not searchable")
+
+
+def _rowid(kind, ref_id):
+    return ref_id * 4 + KINDS[kind][1]
+
+
+# --- Backend DDL / writes ---
+
+def _is_postgres(conn):
+    return conn.dialect.name == 'postgresql'
+
+
+def _index_table(conn):
+    return 'search_documents' if _is_postgres(conn) else 'search_index'
+
+
+def _has_index(conn):
+    """Whether the search index exists on `conn`'s database.
+
+    Another process (or a script run since this one started) may have
+    created it, so a miss is checked again next time rather than remembered.
+    """
+    if conn.engine in _ready_engines:
+        return True
+    if not inspect(conn).has_table(_index_table(conn)):
+        return False
+    _ready_engines.add(conn.engine)
+    return True
+
+
+def _is_in_sync(conn):
+    """Whether the index holds one document per indexed row (a cheap startup check)."""
+    indexed = conn.execute(text(f"SELECT COUNT(*) FROM {_index_table(conn)}")).scalar()
+    rows = sum(conn.execute(select(func.count()).select_from(model)).scalar()
+               for model, _ in KINDS.values())
+    return indexed == rows
+
+
+def _create_index(conn):
+    if _is_postgres(conn):
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS search_documents (
+                kind VARCHAR(20) NOT NULL,
+                ref_id INTEGER NOT NULL,
+                visible BOOLEAN NOT NULL DEFAULT TRUE,
+                title TEXT NOT NULL DEFAULT '',
+                body TEXT NOT NULL DEFAULT '',
+                tags TEXT NOT NULL DEFAULT '',
+                document TSVECTOR NOT NULL,
+                PRIMARY KEY (kind, ref_id)
+            )"""))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_search_documents_document "
+            "ON search_documents USING GIN (document)"))
+    else:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, visible UNINDEXED, "
+            "title, body, tags, tokenize='porter unicode61')"))
+
+
+def _write_documents(conn, documents):
+    if not documents:
+        return
+    rows = [dict(kind=d[0], ref_id=d[1], visible=d[2], title=d[3], body=d[4], tags=d[5],
+                 rowid=_rowid(d[0], d[1])) for d in documents]
+    if _is_postgres(conn):
+        conn.execute(text("""
+            INSERT INTO search_documents (kind, ref_id, visible, title, body, tags, document)
+            VALUES (:kind, :ref_id, :visible, :title, :body, :tags,
+                    setweight(to_tsvector('english', :title), 'A') ||
+                    setweight(to_tsvector('english', :tags), 'B') ||
+                    setweight(to_tsvector('english', :body), 'C'))
+            ON CONFLICT (kind, ref_id) DO UPDATE SET
+                visible = EXCLUDED.visible, title = EXCLUDED.title, body = EXCLUDED.body,
+                tags = EXCLUDED.tags, document = EXCLUDED.document"""), rows)
+    else:
+        conn.execute(text("DELETE FROM search_index WHERE rowid = :rowid"), rows)
+        conn.execute(text(
+            "INSERT INTO search_index (rowid, kind, ref_id, visible, title, body, tags) "
+            "VALUES (:rowid, :kind, :ref_id, :visible, :title, :body, :tags)"), rows)
+
+
+def _delete_documents(conn, keys):
+    if not keys:
+        return
+    if _is_postgres(conn):
+        conn.execute(text("DELETE FROM search_documents WHERE kind = :kind AND ref_id = :ref_id"),
+                     [dict(kind=k, ref_id=i) for k, i in keys])
+    else:
+        conn.execute(text("DELETE FROM search_index WHERE rowid = :rowid"),
+                     [dict(rowid=_rowid(k, i)) for k, i in keys])
+
+
+def rebuild_search_index():
+    """Re-index every blog, project and certification from scratch."""
+    with db.engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {_index_table(conn)}"))
+        for model, _ in KINDS.values():
+            _write_documents(conn, [build_document(obj) for obj in model.query.all()])
+
+
+def ensure_search_index():
+    """Create the search index for the current engine and reconcile it.
+
+    Runs at every startup: the index is rebuilt when it is new or when its
+    document count no longer matches the content tables, e.g. after rows
+    were written by a process that could not see the index yet or by
+    `init_db.py` reseeding the tables.
+
+    Returns False (and leaves search disabled) when the backend cannot host
+    it, e.g. a SQLite build without FTS5 or a database without the content
+    tables yet.
+    """
+    engine = db.engine
+    tables = set(inspect(engine).get_table_names())
+    if not {'blogs', 'projects', 'certifications'} <= tables:
+        return False
+    try:
+        with engine.begin() as conn:
+            existed = _index_table(conn) in tables
+            _create_index(conn)
+            in_sync = existed and _is_in_sync(conn)
+    except Exception as e:
+        logger.warning("Full-text search disabled: %s", e)
+        return False
+    _ready_engines.add(engine)
+    if not in_sync:
+        rebuild_search_index()
+    return True
+
+
+def is_search_ready():
+    with db.engine.connect() as conn:
+        return _has_index(conn)
+
+
+# --- Queries ---
+
+def _fts5_query(q):
+    """Turn free text into a safe FTS5 query: every word, prefix-matched."""
+    return ' '.join(f'"{word}"*' for word in _WORD_RE.findall(q))
+
+
+def search(q, kinds=None, limit=20):
+    """Return ranked matches as dicts with highlighted title and snippet.
+
+    `title` and `snippet` are HTML: escaped text with the matched words in
+    <mark> elements.
+    """
+    kinds = list(kinds or KINDS)
+    conn = db.session.connection()
+    marks = {'start': _MARK_START, 'end': _MARK_END}
+    if _is_postgres(conn):
+        rows = db.session.execute(text("""
+            SELECT kind, ref_id,
+                   ts_headline('english', title, query, :title_options) AS title,
+                   ts_headline('english', body, query, :snippet_options) AS snippet,
+                   ts_rank(document, query) AS rank
+            FROM search_documents, websearch_to_tsquery('english', :q) AS query
+            WHERE document @@ query AND visible AND kind = ANY(:kinds)
+            ORDER BY rank DESC
+            LIMIT :limit"""), {
+                'q': q, 'kinds': kinds, 'limit': limit,
+                'title_options': 'StartSel={start}, StopSel={end}, HighlightAll=true'.format(**marks),
+                'snippet_options': 'StartSel={start}, StopSel={end}, MaxWords=30, MinWords=10'.format(**marks),
+            })
+    else:
+        match = _fts5_query(q)
+        if not match:
+            return []
+        placeholders = ', '.join(f':kind{i}' for i in range(len(kinds)))
+        params = {f'kind{i}': kind for i, kind in enumerate(kinds)}
+        params.update(match=match, limit=limit, **marks)
+        rows = db.session.execute(text(f"""
+            SELECT kind, ref_id,
+                   highlight(search_index, 3, :start, :end) AS title,
+                   snippet(search_index, 4, :start, :end, '…', 16) AS snippet,
+                   bm25(search_index, 0, 0, 0, 10.0, 1.0, 5.0) AS rank
+            FROM search_index
+            WHERE search_index MATCH :match AND visible = 1 AND kind IN ({placeholders})
+            ORDER BY rank
+            LIMIT :limit"""), params)
+    return [{
+        'type': row.kind,
+        'id': int(row.ref_id),
+        'title': _highlighted(row.title),
+        'snippet': _highlighted(row.snippet),
+        'rank': abs(float(row.rank)),
+    } for row in rows]
+
+
+def refresh_documents(model, ids):
+    """Re-index rows changed by bulk INSERT/UPDATE statements.
+
+    Bulk statements do not pass through the flush hook below, so callers
+    that use them refresh the affected rows within the same transaction.
+    """
+    if model not in _KIND_BY_MODEL or not ids:
+        return
+    conn = db.session.connection()
+    if not _has_index(conn):
+        return
+    objs = db.session.scalars(select(model).where(model.id.in_(ids))
+                              .execution_options(populate_existing=True)).all()
+    _write_documents(conn, [build_document(obj) for obj in objs])
+
+
+# --- Sync hooks ---
+# Documents are rewritten inside the same transaction as the content change,
+# so the index commits (or rolls back) together with the row it describes.
+
+@event.listens_for(Session, 'after_flush')
+def _sync_search_index(session, flush_context):
+    conn = session.connection()
+    if not _has_index(conn):
+        return
+    changed = {}
+    removed = set()
+    for obj in list(session.new) + list(session.dirty):
+        if type(obj) in _KIND_BY_MODEL and obj not in session.deleted:
+            changed[(_KIND_BY_MODEL[type(obj)], obj.id)] = obj
+    for obj in session.deleted:
+        if type(obj) in _KIND_BY_MODEL:
+            removed.add((_KIND_BY_MODEL[type(obj)], obj.id))
+    _delete_documents(conn, removed)
+    _write_documents(conn, [build_document(obj) for obj in changed.values()])
@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from flask import request, send_file, Response
+
+try:
+    import brotli
+except ImportError:  # optional: gzip-only shell variants without it
+    brotli = None
+
+# Vite emits content-hashed names under assets/ such as index-BxH3k2aF.js;
+# those can be cached forever because a new build produces a new name.
+HASHED_NAME_RE = re.compile(r'-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+# Precompressed sibling suffix -> Content-Encoding, in preference order.
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+
+
+class StaticIndex:
+    """In-memory index of the built frontend (dist/public).
+
+    Built once at startup: every file is stat'ed a single time, and any
+    `.br` / `.gz` siblings are recorded so the best precompressed variant can
+    be picked per request from Accept-Encoding. Only indexed files are ever
+    served, so lookups never touch the filesystem for unknown paths.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._files = {}
+        self._root_mtime = None
+        self._lock = threading.Lock()
+
+    def build(self):
+        files = {}
+        root_mtime = None
+        if os.path.isdir(self.root):
+            root_mtime = os.stat(self.root).st_mtime
+            for dirpath, _, filenames in os.walk(self.root):
+                names = set(filenames)
+                for name in filenames:
+                    if any(name.endswith(suffix) and name[:-len(suffix)] in names
+                           for suffix, _ in ENCODINGS):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+                    st = os.stat(path)
+                    files[rel] = {
+                        'path': path,
+                        'mimetype': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                        'etag': f'{int(st.st_mtime)}-{st.st_size}',
+                        'immutable': rel.startswith('assets/') and bool(HASHED_NAME_RE.search(name)),
+                        'variants': [(encoding, path + suffix) for suffix, encoding in ENCODINGS
+                                     if name + suffix in names],
+                    }
+        with self._lock:
+            self._files = files
+            self._root_mtime = root_mtime
+
+    def lookup(self, rel_path):
+        entry = self._files.get(rel_path)
+        if entry is None and self._root_changed():
+            # The frontend was (re)built after startup.
+            self.build()
+            entry = self._files.get(rel_path)
+        return entry
+
+    def _root_changed(self):
+        try:
+            return os.stat(self.root).st_mtime != self._root_mtime
+        except OSError:
+            return self._root_mtime is not None
+
+    def serve(self, rel_path):
+        """Return a response for an indexed file, or None if it is unknown."""
+        entry = self.lookup(rel_path)
+        if entry is None:
+            return None
+
+        path, encoding = entry['path'], None
+        for candidate, variant_path in entry['variants']:
+            if candidate in request.accept_encodings:
+                path, encoding = variant_path, candidate
+                break
+
+        response = send_file(path, mimetype=entry['mimetype'], conditional=True,
+                             etag=f"{entry['etag']}-{encoding or 'identity'}")
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry['variants']:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = (IMMUTABLE_CACHE_CONTROL if entry['immutable']
+                                             else REVALIDATE_CACHE_CONTROL)
+        return response
+
+
+class ShellCache:
+    """The SPA shell (index.html) held in memory as ready-to-send bytes.
+
+    The file is read once, together with its ETag and gzip/brotli variants,
+    and only re-read when its mtime changes. The mtime itself is checked at
+    most once every `ttl` seconds, so SPA fallbacks normally cost no syscall.
+    """
+
+    def __init__(self, path, ttl=5):
+        self.path = path
+        self.ttl = ttl
+        self._shell = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, mtime):
+        with open(self.path, 'rb') as f:
+            body = f.read()
+        variants = {'gzip': gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(body)
+        return {
+            'mtime': mtime,
+            'body': body,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'variants': variants,
+        }
+
+    def get(self):
+        now = time.monotonic()
+        if self._shell is not None and now - self._checked_at <= self.ttl:
+            return self._shell
+        with self._lock:
+            if self._shell is None or now - self._checked_at > self.ttl:
+                mtime = os.stat(self.path).st_mtime
+                if self._shell is None or self._shell['mtime'] != mtime:
+                    self._shell = self._load(mtime)
+                self._checked_at = now
+        return self._shell
+
+    def response(self):
+        shell = self.get()
+        body, encoding = shell['body'], None
+        for candidate in ('br', 'gzip'):
+            if candidate in shell['variants'] and candidate in request.accept_encodings:
+                body, encoding = shell['variants'][candidate], candidate
+                break
+        # Each encoding is a different representation, so it gets its own
+        # strong ETag (as in StaticIndex.serve).
+        etag = f"{shell['etag']}-{encoding or 'identity'}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='text/html')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
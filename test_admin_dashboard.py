@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Admin dashboard stats: every count in one query, messages per day, and the
+cached result refreshed by writes to the counted tables
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from conftest import admin_headers, build_app
+from models import db, Blog, ContactMessage, Project, User
+from routes.admin import MESSAGES_PER_DAY_WINDOW, admin_bp
+from utils.cache import response_cache
+
+
+def dashboard_app(make_app, **config):
+    app = make_app(admin_bp, **config)
+    now = datetime.utcnow()
+    with app.app_context():
+        db.session.add_all([
+            Project(title='a', description='d'),
+            Project(title='b', description='d', is_visible=False),
+            Project(title='c', description='d', is_visible=False),
+            Blog(title='post', content='c'),
+            User(username='admin', email='a@example.com', password_hash='x', is_admin=True),
+        ])
+        for age, is_read in ((0, False), (0, True), (2, False), (MESSAGES_PER_DAY_WINDOW + 5, False)):
+            db.session.add(ContactMessage(name='n', email='e@example.com', subject='s', message='m',
+                                          is_read=is_read, created_at=now - timedelta(days=age)))
+        db.session.commit()
+    return app
+
+
+class StatementCounter:
+    def __init__(self, app):
+        with app.app_context():
+            self.engine = db.engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+def test_stats_in_two_queries(make_app):
+    app = dashboard_app(make_app)
+    client = app.test_client()
+    with StatementCounter(app) as statements:
+        response = client.get('/api/admin/dashboard', headers=admin_headers(app))
+    assert response.status_code == 200
+    # One SELECT of scalar subqueries for the counts, one GROUP BY for the days.
+    assert statements.count == 2
+    stats = response.json
+    assert {k: v for k, v in stats.items() if k != 'messages_per_day'} == {
+        'projects_count': 3, 'visible_projects_count': 1, 'hidden_projects_count': 2,
+        'blogs_count': 1, 'certifications_count': 0, 'users_count': 1,
+        'contact_messages_count': 4, 'unread_messages_count': 3,
+    }
+    days = stats['messages_per_day']
+    assert len(days) == MESSAGES_PER_DAY_WINDOW
+    today = datetime.utcnow().date()
+    assert days[-1] == {'date': today.isoformat(), 'count': 2}
+    assert days[-3] == {'date': (today - timedelta(days=2)).isoformat(), 'count': 1}
+    assert sum(d['count'] for d in days) == 3  # the older message is outside the window
+
+    assert client.get('/api/admin/dashboard').status_code == 401
+
+
+def test_cached_stats_follow_writes(make_app):
+    app = dashboard_app(make_app, RESPONSE_CACHE_ENABLED=True, RESPONSE_CACHE_STORAGE='memory')
+    response_cache.init_app(app)
+    client = app.test_client()
+    headers = admin_headers(app)
+    assert client.get('/api/admin/dashboard', headers=headers).json['unread_messages_count'] == 3
+    with StatementCounter(app) as statements:
+        assert client.get('/api/admin/dashboard', headers=headers).status_code == 200
+    assert statements.count == 0
+    with app.app_context():
+        ContactMessage.query.update({'is_read': True})
+        db.session.commit()
+    assert client.get('/api/admin/dashboard', headers=headers).json['unread_messages_count'] == 0
+
+
+if __name__ == '__main__':
+    test_stats_in_two_queries(build_app)
+    test_cached_stats_follow_writes(build_app)
+    print('ok')
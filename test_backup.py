@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+NDJSON export/import: round trip between two databases, user merging, and
+rejection of truncated files
+"""
+from datetime import date, datetime
+
+from conftest import admin_headers, build_app
+from models import db, Author, Blog, ContactMessage, Project, Tag, User
+from routes.admin import admin_bp
+from utils.serialization import loads
+
+
+def seed(app):
+    with app.app_context():
+        admin = User(username='admin', email='admin@example.com', is_admin=True, password_hash='x')
+        guest = User(username='guest', email='guest@example.com', password_hash='y')
+        db.session.add_all([admin, guest])
+        db.session.add(Project(title='site', description='d', tech=['React'], start_date=date(2023, 5, 1)))
+        db.session.add(Blog(title='post', content='body', date=datetime(2024, 1, 2, 3, 4, 5),
+                            author=Author(name='me'), tags=[Tag(name='flask'), Tag(name='sql')]))
+        db.session.add(ContactMessage(name='n', email='e@example.com', subject='s', message='m'))
+        db.session.commit()
+
+
+def export(app):
+    response = app.test_client().get('/api/admin/export', headers=admin_headers(app))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return response.data
+
+
+def test_export_streams_every_table_without_password_hashes(make_app):
+    app = make_app(admin_bp)
+    seed(app)
+    lines = [loads(line) for line in export(app).splitlines()]
+    assert lines[0]['format'] == 'visual-portfolio'
+    assert lines[-1]['counts']['blog_tags'] == 2
+    users = [line['row'] for line in lines if line.get('table') == 'users']
+    assert [u['username'] for u in users] == ['admin', 'guest']
+    assert all('password_hash' not in u for u in users)
+
+
+def test_import_restores_export_into_another_database(make_app):
+    source, target = make_app(admin_bp), make_app(admin_bp)
+    seed(source)
+    with target.app_context():
+        db.session.add(User(username='admin', email='admin@example.com', is_admin=True, password_hash='keep'))
+        db.session.add(Project(title='stale', description='d'))
+        db.session.commit()
+
+    response = target.test_client().post('/api/admin/import', data=export(source),
+                                         headers=admin_headers(target), content_type='application/x-ndjson')
+    assert response.status_code == 200, response.json
+    assert response.json['skipped_users'] == 1
+    assert response.json['imported']['projects'] == 1
+
+    with target.app_context():
+        assert [p.title for p in Project.query.all()] == ['site']
+        assert Project.query.one().start_date == date(2023, 5, 1)
+        blog = Blog.query.one()
+        assert blog.date == datetime(2024, 1, 2, 3, 4, 5)
+        assert blog.author.name == 'me' and sorted(t.name for t in blog.tags) == ['flask', 'sql']
+        assert User.query.filter_by(username='admin').one().password_hash == 'keep'
+        assert not User.query.filter_by(username='guest').one().check_password('y')
+
+
+def test_truncated_import_changes_nothing(make_app):
+    source, target = make_app(admin_bp), make_app(admin_bp)
+    seed(source)
+    with target.app_context():
+        db.session.add(Project(title='keep', description='d'))
+        db.session.commit()
+    data = b'\n'.join(export(source).splitlines()[:-1])
+    response = target.test_client().post('/api/admin/import', data=data, headers=admin_headers(target))
+    assert response.status_code == 400
+    assert 'truncated' in response.json['details']
+    with target.app_context():
+        assert [p.title for p in Project.query.all()] == ['keep']
+
+
+if __name__ == '__main__':
+    test_export_streams_every_table_without_password_hashes(build_app)
+    test_import_restores_export_into_another_database(build_app)
+    test_truncated_import_changes_nothing(build_app)
+    print('ok')
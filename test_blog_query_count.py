@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Regression test: blog endpoints must not issue per-row or per-tag queries
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from conftest import admin_headers, build_app
+from models import db, Blog, Tag, Author
+from routes.blogs import blogs_bp
+
+
+def seeded_app(make_app, num_posts):
+    app = make_app(blogs_bp)
+    with app.app_context():
+        tags = [Tag(name=f'tag-{i}') for i in range(5)]
+        for i in range(num_posts):
+            author = Author(name=f'author-{i}')
+            db.session.add(Blog(
+                title=f'post {i}',
+                content='body ' * 50,
+                date=datetime(2024, 1, 1) + timedelta(days=i),
+                author=author,
+                tags=tags[i % 3:i % 3 + 3],
+            ))
+        db.session.commit()
+    return app
+
+
+def count_queries(app, path, headers=None, method='get', json=None):
+    client = app.test_client()
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _count)
+    try:
+        response = getattr(client, method)(path, headers=headers or {}, json=json)
+    finally:
+        event.remove(engine, 'before_cursor_execute', _count)
+    assert response.status_code in (200, 201), response.data
+    return len(statements)
+
+
+def test_blog_query_count_is_independent_of_post_count(make_app):
+    small, large = seeded_app(make_app, 3), seeded_app(make_app, 30)
+
+    for path in ['/api/blogs/', '/api/blogs/?limit=10', '/api/blogs/1']:
+        assert count_queries(small, path) == count_queries(large, path) <= 2, path
+
+    admin_small = count_queries(small, '/api/blogs/admin', admin_headers(small))
+    admin_large = count_queries(large, '/api/blogs/admin', admin_headers(large))
+    assert admin_small == admin_large <= 2
+
+
+def test_blog_save_query_count_is_independent_of_tag_count(make_app):
+    app = seeded_app(make_app, 1)
+    headers = admin_headers(app)
+
+    def save(method, path, num_tags, prefix):
+        tags = [{'name': f'{prefix}-{i}'} for i in range(num_tags)]
+        body = {'title': 'post', 'content': 'body', 'tags': tags, 'author': {'name': 'author-0'}}
+        return count_queries(app, path, headers, method=method, json=body)
+
+    # New tags: one lookup, one multi-row upsert and one re-select, however many.
+    assert save('post', '/api/blogs/', 2, 'new-a') == save('post', '/api/blogs/', 20, 'new-b')
+    # Existing tags, as on a typical update (after a first save warms the caches).
+    save('put', '/api/blogs/1', 1, 'warm')
+    assert save('put', '/api/blogs/1', 2, 'new-a') == save('put', '/api/blogs/1', 20, 'new-b')
+
+
+if __name__ == '__main__':
+    test_blog_query_count_is_independent_of_post_count(build_app)
+    test_blog_save_query_count_is_independent_of_tag_count(build_app)
+    print('ok')
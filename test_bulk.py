@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Bulk create/update/delete: one transaction, nothing written when any item
+fails, and the search index, facet index and response cache kept current
+"""
+from conftest import admin_headers, build_app
+from models import db, Project
+from routes.projects import projects_bp
+from routes.search import search_bp
+from utils.cache import response_cache
+from utils.search import ensure_search_index
+
+
+def seeded_app(make_app, **config):
+    app = make_app(projects_bp, search_bp, **config)
+    with app.app_context():
+        ensure_search_index()
+        db.session.add_all([
+            Project(title='Shop', description='d', tech=['React'], order=1),
+            Project(title='Model', description='d', tech=['Python'], order=2),
+            Project(title='Dash', description='d', tech=['React'], order=3),
+        ])
+        db.session.commit()
+    return app
+
+
+def bulk(app, operations):
+    return app.test_client().post('/api/projects/bulk', json=operations, headers=admin_headers(app))
+
+
+def project_rows(app):
+    with app.app_context():
+        return [(p.id, p.title, p.order, p.tech) for p in Project.query.order_by(Project.id)]
+
+
+def test_mixed_operations_apply_in_one_batch(make_app):
+    app = seeded_app(make_app)
+    response = bulk(app, [
+        {'op': 'update', 'id': 3, 'data': {'order': 0, 'tech': ['Go']}},
+        {'op': 'create', 'data': {'title': 'Zebra <cli>', 'description': 'd', 'tech': ['Go'], 'order': 4}},
+        {'op': 'delete', 'id': 2},
+        {'op': 'create', 'data': {'title': 'Blog', 'description': 'd', 'order': 5}},
+    ])
+    assert response.status_code == 200, response.json
+    assert response.json['results'] == [
+        {'index': 0, 'op': 'update', 'id': 3},
+        {'index': 1, 'op': 'create', 'id': 4},
+        {'index': 2, 'op': 'delete', 'id': 2},
+        {'index': 3, 'op': 'create', 'id': 5},
+    ]
+    # Strings are HTML-escaped like the single-item routes; updates are partial.
+    assert project_rows(app) == [
+        (1, 'Shop', 1, ['React']),
+        (3, 'Dash', 0, ['Go']),
+        (4, 'Zebra &lt;cli&gt;', 4, ['Go']),
+        (5, 'Blog', 5, None),
+    ]
+
+
+def test_a_bad_item_writes_nothing(make_app):
+    app = seeded_app(make_app)
+    before = project_rows(app)
+    response = bulk(app, [
+        {'op': 'update', 'id': 1, 'data': {'order': 9}},
+        {'op': 'create', 'data': {'description': 'no title'}},
+        {'op': 'delete', 'id': 42},
+        {'op': 'update', 'id': 1, 'data': {'order': 8}},
+        {'op': 'rename', 'id': 2},
+    ])
+    assert response.status_code == 400
+    details = response.json['details']
+    assert [d['index'] for d in details] == [1, 2, 3, 4]
+    assert details[0]['errors'] == {'title': ['Missing data for required field.']}
+    assert details[1]['errors'] == 'Project 42 not found'
+    assert details[2]['errors'] == 'id 1 appears in more than one operation'
+    assert project_rows(app) == before
+
+    for body in ([], {'op': 'delete', 'id': 1}, [{'op': 'delete', 'id': 1}] * 501):
+        assert bulk(app, body).status_code == 400
+    client = app.test_client()
+    assert client.post('/api/projects/bulk', json=[{'op': 'delete', 'id': 1}]).status_code == 401
+    assert project_rows(app) == before
+
+
+def test_search_facets_and_cached_lists_follow_bulk_writes(make_app):
+    app = seeded_app(make_app, RESPONSE_CACHE_ENABLED=True, RESPONSE_CACHE_STORAGE='memory')
+    response_cache.init_app(app)
+    client = app.test_client()
+
+    def titles(query=''):
+        return [p['title'] for p in client.get(f'/api/projects/?{query}').json]
+
+    def found(query):
+        return [r['title'] for r in client.get(f'/api/search/?q={query}&type=project').json['results']]
+
+    # Warm the cached list, the facet index and the search results.
+    assert titles() == ['Shop', 'Model', 'Dash']
+    assert titles('tech=Go') == []
+    assert client.get('/api/projects/facets').json['facets']['tech'] == {'React': 2, 'Python': 1}
+    assert found('dash') == ['<mark>Dash</mark>']
+
+    assert bulk(app, [
+        {'op': 'update', 'id': 3, 'data': {'title': 'Radar', 'tech': ['Go']}},
+        {'op': 'create', 'data': {'title': 'Dashboard', 'description': 'd', 'tech': ['Go'], 'order': 4}},
+        {'op': 'delete', 'id': 1},
+    ]).status_code == 200
+
+    assert titles() == ['Model', 'Radar', 'Dashboard']
+    assert titles('tech=Go') == ['Radar', 'Dashboard']
+    assert client.get('/api/projects/facets').json['facets']['tech'] == {'Go': 2, 'Python': 1}
+    assert found('dash') == ['<mark>Dashboard</mark>']
+    assert found('radar') == ['<mark>Radar</mark>']
+    assert found('shop') == []
+
+
+if __name__ == '__main__':
+    test_mixed_operations_apply_in_one_batch(build_app)
+    test_a_bad_item_writes_nothing(build_app)
+    test_search_facets_and_cached_lists_follow_bulk_writes(build_app)
+    print('ok')
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compression middleware: negotiation, ETag variants and streamed bodies
+"""
+import gzip
+import os
+import tempfile
+
+from flask import Response, request
+
+from conftest import build_app
+from utils.compression import CompressionMiddleware
+from utils.static_files import StaticIndex
+
+BODY = b'{"items":[' + b','.join(b'{"title":"post %d"}' % i for i in range(500)) + b']}'
+
+
+def compressing_app(make_app):
+    app = make_app(create=False, COMPRESSION_ENCODINGS=['gzip'], COMPRESSION_STREAM_MIN_SIZE=64 * 1024)
+
+    @app.route('/list')
+    def listing():
+        response = Response(BODY, mimetype='application/json')
+        response.set_etag('v1')
+        return response.make_conditional(request)
+
+    @app.route('/tiny')
+    def tiny():
+        return Response(b'{}', mimetype='application/json')
+
+    @app.route('/image')
+    def image():
+        return Response(BODY, mimetype='image/png')
+
+    @app.route('/export')
+    def export():
+        return Response((b'{"row":%d}\n' % i for i in range(10000)), mimetype='application/x-ndjson')
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, app.config)
+    return app
+
+
+def test_compresses_allowed_types_above_threshold(make_app):
+    client = compressing_app(make_app).test_client()
+    response = client.get('/list', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == BODY
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert response.headers['ETag'] == '"v1;gzip"'
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    assert 'Content-Encoding' not in client.get('/list').headers
+    assert 'Content-Encoding' not in client.get('/tiny', headers={'Accept-Encoding': 'gzip'}).headers
+    assert 'Content-Encoding' not in client.get('/image', headers={'Accept-Encoding': 'gzip'}).headers
+
+
+def test_compressed_etag_revalidates(make_app):
+    client = compressing_app(make_app).test_client()
+    response = client.get('/list', headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"v1;gzip"'})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == '"v1;gzip"'
+
+    # An ETag of another encoding matches nothing.
+    response = client.get('/list', headers={'If-None-Match': '"v1;gzip"'})
+    assert response.status_code == 200 and response.data == BODY
+    response = client.get('/list', headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"v1"'})
+    assert response.status_code == 304
+
+
+def test_variant_cache_keeps_files_with_equal_etags_apart(make_app):
+    with tempfile.TemporaryDirectory() as root:
+        os.mkdir(os.path.join(root, 'assets'))
+        for name, line in (('a.js', b'console.log("a");\n'), ('b.js', b'console.warn("b");\n')):
+            path = os.path.join(root, 'assets', name)
+            with open(path, 'wb') as f:
+                f.write(line.ljust(25) * 100)
+            os.utime(path, (1700000000, 1700000000))
+        index = StaticIndex(root)
+        index.build()
+        app = compressing_app(make_app)
+        app.add_url_rule('/assets/<name>', 'asset', lambda name: index.serve(f'assets/{name}'))
+        client = app.test_client()
+        a, b = (client.get(f'/assets/{name}', headers={'Accept-Encoding': 'gzip'}) for name in ('a.js', 'b.js'))
+        assert a.headers['ETag'] == b.headers['ETag']
+        assert gzip.decompress(a.data).startswith(b'console.log')
+        assert gzip.decompress(b.data).startswith(b'console.warn')
+
+
+def test_streams_bodies_without_length(make_app):
+    client = compressing_app(make_app).test_client()
+    response = client.get('/export', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data).count(b'\n') == 10000
+
+
+if __name__ == '__main__':
+    test_compresses_allowed_types_above_threshold(build_app)
+    test_compressed_etag_revalidates(build_app)
+    test_variant_cache_keeps_files_with_equal_etags_apart(build_app)
+    test_streams_bodies_without_length(build_app)
+    print('ok')
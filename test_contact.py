@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Contact messages: the admin inbox (filters, unread count, marking read),
+the batched writer, and what it logs when a row fails
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import text
+
+from conftest import admin_headers, build_app
+from models import db, ContactMessage
+from routes.contact import contact_bp
+from utils.contact_queue import ContactQueue, logger as queue_logger
+
+
+def message(**fields):
+    row = {'name': 'Ann', 'email': 'ann@example.com', 'subject': 'Hi', 'message': 'Hello, a question'}
+    row.update(fields)
+    return row
+
+
+def inbox_app(make_app):
+    app = make_app(contact_bp)
+    with app.app_context():
+        for day, is_read in ((1, True), (2, False), (3, False), (4, True)):
+            db.session.add(ContactMessage(**message(subject=f'day {day}'), is_read=is_read,
+                                          created_at=datetime(2024, 1, day)))
+        db.session.commit()
+    return app
+
+
+def test_inbox_filters_counts_and_marks_read(make_app):
+    app = inbox_app(make_app)
+    client = app.test_client()
+    headers = admin_headers(app)
+
+    def subjects(query=''):
+        response = client.get(f'/api/contact/admin/messages?{query}', headers=headers)
+        assert response.status_code == 200, response.json
+        return [m['subject'] for m in response.json['items']]
+
+    def unread():
+        return client.get('/api/contact/admin/messages/unread-count', headers=headers).json['unread']
+
+    assert subjects() == ['day 4', 'day 3', 'day 2', 'day 1']
+    assert subjects('is_read=false') == ['day 3', 'day 2']
+    assert subjects('is_read=true&since=2024-01-02') == ['day 4']
+    assert subjects('since=2024-01-02&until=2024-01-04') == ['day 3', 'day 2']
+    items = client.get('/api/contact/admin/messages?fields=subject', headers=headers).json['items']
+    assert items[0] == {'subject': 'day 4'}
+    for bad in ('is_read=maybe', 'since=yesterday', 'limit=0', 'fields=password'):
+        assert client.get(f'/api/contact/admin/messages?{bad}', headers=headers).status_code == 400, bad
+    assert client.get('/api/contact/admin/messages').status_code == 401
+
+    assert unread() == 2
+    assert client.put('/api/contact/admin/messages/2/mark-read', headers=headers).status_code == 200
+    assert unread() == 1 and subjects('is_read=false') == ['day 3']
+    assert client.put('/api/contact/admin/messages/99/mark-read', headers=headers).status_code == 404
+    assert client.delete('/api/contact/admin/messages/99', headers=headers).status_code == 404
+    assert client.put('/api/contact/admin/messages/mark-all-read', headers=headers).status_code == 200
+    assert unread() == 0 and subjects('is_read=false') == []
+    assert client.delete('/api/contact/admin/messages/1', headers=headers).status_code == 200
+    assert subjects() == ['day 4', 'day 3', 'day 2']
+
+
+def test_submitted_messages_start_unread(make_app):
+    app = make_app(contact_bp)
+    client = app.test_client()
+    response = client.post('/api/contact/', json=message(phone='123'))
+    assert response.status_code == 202, response.json
+    headers = admin_headers(app)
+    assert client.get('/api/contact/admin/messages/unread-count', headers=headers).json == {'unread': 1}
+    [item] = client.get('/api/contact/admin/messages', headers=headers).json['items']
+    assert item['is_read'] is False and item['email'] == 'ann@example.com'
+
+
+def test_unread_count_reads_only_the_index(make_app):
+    app = make_app(contact_bp)
+    with app.app_context():
+        sql = str(ContactMessage.query.filter_by(is_read=False).with_entities(db.func.count())
+                  .statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        plan = ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')))
+    assert 'COVERING INDEX ix_contact_messages_read_created' in plan, plan
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_failed_rows_are_dropped_without_personal_data_in_the_log(make_app):
+    app = make_app(contact_bp)
+    handler = ListHandler()
+    queue_logger.addHandler(handler)
+    try:
+        with app.app_context():
+            ContactQueue()._write([message(), message(email='bob@example.com', name=None), message()])
+            assert ContactMessage.query.count() == 2
+    finally:
+        queue_logger.removeHandler(handler)
+    logged = [handler.format(r) for r in handler.records]
+    assert logged[1:] == ['Dropped contact message 2 of 3 in the batch '
+                          '(IntegrityError: NOT NULL constraint failed: contact_messages.name)']
+    assert not any('bob@example.com' in line for line in logged)
+
+
+if __name__ == '__main__':
+    test_inbox_filters_counts_and_marks_read(build_app)
+    test_submitted_messages_start_unread(build_app)
+    test_unread_count_reads_only_the_index(build_app)
+    test_failed_rows_are_dropped_without_personal_data_in_the_log(build_app)
+    print('ok')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+JWT verification: claims decoded once per request and cached across
+requests, without letting bad, expired or under-privileged tokens through
+"""
+import time
+
+import jwt
+from flask import jsonify
+
+from conftest import admin_headers, build_app
+from utils import jwt_auth
+from utils.jwt_auth import (TokenCache, admin_required, get_current_user, get_current_user_admin_status,
+                            get_current_user_id, token_cache)
+
+
+def auth_app(make_app):
+    app = make_app(create=False)
+
+    @app.route('/whoami')
+    @admin_required
+    def whoami():
+        # Every helper reads the same per-request claims.
+        return jsonify(user_id=get_current_user_id(), admin=get_current_user_admin_status(),
+                       user=get_current_user().id)
+
+    return app
+
+
+class CountingDecode:
+    def __enter__(self):
+        self.calls, self._decode = 0, jwt.decode
+
+        def decode(*args, **kwargs):
+            self.calls += 1
+            return self._decode(*args, **kwargs)
+
+        jwt.decode = decode
+        return self
+
+    def __exit__(self, *exc):
+        jwt.decode = self._decode
+
+
+def token(claims):
+    return jwt.encode(claims, jwt_auth.JWT_SECRET, algorithm=jwt_auth.JWT_ALGO)
+
+
+def test_token_is_verified_once_and_then_cached(make_app):
+    token_cache._entries.clear()
+    app = auth_app(make_app)
+    client = app.test_client()
+    headers = admin_headers(app, user_id=7)
+    with CountingDecode() as decode:
+        assert client.get('/whoami', headers=headers).json == {'user_id': 7, 'admin': True, 'user': 7}
+        assert decode.calls == 1
+        assert client.get('/whoami', headers=headers).status_code == 200
+        assert decode.calls == 1
+
+
+def test_bad_tokens_are_rejected(make_app):
+    token_cache._entries.clear()
+    app = auth_app(make_app)
+    client = app.test_client()
+    good = admin_headers(app)['Authorization']
+    assert client.get('/whoami').status_code == 401
+    assert client.get('/whoami', headers={'Authorization': good[:-2] + 'xx'}).status_code == 401
+    forged = jwt.encode({'sub': 'x', 'is_admin': True, 'exp': time.time() + 60}, 'guess', algorithm='HS256')
+    assert client.get('/whoami', headers={'Authorization': f'Bearer {forged}'}).status_code == 401
+    user = token({'sub': 'u', 'user_id': 2, 'is_admin': False, 'exp': time.time() + 60})
+    assert client.get('/whoami', headers={'Authorization': f'Bearer {user}'}).status_code == 403
+    # Only verified tokens are cached.
+    assert len(token_cache._entries) == 1
+
+
+def test_cached_token_still_expires(make_app):
+    token_cache._entries.clear()
+    app = auth_app(make_app)
+    admin_headers(app)  # sets the signing secret
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {token({'sub': 'a', 'is_admin': True, 'exp': int(time.time()) + 1})}"}
+    assert client.get('/whoami', headers=headers).status_code == 200
+    time.sleep(1.1)
+    assert client.get('/whoami', headers=headers).status_code == 401
+
+
+def test_token_cache_is_a_bounded_lru():
+    cache = TokenCache(max_entries=2)
+    far = time.time() + 60
+    cache.set('a', {'exp': far})
+    cache.set('b', {'exp': far})
+    assert cache.get('a') is not None  # now most recently used
+    cache.set('c', {'exp': far})
+    assert cache.get('b') is None and cache.get('a') and cache.get('c')
+    cache.set('old', {'exp': time.time() - 1})
+    assert cache.get('old') is None
+
+
+if __name__ == '__main__':
+    test_token_is_verified_once_and_then_cached(build_app)
+    test_bad_tokens_are_rejected(build_app)
+    test_cached_token_still_expires(build_app)
+    test_token_cache_is_a_bounded_lru()
+    print('ok')
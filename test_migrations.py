@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Schema upgrades and the visibility indexes: columns added after release are
+ALTERed into existing databases, and the public lists use their indexes
+"""
+import os
+import sqlite3
+import tempfile
+
+from sqlalchemy import text
+
+from conftest import admin_headers, build_app
+from models import db, Blog
+from routes.blogs import blogs_bp
+from utils.migrations import ADDED_COLUMNS, upgrade_schema
+
+
+def downgrade(path):
+    """Turn a current database back into one from before ADDED_COLUMNS."""
+    conn = sqlite3.connect(path)
+    with conn:
+        indexes = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall()
+        for (name,) in indexes:
+            conn.execute(f'DROP INDEX {name}')
+        for table, column in ADDED_COLUMNS:
+            conn.execute(f'ALTER TABLE {table} DROP COLUMN {column}')
+        conn.execute("INSERT INTO blogs (title, content, date) VALUES ('old post', 'c', '2020-01-01 00:00:00')")
+    conn.close()
+
+
+def test_upgrade_adds_columns_and_indexes_to_old_databases(make_app):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'portfolio.db')
+        app = make_app(blogs_bp, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}')
+        with app.app_context():
+            db.engine.dispose()
+        downgrade(path)
+
+        with app.app_context():
+            upgrade_schema()
+            upgrade_schema()  # runs on every startup
+            indexes = {row[0] for row in db.session.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"))}
+            assert {'ix_blogs_visible_date', 'ix_blogs_date', 'ix_projects_visible_order',
+                    'ix_contact_messages_read_created'} <= indexes
+            # Rows from before the column are visible.
+            assert db.session.execute(text('SELECT is_visible FROM blogs')).scalar() == 1
+
+        client = app.test_client()
+        response = client.post('/api/blogs/', headers=admin_headers(app),
+                               json={'title': 'draft', 'content': 'c', 'is_visible': False})
+        assert response.status_code == 201, response.json
+        draft_id = response.json['id']
+        assert [b['title'] for b in client.get('/api/blogs/').json] == ['old post']
+        assert client.get(f'/api/blogs/{draft_id}').status_code == 404
+        assert client.get('/api/blogs/1').json['title'] == 'old post'
+
+
+def test_public_blog_list_reads_the_visibility_index(make_app):
+    app = make_app(blogs_bp)
+    with app.app_context():
+        query = (db.select(Blog.id).where(Blog.is_visible.is_(True))
+                 .order_by(Blog.date.desc().nulls_last(), Blog.id.desc()))
+        sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        plan = ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')))
+    assert 'ix_blogs_visible_date' in plan and 'TEMP B-TREE' not in plan, plan
+
+
+if __name__ == '__main__':
+    test_upgrade_adds_columns_and_indexes_to_old_databases(build_app)
+    test_public_blog_list_reads_the_visibility_index(build_app)
+    print('ok')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Keyset pagination of blogs and contact messages: newest first with NULL
+dates last, ties broken by id, and malformed or altered cursors rejected
+"""
+import base64
+from datetime import datetime
+
+from sqlalchemy import update
+
+from conftest import admin_headers, build_app
+from models import db, Blog, ContactMessage
+from routes.blogs import blogs_bp
+from routes.contact import contact_bp
+from utils.pagination import encode_cursor
+
+NOON = datetime(2024, 3, 1, 12, 0)
+DATES = [NOON, None, datetime(2024, 1, 1), NOON, None, datetime(2024, 5, 1), NOON]
+# Date descending with NULLs last, then id descending.
+EXPECTED = [6, 7, 4, 1, 3, 5, 2]
+
+
+def seeded_app(make_app):
+    app = make_app(blogs_bp, contact_bp)
+    with app.app_context():
+        for i, when in enumerate(DATES, 1):
+            db.session.add(Blog(title=f'b{i}', content='c', date=when))
+            db.session.add(ContactMessage(name='n', email=f'{i}@example.com', subject='s',
+                                          message='m', created_at=when))
+        db.session.flush()
+        # An explicit None still gets the column default on insert.
+        undated = [i for i, when in enumerate(DATES, 1) if when is None]
+        db.session.execute(update(Blog).where(Blog.id.in_(undated)).values(date=None))
+        db.session.execute(update(ContactMessage).where(ContactMessage.id.in_(undated))
+                           .values(created_at=None))
+        db.session.commit()
+    return app
+
+
+def walk(client, url, limit, headers=None):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = f'limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(f'{url}?{query}', headers=headers)
+        assert response.status_code == 200, response.json
+        page = response.json
+        assert len(page['items']) <= limit
+        ids += [item['id'] for item in page['items']]
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids, pages
+
+
+def test_pages_order_nulls_last_and_break_ties_on_id(make_app):
+    app = seeded_app(make_app)
+    client = app.test_client()
+    headers = admin_headers(app)
+    for limit in (1, 2, 3, 7, 100):
+        assert walk(client, '/api/blogs/', limit) == (EXPECTED, -(-len(EXPECTED) // limit)), limit
+        assert walk(client, '/api/contact/admin/messages', limit, headers)[0] == EXPECTED, limit
+    # The unpaginated list uses the same order.
+    assert [b['id'] for b in client.get('/api/blogs/').json] == EXPECTED
+
+
+def test_cursors_start_after_their_row(make_app):
+    client = seeded_app(make_app).test_client()
+
+    def after(sort_value, row_id):
+        page = client.get(f'/api/blogs/?limit=100&cursor={encode_cursor(sort_value, row_id)}').json
+        return [b['id'] for b in page['items']]
+
+    assert after(NOON, 4) == [1, 3, 5, 2]  # the tie below id 4, then older and NULL dates
+    assert after(None, 5) == [2]  # within the NULL dates
+    assert after(datetime(2024, 2, 1), 0) == [3, 5, 2]  # a date no row has
+
+
+def test_malformed_or_altered_cursors_are_rejected(make_app):
+    app = seeded_app(make_app)
+    client = app.test_client()
+    headers = admin_headers(app)
+
+    def encoded(raw):
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    bad = [
+        'not-base64!',
+        encoded('not json'),
+        encoded('{"date": null, "id": 3}'),
+        encoded('[null]'),
+        encoded('[null, 3, 4]'),
+        encoded('["yesterday", 3]'),
+        encoded('[20240101, 3]'),
+        encoded('[null, "3"]'),
+        encoded('[null, true]'),
+        encoded('[null, 3.5]'),
+        encoded('[' * 5000 + ']' * 5000),
+    ]
+    for cursor in bad:
+        for url, request_headers in (('/api/blogs/', None), ('/api/contact/admin/messages', headers)):
+            response = client.get(f'{url}?limit=2&cursor={cursor}', headers=request_headers)
+            assert response.status_code == 400, (url, cursor[:20])
+            assert response.json == {'error': 'Invalid cursor'}
+
+
+if __name__ == '__main__':
+    test_pages_order_nulls_last_and_break_ties_on_id(build_app)
+    test_cursors_start_after_their_row(build_app)
+    test_malformed_or_altered_cursors_are_rejected(build_app)
+    print('ok')
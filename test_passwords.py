@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Password hashing pool: results from the workers, back-pressure, recovery
+from a dead worker, and the 503 the auth routes return when it is busy
+"""
+import time
+
+import pytest
+
+from conftest import build_app
+from models import db, User
+from routes.auth import auth_bp
+from utils.passwords import HashingBusy, PasswordHasher, password_hasher
+
+METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(method=METHOD, workers=1, max_pending=2, timeout=10)
+    hasher.start()
+    yield hasher
+    hasher._executor.shutdown(cancel_futures=True)
+
+
+def test_start_runs_workers_and_prefix(hasher):
+    # The prefix is derived at startup, not on the first request that needs it.
+    assert hasher._prefix == 'pbkdf2:sha256:1000'
+    assert len(hasher._executor._processes) == 1
+    password_hash = hasher.hash('secret')
+    assert hasher.verify(password_hash, 'secret') and not hasher.verify(password_hash, 'nope')
+    assert not hasher.needs_rehash(password_hash)
+    assert hasher.needs_rehash('scrypt:32768:8:1$salt$hash')
+
+
+def test_full_pool_is_busy(hasher):
+    for _ in range(hasher.max_pending):
+        hasher._slots.acquire()
+    with pytest.raises(HashingBusy):
+        hasher.hash('secret')
+
+
+def test_dead_worker_pool_is_replaced(hasher):
+    broken = hasher._executor
+    for process in list(broken._processes.values()):
+        process.kill()
+        process.join()
+    time.sleep(0.2)  # let the pool notice
+    with pytest.raises(HashingBusy):
+        hasher.hash('secret')
+    assert hasher._executor is None
+    assert hasher.verify(hasher.hash('secret'), 'secret')
+    assert hasher._executor is not broken
+
+
+def test_login_returns_503_while_busy(make_app):
+    app = make_app(auth_bp, RATE_LIMIT_ENABLED=False)
+    with app.app_context():
+        user = User(username='admin', email='admin@example.com')
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+    client = app.test_client()
+    slots = password_hasher._slots
+    for _ in range(password_hasher.max_pending):
+        slots.acquire()
+    workers, password_hasher.workers = password_hasher.workers, 1
+    try:
+        response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'secret'})
+    finally:
+        password_hasher.workers = workers
+        for _ in range(password_hasher.max_pending):
+            slots.release()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'secret'})
+    assert response.status_code == 200
+
+
+if __name__ == '__main__':
+    for test in (test_start_runs_workers_and_prefix, test_full_pool_is_busy,
+                 test_dead_worker_pool_is_replaced):
+        hasher = PasswordHasher(method=METHOD, workers=1, max_pending=2, timeout=10)
+        hasher.start()
+        test(hasher)
+    test_login_returns_503_while_busy(build_app)
+    print('ok')
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Aggregated /api/portfolio document: sections, visibility, `include`, the
+cached payload, and blog summaries without their content
+"""
+from datetime import date, datetime
+
+from conftest import build_app
+from models import db, About, Author, Blog, Certification, Experience, Project, Tag, TechnicalSkill
+from routes.portfolio import SECTIONS, portfolio_bp
+from utils.cache import response_cache
+
+
+def seeded_app(make_app, **config):
+    app = make_app(portfolio_bp, **config)
+    with app.app_context():
+        db.session.add(About(name='Me', headline='Dev', bio='Hi'))
+        db.session.add_all([
+            Experience(title='Dev', company='A', start_date=date(2020, 1, 1), order=1),
+            Experience(title='Lead', company='B', start_date=date(2022, 1, 1), order=2),
+            Experience(title='Intern', company='C', is_visible=False, order=3),
+            TechnicalSkill(title='Backend', skills=['Flask'], order=2),
+            TechnicalSkill(title='Frontend', skills=['React'], order=1),
+            TechnicalSkill(title='Old', is_visible=False),
+            Certification(name='Cloud', issuer='X'),
+        ])
+        db.session.add_all([
+            Project(title='site', description='d', order=1),
+            Project(title='hidden', description='d', is_visible=False, order=2),
+        ])
+        db.session.add_all([
+            Blog(title='new', content='long body', date=datetime(2024, 2, 1),
+                 author=Author(name='me'), tags=[Tag(name='flask')]),
+            Blog(title='old', content='long body', date=datetime(2024, 1, 1)),
+            Blog(title='draft', content='long body', is_visible=False),
+        ])
+        db.session.commit()
+    return app
+
+
+def test_blog_summaries_leave_out_content(make_app):
+    body = seeded_app(make_app).test_client().get('/api/portfolio/').json
+    blogs = body['blogs']
+    assert [b['title'] for b in blogs] == ['new', 'old']
+    assert all('content' not in b for b in blogs)
+    assert blogs[0]['author']['name'] == 'me' and blogs[0]['tags'] == [{'id': 1, 'name': 'flask'}]
+
+
+def test_sections_in_one_document(make_app):
+    client = seeded_app(make_app).test_client()
+    body = client.get('/api/portfolio/').json
+    assert list(body) == list(SECTIONS)
+    assert body['about']['name'] == 'Me'
+    # Each section is public rows in its list endpoint's order.
+    assert [p['title'] for p in body['projects']] == ['site']
+    assert [e['title'] for e in body['experiences']] == ['Lead', 'Dev']
+    assert [s['title'] for s in body['technical_skills']] == ['Frontend', 'Backend']
+    assert [c['name'] for c in body['certifications']] == ['Cloud']
+
+    body = client.get('/api/portfolio/?include=about,technical-skills').json
+    assert list(body) == ['about', 'technical_skills']
+    response = client.get('/api/portfolio/?include=about,secrets')
+    assert response.status_code == 400 and response.json == {'error': 'Unknown sections: secrets'}
+
+
+def test_cached_document_follows_writes(make_app):
+    app = seeded_app(make_app, RESPONSE_CACHE_ENABLED=True, RESPONSE_CACHE_STORAGE='memory')
+    response_cache.init_app(app)
+    client = app.test_client()
+    first = client.get('/api/portfolio/?include=projects')
+    revalidated = client.get('/api/portfolio/?include=projects',
+                             headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    with app.app_context():
+        db.session.get(Project, 2).is_visible = True
+        db.session.commit()
+    second = client.get('/api/portfolio/?include=projects',
+                        headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert [p['title'] for p in second.json['projects']] == ['site', 'hidden']
+
+
+if __name__ == '__main__':
+    test_blog_summaries_leave_out_content(build_app)
+    test_sections_in_one_document(build_app)
+    test_cached_document_follows_writes(build_app)
+    print('ok')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL profile: JSONB columns with GIN indexes, pool settings, and the
+project technology filter.
+
+The DDL and SQL checks compile against the PostgreSQL dialect and need no
+server. Set TEST_DATABASE_URL (e.g. postgresql://postgres@localhost/portfolio_test
+on a throwaway local instance) to also run the live check; it creates and
+drops the tables in that database, and is skipped otherwise.
+"""
+import os
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from conftest import admin_headers, build_app
+from config import Config
+from models import db, json_list_contains, Project, Experience
+from routes.projects import projects_bp
+from utils.database import configure_database
+
+POSTGRES_URI = 'postgresql+psycopg2://u:p@localhost/db'
+
+
+def admin_titles(app, query):
+    response = app.test_client().get(f'/api/projects/admin?{query}', headers=admin_headers(app))
+    assert response.status_code == 200
+    return sorted(p['title'] for p in response.json)
+
+
+def seed(app):
+    with app.app_context():
+        db.session.add_all([
+            Project(title='api', description='d', tech=['Flask', 'PostgreSQL'], order=1),
+            Project(title='site', description='d', tech=['React'], order=2),
+            Project(title='hidden', description='d', tech=['Flask'], is_visible=False, order=3),
+            Project(title='none', description='d', tech=None, order=4),
+        ])
+        db.session.commit()
+
+
+def test_postgres_ddl_uses_jsonb_and_gin(make_app):
+    dialect = postgresql.dialect()
+    ddl = str(CreateTable(Project.__table__).compile(dialect=dialect))
+    assert 'tech JSONB' in ddl and 'categories JSONB' in ddl
+    indexes = {i.name: str(CreateIndex(i).compile(dialect=dialect)) for i in Experience.__table__.indexes}
+    assert 'USING gin (technologies jsonb_path_ops)' in indexes['ix_experiences_technologies']
+    # The filter the admin project list builds, bound to a PostgreSQL engine
+    # (created without connecting).
+    with make_app(projects_bp, create=False, SQLALCHEMY_DATABASE_URI=POSTGRES_URI).app_context():
+        sql = str(json_list_contains(Project.tech, 'Flask').compile(dialect=dialect))
+    assert 'tech @>' in sql
+
+
+def test_postgres_engine_options_come_from_config():
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(SQLALCHEMY_DATABASE_URI=POSTGRES_URI,
+                      DB_POOL_SIZE=7, DB_POOL_RECYCLE=600)
+    configure_database(app)
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert options['pool_size'] == 7
+    assert options['pool_recycle'] == 600
+    assert options['pool_pre_ping'] is True
+    assert 'SQLALCHEMY_BINDS' not in app.config
+
+
+def test_tech_filter(make_app):
+    app = make_app(projects_bp)
+    seed(app)
+    # Hidden projects are listed (and filtered in the database) for admins only.
+    assert admin_titles(app, 'tech=Flask') == ['api', 'hidden']
+    assert admin_titles(app, 'tech=React&tech=PostgreSQL') == ['api', 'site']
+    assert admin_titles(app, 'tech=Go') == []
+    client = app.test_client()
+    assert [p['title'] for p in client.get('/api/projects/?tech=Flask').json] == ['api']
+
+
+def test_tech_filter_uses_gin_index_on_live_postgres(make_app):
+    url = os.environ.get('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    app = make_app(projects_bp, SQLALCHEMY_DATABASE_URI=url)
+    seed(app)
+    try:
+        assert admin_titles(app, 'tech=Flask') == ['api', 'hidden']
+        with app.app_context():
+            # The table is tiny, so make the planner show whether it can use the index at all.
+            db.session.execute(text('SET LOCAL enable_seqscan = off'))
+            plan = db.session.execute(text(
+                "EXPLAIN SELECT id FROM projects WHERE tech @> '[\"Flask\"]'")).scalars().all()
+            assert any('ix_projects_tech' in line for line in plan), plan
+            db.session.rollback()
+    finally:
+        with app.app_context():
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    test_postgres_ddl_uses_jsonb_and_gin(build_app)
+    test_postgres_engine_options_come_from_config()
+    test_tech_filter(build_app)
+    try:
+        test_tech_filter_uses_gin_index_on_live_postgres(build_app)
+    except pytest.skip.Exception as e:
+        print(f'skipped live check: {e}')
+    print('ok')
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Project facet index: filters and counts follow committed project writes
+"""
+import os
+import tempfile
+from datetime import date
+
+from conftest import build_app
+from models import db, Project
+from routes.projects import projects_bp
+from utils.cache import MemoryVersions, get_version, response_cache
+from utils.facets import project_facets
+
+
+def seeded_app(make_app):
+    app = make_app(projects_bp)
+    with app.app_context():
+        db.session.add_all([
+            Project(title='shop', description='d', tech=['React', 'Flask'], categories=['Web'],
+                    project_type='Client', start_date=date(2023, 5, 1), order=1),
+            Project(title='model', description='d', tech=['Python'], categories=['ML'],
+                    project_type='Personal', start_date=date(2021, 1, 1), order=2),
+            Project(title='dash', description='d', tech=['React'], categories=['ML', 'Web'],
+                    project_type='Client', start_date=date(2022, 3, 1), order=3),
+            Project(title='draft', description='d', tech=['React'], is_visible=False, order=4),
+        ])
+        db.session.commit()
+    return app
+
+
+def titles(client, query):
+    return [p['title'] for p in client.get(f'/api/projects/?{query}').json]
+
+
+def test_facet_filters_and_counts(make_app):
+    app = seeded_app(make_app)
+    client = app.test_client()
+    assert titles(client, 'tech=React') == ['shop', 'dash']
+    assert titles(client, 'tech=React&category=ML&type=Client&from=2022') == ['dash']
+    assert titles(client, 'tech=Python&tech=Flask') == ['shop', 'model']
+    assert titles(client, 'to=2021') == ['model']
+    assert client.get('/api/projects/?from=soon').status_code == 400
+
+    body = client.get('/api/projects/facets?tech=React').json
+    assert body['total'] == 2
+    # The tech facet ignores its own filter; the others apply it.
+    assert body['facets']['tech'] == {'React': 2, 'Flask': 1, 'Python': 1}
+    assert body['facets']['category'] == {'Web': 2, 'ML': 1}
+    assert body['facets']['year'] == {'2022': 1, '2023': 1}
+
+
+def test_facet_index_follows_commits(make_app):
+    app = seeded_app(make_app)
+    client = app.test_client()
+    assert titles(client, 'tech=Go') == []
+    with app.app_context():
+        db.session.add(Project(title='cli', description='d', tech=['Go'], order=5))
+        db.session.get(Project, 2).tech = ['Go']
+        draft = db.session.get(Project, 4)
+        draft.is_visible = True
+        db.session.delete(db.session.get(Project, 1))
+        db.session.commit()
+    assert titles(client, 'tech=Go') == ['model', 'cli']
+    assert titles(client, 'tech=React') == ['dash', 'draft']
+    assert client.get('/api/projects/facets').json['facets']['tech'] == {'Go': 2, 'React': 2}
+
+
+def test_facet_index_matches_list_visibility(make_app):
+    app = seeded_app(make_app)
+    client = app.test_client()
+    with app.app_context():
+        # NULL visibility is not listed; a huge id still gets a low bit position.
+        db.session.add(Project(id=10 ** 6, title='big', description='d', tech=['Rust'], order=6))
+        db.session.add(Project(title='unset', description='d', tech=['Rust'], order=7))
+        db.session.commit()
+        db.session.execute(db.update(Project).where(Project.title == 'unset').values(is_visible=None))
+        db.session.commit()
+    assert titles(client, 'tech=Rust') == ['big']
+    assert project_facets._all.bit_length() == 4
+    assert client.get('/api/projects/facets').json['total'] == 4
+
+
+def test_facet_index_sees_writes_from_other_workers(make_app):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Two workers on one database, sharing table versions through SQLite.
+        config = dict(SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp, 'portfolio.db')}",
+                      RESPONSE_CACHE_STORAGE=f"sqlite:///{os.path.join(tmp, 'cache.db')}")
+        worker, other = make_app(projects_bp, **config), make_app(projects_bp, **config)
+        response_cache.init_app(worker)
+        try:
+            client = worker.test_client()
+            assert titles(client, 'tech=Go') == []
+            with other.app_context():
+                db.session.add(Project(title='cli', description='d', tech=['Go']))
+                db.session.commit()
+            assert titles(client, 'tech=Go') == ['cli']
+
+            # The worker's own writes are applied in place, without a rebuild.
+            with worker.app_context():
+                db.session.add(Project(title='api', description='d', tech=['Go']))
+                db.session.commit()
+            assert project_facets._version == get_version('projects')
+            assert titles(client, 'tech=Go') == ['cli', 'api']
+        finally:
+            response_cache.versions = MemoryVersions()
+
+
+if __name__ == '__main__':
+    test_facet_filters_and_counts(build_app)
+    test_facet_index_follows_commits(build_app)
+    test_facet_index_matches_list_visibility(build_app)
+    test_facet_index_sees_writes_from_other_workers(build_app)
+    print('ok')
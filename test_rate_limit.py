@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Rate limiting: 429 with Retry-After, failed logins counted per address and
+account, client addresses behind ProxyFix, and pruning of refilled buckets
+"""
+import os
+import sqlite3
+import tempfile
+
+import pytest
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from conftest import build_app
+from models import db, User
+from routes.auth import auth_bp
+from utils.rate_limit import SQLiteBackend, limiter
+
+LIMITS = {'login': '3/minute', 'login_failures': '2/hour'}
+
+
+@pytest.fixture(autouse=True)
+def reset_limiter():
+    yield
+    limiter.backend, limiter.policies = None, {}
+
+
+def limited_app(make_app, limits=LIMITS):
+    app = make_app(auth_bp, RATE_LIMIT_STORAGE='memory', RATE_LIMITS=limits)
+    limiter.init_app(app)
+    with app.app_context():
+        user = User(username='admin', email='admin@example.com')
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def login(client, password, addr='10.0.0.1', **kwargs):
+    return client.post('/api/auth/login', json={'username': 'admin', 'password': password},
+                       environ_base={'REMOTE_ADDR': addr}, **kwargs)
+
+
+def test_over_the_limit_is_429_with_retry_after(make_app):
+    client = limited_app(make_app).test_client()
+    assert [login(client, 'secret').status_code for _ in range(3)] == [200] * 3
+    response = login(client, 'secret')
+    assert response.status_code == 429
+    assert response.json == {'error': 'Too many requests, please slow down'}
+    assert response.headers['Retry-After'] == '20'  # one of 3 tokens a minute
+    # Another address has its own bucket.
+    assert login(client, 'secret', addr='10.0.0.2').status_code == 200
+
+
+def test_failed_logins_do_not_lock_the_account_out_elsewhere(make_app):
+    client = limited_app(make_app).test_client()
+    assert [login(client, 'wrong').status_code for _ in range(2)] == [401] * 2
+    # The failure bucket for this address and account is empty; the
+    # right password from here is refused too, until it refills.
+    response = login(client, 'secret')
+    assert response.status_code == 429 and response.headers['Retry-After'] == '1800'
+    # The account owner elsewhere is unaffected.
+    assert login(client, 'secret', addr='10.0.0.2').status_code == 200
+
+
+def test_successful_logins_are_not_failures(make_app):
+    app = limited_app(make_app, {'login': '10/minute', 'login_failures': '1/hour'})
+    client = app.test_client()
+    assert [login(client, 'secret').status_code for _ in range(3)] == [200] * 3
+    assert login(client, 'wrong').status_code == 401
+    assert login(client, 'secret').status_code == 429
+
+
+def test_forwarded_addresses_need_proxy_fix(make_app):
+    app = limited_app(make_app)
+    client = app.test_client()
+
+    def from_client(addr):
+        return login(client, 'secret', addr='127.0.0.1', headers={'X-Forwarded-For': addr}).status_code
+
+    # Without ProxyFix the header is ignored: every client is the proxy.
+    assert [from_client(f'203.0.113.{i}') for i in range(4)] == [200, 200, 200, 429]
+    limiter.init_app(app)
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1)  # as app.py does with PROXY_FIX_X_FOR=1
+    assert [from_client('203.0.113.1') for _ in range(4)] == [200, 200, 200, 429]
+    assert from_client('203.0.113.2') == 200
+
+
+def test_sqlite_backend_prunes_refilled_buckets():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'limits.db')
+        backend = SQLiteBackend(path, prune_interval=60)
+        capacity, rate = 2, 2 / 60
+        assert backend.consume('a', capacity, rate, now=1000) == (True, 0)
+        assert backend.consume('b', capacity, rate, now=1000) == (True, 0)
+        assert backend.consume('b', capacity, rate, now=1000) == (True, 0)
+        allowed, retry_after = backend.consume('b', capacity, rate, now=1000)
+        assert not allowed and retry_after == pytest.approx(30)
+        # A check without cost writes nothing.
+        assert backend.consume('c', capacity, rate, cost=0, now=1000) == (True, 0)
+
+        def keys():
+            with sqlite3.connect(path) as conn:
+                return {key for key, in conn.execute('SELECT key FROM rate_limit_buckets')}
+
+        assert keys() == {'a', 'b'}
+        # 'a' is full again after 30s, 'b' after 60s; pruning runs once a minute.
+        backend.consume('d', capacity, rate, now=1045)
+        assert keys() == {'a', 'b', 'd'}
+        backend.consume('e', capacity, rate, now=1059)
+        assert keys() == {'a', 'b', 'd', 'e'}
+        backend.consume('e', capacity, rate, now=1060)
+        assert keys() == {'d', 'e'}
+        # A pruned bucket starts full again.
+        assert backend.consume('b', capacity, rate, now=1060) == (True, 0)
+        assert backend.consume('b', capacity, rate, now=1060) == (True, 0)
+
+
+if __name__ == '__main__':
+    for test in (test_over_the_limit_is_429_with_retry_after,
+                 test_failed_logins_do_not_lock_the_account_out_elsewhere,
+                 test_successful_logins_are_not_failures, test_forwarded_addresses_need_proxy_fix):
+        test(build_app)
+        limiter.backend, limiter.policies = None, {}
+    test_sqlite_backend_prunes_refilled_buckets()
+    print('ok')
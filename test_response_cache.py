@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Response cache versions: shared between worker processes, and a fresh
+Last-Modified for every write, even within the same second
+"""
+import os
+import tempfile
+
+from conftest import build_app
+from models import db, Project
+from routes.projects import projects_bp
+from utils.cache import MemoryVersions, SQLiteVersions, response_cache
+
+
+def test_sqlite_versions_are_shared_between_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.db')
+        writer, reader = SQLiteVersions(path), SQLiteVersions(path)
+        assert reader.get(('projects',))[0] == (0,)
+        writer.bump(('projects',))
+        assert reader.get(('projects', 'blogs'))[0] == (1, 0)
+
+
+def test_same_second_writes_get_distinct_last_modified():
+    for versions in (MemoryVersions(), SQLiteVersions(':memory:')):
+        versions.bump(('projects',), now=1000.2)
+        first = versions.get(('projects',))[1]
+        versions.bump(('projects',), now=1000.7)
+        assert versions.get(('projects',))[1] > first
+
+
+def test_if_modified_since_sees_same_second_write(make_app):
+    app = make_app(projects_bp, RESPONSE_CACHE_ENABLED=True, RESPONSE_CACHE_STORAGE='memory')
+    response_cache.init_app(app)
+    client = app.test_client()
+    with app.app_context():
+        db.session.add(Project(title='one', description='d'))
+        db.session.commit()
+        first = client.get('/api/projects/')
+        db.session.add(Project(title='two', description='d'))
+        db.session.commit()
+    second = client.get('/api/projects/', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert second.status_code == 200
+    assert len(second.json) == 2
+
+
+if __name__ == '__main__':
+    test_sqlite_versions_are_shared_between_workers()
+    test_same_second_writes_get_distinct_last_modified()
+    test_if_modified_since_sees_same_second_write(build_app)
+    print('ok')
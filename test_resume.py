@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Resume download: byte ranges (206, 416, suffix, open-ended, multi-range),
+If-Range, and a file replaced while a response is streaming from its map
+"""
+import os
+import tempfile
+
+from conftest import build_app
+from routes.resume import CHUNK_SIZE, resume_bp
+
+CONTENT = bytes(range(256)) * (CHUNK_SIZE // 256 * 2 + 3)  # a bit over two chunks
+
+
+def resume_app(make_app, directory, content=CONTENT):
+    path = os.path.join(directory, 'resume.pdf')
+    with open(path, 'wb') as f:
+        f.write(content)
+    return make_app(resume_bp, create=False, RESUME_PATH=path), path
+
+
+def test_full_and_single_ranges(make_app):
+    size = len(CONTENT)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = resume_app(make_app, tmp)[0].test_client()
+        response = client.get('/api/resume/')
+        assert response.status_code == 200 and response.data == CONTENT
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        assert response.content_length == size
+
+        for header, start, stop in [
+            ('bytes=10-19', 10, 20),
+            (f'bytes={CHUNK_SIZE - 5}-{CHUNK_SIZE + 4}', CHUNK_SIZE - 5, CHUNK_SIZE + 5),  # across chunks
+            ('bytes=-100', size - 100, size),  # suffix
+            (f'bytes={size - 7}-', size - 7, size),  # open-ended
+            (f'bytes=5-{size + 100}', 5, size),  # clamped to the end
+        ]:
+            response = client.get('/api/resume/', headers={'Range': header})
+            assert response.status_code == 206, header
+            assert response.data == CONTENT[start:stop], header
+            assert response.headers['Content-Range'] == f'bytes {start}-{stop - 1}/{size}'
+            assert response.content_length == stop - start
+
+
+def test_unsatisfiable_and_multiple_ranges(make_app):
+    size = len(CONTENT)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = resume_app(make_app, tmp)[0].test_client()
+        response = client.get('/api/resume/', headers={'Range': f'bytes={size}-'})
+        assert response.status_code == 416
+        assert response.headers['Content-Range'] == f'bytes */{size}'
+        assert response.data == b''
+        # Several ranges are served as the whole file rather than multipart.
+        response = client.get('/api/resume/', headers={'Range': 'bytes=0-9,20-29'})
+        assert response.status_code == 200 and response.data == CONTENT
+        assert 'Content-Range' not in response.headers
+        # A malformed header is ignored.
+        response = client.get('/api/resume/', headers={'Range': 'pages=1-2'})
+        assert response.status_code == 200 and response.data == CONTENT
+
+
+def test_if_range_and_conditional_requests(make_app):
+    with tempfile.TemporaryDirectory() as tmp:
+        client = resume_app(make_app, tmp)[0].test_client()
+        first = client.get('/api/resume/')
+        etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+        response = client.get('/api/resume/', headers={'Range': 'bytes=0-9', 'If-Range': etag})
+        assert response.status_code == 206 and response.data == CONTENT[:10]
+        response = client.get('/api/resume/', headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        assert response.status_code == 200 and response.data == CONTENT
+        response = client.get('/api/resume/', headers={'Range': 'bytes=0-9', 'If-Range': last_modified})
+        assert response.status_code == 206
+        response = client.get('/api/resume/', headers={'If-None-Match': etag})
+        assert response.status_code == 304 and response.data == b''
+
+
+def test_file_replaced_while_mapped(make_app):
+    with tempfile.TemporaryDirectory() as tmp:
+        app, path = resume_app(make_app, tmp)
+        client = app.test_client()
+        streaming = client.get('/api/resume/', buffered=False)
+        body = streaming.response
+        first_chunk = next(body)
+        old_etag = streaming.headers['ETag']
+
+        replacement = os.path.join(tmp, 'new.pdf')
+        with open(replacement, 'wb') as f:
+            f.write(b'%PDF new resume')
+        os.replace(replacement, path)
+
+        # The response already streaming keeps reading the old map.
+        assert first_chunk + b''.join(body) == CONTENT
+        streaming.close()
+        response = client.get('/api/resume/')
+        assert response.data == b'%PDF new resume'
+        assert response.headers['ETag'] != old_etag
+        # A range validated against the old file gets the new one in full.
+        response = client.get('/api/resume/', headers={'Range': 'bytes=0-3', 'If-Range': old_etag})
+        assert response.status_code == 200 and response.data == b'%PDF new resume'
+
+        os.remove(path)
+        assert client.get('/api/resume/').status_code == 404
+
+
+if __name__ == '__main__':
+    test_full_and_single_ranges(build_app)
+    test_unsatisfiable_and_multiple_ranges(build_app)
+    test_if_range_and_conditional_requests(build_app)
+    test_file_replaced_while_mapped(build_app)
+    print('ok')
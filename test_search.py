@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Full-text search: ranking, visibility, HTML-safe highlights, and the
+responses when the index is missing or the query has no words
+"""
+from conftest import admin_headers, build_app
+from models import db, Blog, Certification, Project
+from routes.blogs import blogs_bp
+from routes.search import search_bp
+from utils.search import ensure_search_index
+
+
+def seeded_app(make_app):
+    app = make_app(blogs_bp, search_bp)
+    with app.app_context():
+        ensure_search_index()
+        db.session.add_all([
+            Project(title='Zebra tracker', description='Maps herds', tech=['Python']),
+            Project(title='Shop', description='Sells zebra posters'),
+            Project(title='Zebra draft', description='d', is_visible=False),
+            Certification(name='Cloud', issuer='Zebra Academy'),
+        ])
+        db.session.commit()
+    return app
+
+
+def results(app, query):
+    response = app.test_client().get(f'/api/search/?{query}')
+    assert response.status_code == 200, response.json
+    return response.json['results']
+
+
+def test_title_matches_rank_first_and_hidden_rows_are_skipped(make_app):
+    app = seeded_app(make_app)
+    found = results(app, 'q=zebra')
+    # Title matches outweigh body matches; the hidden project is not listed.
+    assert [(r['type'], r['id']) for r in found][0] == ('project', 1)
+    assert {(r['type'], r['id']) for r in found[1:]} == {('project', 2), ('certification', 1)}
+    assert found[0]['rank'] > found[1]['rank'] >= found[2]['rank']
+    assert found[0]['title'] == '<mark>Zebra</mark> tracker'
+    # Words are prefix-matched; `type` limits the kinds.
+    assert [r['id'] for r in results(app, 'q=zeb&type=project')] == [1, 2]
+
+
+def test_highlights_are_escaped_html(make_app):
+    app = seeded_app(make_app)
+    response = app.test_client().post('/api/blogs/', headers=admin_headers(app), json={
+        'title': "It's <b>bold</b> zebra",
+        'content': 'zebra <img src=x onerror=alert(1) and AT&T',
+    })
+    assert response.status_code == 201, response.json
+    [blog] = results(app, 'q=zebra&type=blog')
+    assert blog['title'] == 'It&#x27;s &lt;b&gt;bold&lt;/b&gt; <mark>zebra</mark>'
+    assert blog['snippet'] == '<mark>zebra</mark> &lt;img src=x onerror=alert(1) and AT&amp;T'
+
+
+def test_missing_index_and_wordless_queries(make_app):
+    app = make_app(search_bp)
+    assert app.test_client().get('/api/search/?q=zebra').status_code == 503
+    app = seeded_app(make_app)
+    assert results(app, 'q=%21%21') == []
+    assert app.test_client().get('/api/search/?q=').status_code == 400
+
+
+if __name__ == '__main__':
+    test_title_matches_rank_first_and_hidden_rows_are_skipped(build_app)
+    test_highlights_are_escaped_html(build_app)
+    test_missing_index_and_wordless_queries(build_app)
+    print('ok')
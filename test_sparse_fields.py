@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Sparse fieldsets: ?fields= limits both the response keys and the columns read
+"""
+from datetime import datetime
+
+from sqlalchemy import event
+
+from conftest import build_app
+from models import db, Author, Blog, Project, Tag
+from routes.blogs import blogs_bp
+from routes.projects import projects_bp
+
+
+def seeded_app(make_app):
+    app = make_app(projects_bp, blogs_bp)
+    with app.app_context():
+        db.session.add(Project(title='site', description='long text', tech=['React'],
+                               gallery=['/a.png'], image='/cover.png'))
+        db.session.add(Blog(title='post', content='body', date=datetime(2024, 1, 1),
+                            author=Author(name='me'), tags=[Tag(name='flask')]))
+        db.session.commit()
+    return app
+
+
+def fetch(app, path):
+    statements = []
+    with app.app_context():
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', _record)
+        try:
+            response = app.test_client().get(path)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _record)
+    return response, statements
+
+
+def test_project_fields_restrict_keys_and_columns(make_app):
+    app = seeded_app(make_app)
+    response, statements = fetch(app, '/api/projects/?fields=title,image,tech')
+    assert response.json == [{'title': 'site', 'tech': ['React'], 'image': '/cover.png'}]
+    selected = statements[0].split('FROM')[0]
+    assert 'description' not in selected and 'gallery' not in selected
+
+    response, _ = fetch(app, '/api/projects/?fields=title,secret')
+    assert response.status_code == 400
+
+
+def test_blog_fields_skip_unrequested_relations(make_app):
+    app = seeded_app(make_app)
+    response, statements = fetch(app, '/api/blogs/1?fields=title')
+    assert response.json == {'title': 'post'}
+    assert len(statements) == 1 and 'content' not in statements[0] and 'authors' not in statements[0]
+
+    response, _ = fetch(app, '/api/blogs/?fields=title,tags&limit=1')
+    assert response.json['items'] == [{'title': 'post', 'tags': [{'id': 1, 'name': 'flask'}]}]
+
+
+if __name__ == '__main__':
+    test_project_fields_restrict_keys_and_columns(build_app)
+    test_blog_fields_skip_unrequested_relations(build_app)
+    print('ok')
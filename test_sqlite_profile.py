@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+SQLite profile: PRAGMAs on every connection, and GET requests read through
+the query-only engine while writes use the primary one
+"""
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from conftest import admin_headers, build_app
+from models import db
+from routes.projects import projects_bp
+from utils.database import READONLY_BIND, install_sqlite_pragmas
+
+
+def file_app(make_app, directory):
+    app = make_app(projects_bp, create=False, SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(directory, 'p.db')}")
+    install_sqlite_pragmas(app, db)  # as app.py does, before the first connection
+    with app.app_context():
+        db.create_all(bind_key=None)
+    return app
+
+
+def pragmas(engine, *names):
+    with engine.connect() as conn:
+        return {name: conn.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names}
+
+
+def test_every_connection_gets_the_profile(make_app):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = file_app(make_app, tmp)
+        with app.app_context():
+            primary, readonly = db.engines[None], db.engines[READONLY_BIND]
+        names = ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size', 'query_only')
+        assert pragmas(primary, *names) == {
+            'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000,
+            'cache_size': -65536, 'mmap_size': 268435456, 'query_only': 0,
+        }
+        assert pragmas(readonly, 'journal_mode', 'busy_timeout', 'query_only') == {
+            'journal_mode': 'wal', 'busy_timeout': 5000, 'query_only': 1,
+        }
+        with readonly.connect() as conn, pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO tags (name) VALUES ('x')"))
+
+
+def test_gets_read_through_the_query_only_engine(make_app):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = file_app(make_app, tmp)
+        with app.app_context():
+            engines = {'primary': db.engines[None], 'readonly': db.engines[READONLY_BIND]}
+        used = []
+        listeners = {name: (lambda *args, name=name: used.append(name)) for name in engines}
+        for name, engine in engines.items():
+            event.listen(engine, 'before_cursor_execute', listeners[name])
+        try:
+            client = app.test_client()
+            response = client.post('/api/projects/', headers=admin_headers(app),
+                                   json={'title': 'site', 'description': 'd'})
+            assert response.status_code == 201, response.json
+            assert set(used) == {'primary'}
+            used.clear()
+            # The committed write is visible to the separate read pool.
+            assert [p['title'] for p in client.get('/api/projects/').json] == ['site']
+            assert set(used) == {'readonly'}
+        finally:
+            for name, engine in engines.items():
+                event.remove(engine, 'before_cursor_execute', listeners[name])
+
+
+def test_memory_databases_keep_the_defaults(make_app):
+    app = make_app(projects_bp)
+    with app.app_context():
+        assert list(db.engines) == [None]
+    assert 'pool_size' not in app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+
+
+if __name__ == '__main__':
+    test_every_connection_gets_the_profile(build_app)
+    test_gets_read_through_the_query_only_engine(build_app)
+    test_memory_databases_keep_the_defaults(build_app)
+    print('ok')
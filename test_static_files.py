@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Built frontend serving: precompressed variants by Accept-Encoding, immutable
+caching for hashed assets, and the in-memory index.html
+"""
+import gzip
+import os
+import tempfile
+import time
+
+from conftest import build_app
+from utils.static_files import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, ShellCache, StaticIndex
+
+BUNDLE = b'console.log("app");\n' * 50
+
+
+def write(root, rel, data):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def frontend_app(make_app, root, ttl=5):
+    """Routes wired the way app.py wires them."""
+    write(root, 'index.html', b'<!doctype html><div id="root"></div>' * 20)
+    write(root, 'assets/index-BxH3k2aF.js', BUNDLE)
+    write(root, 'assets/index-BxH3k2aF.js.gz', gzip.compress(BUNDLE))
+    write(root, 'assets/index-BxH3k2aF.js.br', b'brotli bytes')
+    write(root, 'favicon.ico', b'icon')
+    index = StaticIndex(root)
+    index.build()
+    shell = ShellCache(os.path.join(root, 'index.html'), ttl=ttl)
+    app = make_app(create=False)
+    app.add_url_rule('/', 'shell', shell.response)
+    app.add_url_rule('/assets/<path:filename>', 'assets',
+                     lambda filename: index.serve(f'assets/{filename}') or ({'error': 'Asset not found'}, 404))
+    app.add_url_rule('/<path:path>', 'files',
+                     lambda path: index.serve(path) or ({'error': 'File not found'}, 404))
+    return app
+
+
+def test_assets_are_served_precompressed_and_immutable(make_app):
+    with tempfile.TemporaryDirectory() as root:
+        client = frontend_app(make_app, root).test_client()
+        url = '/assets/index-BxH3k2aF.js'
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br' and response.data == b'brotli bytes'
+        assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert 'javascript' in response.mimetype
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == BUNDLE
+
+        plain = client.get(url)
+        assert 'Content-Encoding' not in plain.headers and plain.data == BUNDLE
+        # Each encoding is its own representation with its own ETag.
+        assert plain.headers['ETag'] != response.headers['ETag']
+        assert client.get(url, headers={'If-None-Match': plain.headers['ETag']}).status_code == 304
+
+        # Unhashed names revalidate; the precompressed siblings are not files of their own.
+        assert client.get('/favicon.ico').headers['Cache-Control'] == REVALIDATE_CACHE_CONTROL
+        assert client.get(f'{url}.gz').status_code == 404
+        assert client.get('/assets/missing-12345678.js').status_code == 404
+
+
+def test_files_added_by_a_rebuild_are_found(make_app):
+    with tempfile.TemporaryDirectory() as root:
+        client = frontend_app(make_app, root).test_client()
+        assert client.get('/robots.txt').status_code == 404
+        time.sleep(0.01)
+        write(root, 'robots.txt', b'User-agent: *')
+        response = client.get('/robots.txt')
+        assert response.status_code == 200 and response.data == b'User-agent: *'
+
+
+def test_shell_is_served_from_memory(make_app):
+    with tempfile.TemporaryDirectory() as root:
+        app = frontend_app(make_app, root, ttl=0)
+        client = app.test_client()
+        response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data).startswith(b'<!doctype html>')
+        assert response.headers['Cache-Control'] == 'no-cache'
+        etag = response.headers['ETag']
+        assert client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag}).status_code == 304
+
+        # A new build is picked up once the TTL has passed.
+        path = os.path.join(root, 'index.html')
+        write(root, 'index.html', b'<!doctype html><p>new build</p>')
+        os.utime(path, (time.time() + 10, time.time() + 10))
+        response = client.get('/')
+        assert response.data == b'<!doctype html><p>new build</p>'
+        assert client.get('/', headers={'If-None-Match': etag}).status_code == 200
+
+
+if __name__ == '__main__':
+    test_assets_are_served_precompressed_and_immutable(build_app)
+    test_files_added_by_a_rebuild_are_found(build_app)
+    test_shell_is_served_from_memory(build_app)
+    print('ok')